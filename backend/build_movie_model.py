@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Build the versioned recommendation model artifact read by the API.
+
+The artifact is a directory of `.npy` files (movie ids, quality and audience
+scores, genre/keyword token ids, the normalized feature matrix, the top-K
+neighbour index and the per-genre cold-start pools) plus a small catalog pickle and a manifest. API workers
+memory-map it read-only, so they never re-parse `movies.pkl` or refit the
+vectorizer, and they all share the same pages through the page cache.
+
+With `--related`, the build also fetches the TMDB recommendations and similar
+titles of every catalog movie, so the feed can expand seeds without calling
+TMDB (needs TMDB_API_KEY).
+
+Each build lands in `<models-dir>/<version>/`; `<models-dir>/current` is a
+symlink swapped atomically at the end. Restart the workers to pick it up:
+
+    python3 build_movie_model.py --models-dir movie_model
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import requests
+
+from movie_model import (
+    COLD_START_POOL_SIZE,
+    activate_movie_model_version,
+    build_feature_matrix,
+    prepare_movies_catalog,
+    write_movie_model_artifact,
+)
+
+
+DEFAULT_MOVIES_PATH = os.getenv("MOVIES_PKL_PATH", "movies.pkl")
+DEFAULT_MODELS_DIR = os.getenv("MOVIE_MODEL_DIR", "movie_model")
+DEFAULT_TOP_K = int(os.getenv("MOVIE_NEIGHBORS_TOP_K", "200") or "200")
+TMDB_API_KEY = os.getenv("TMDB_API_KEY", "").strip()
+DEFAULT_COLD_START_POOL_SIZE = int(
+    os.getenv("COLD_START_POOL_SIZE", str(COLD_START_POOL_SIZE)) or str(COLD_START_POOL_SIZE)
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Construit l'artefact modele de recommandation.")
+    parser.add_argument("--movies", default=DEFAULT_MOVIES_PATH, help="Chemin vers movies.pkl")
+    parser.add_argument("--models-dir", default=DEFAULT_MODELS_DIR, help="Dossier racine des versions du modele")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Voisins conserves par film (0 pour desactiver)")
+    parser.add_argument(
+        "--cold-start-pool-size",
+        type=int,
+        default=DEFAULT_COLD_START_POOL_SIZE,
+        help="Films conserves par pool de demarrage (par genre et global)",
+    )
+    parser.add_argument("--related", action="store_true", help="Precalcule les films lies TMDB de tout le catalogue")
+    parser.add_argument("--related-workers", type=int, default=8, help="Appels TMDB simultanes pour --related")
+    parser.add_argument("--no-activate", action="store_true", help="Ecrit la version sans basculer le lien current")
+    return parser.parse_args()
+
+
+def fetch_related_movie_ids(session: requests.Session, movie_id: int) -> list[int]:
+    related_ids: list[int] = []
+    for endpoint in ("recommendations", "similar"):
+        try:
+            response = session.get(
+                f"https://api.themoviedb.org/3/movie/{movie_id}/{endpoint}",
+                params={"api_key": TMDB_API_KEY, "language": "fr-FR", "page": 1},
+                timeout=5,
+            )
+            response.raise_for_status()
+            results = response.json().get("results", [])[:10]
+        except Exception:
+            results = []
+        related_ids.extend(
+            movie["id"] for movie in results if isinstance(movie, dict) and isinstance(movie.get("id"), int)
+        )
+    return related_ids
+
+
+def build_related_movie_index(movie_ids: np.ndarray, workers: int) -> tuple[np.ndarray, np.ndarray]:
+    with requests.Session() as session, ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        related_lists = list(executor.map(lambda movie_id: fetch_related_movie_ids(session, int(movie_id)), movie_ids))
+
+    indptr = np.zeros(len(related_lists) + 1, dtype=np.int64)
+    np.cumsum([len(related_ids) for related_ids in related_lists], out=indptr[1:])
+    flat_ids = [related_id for related_ids in related_lists for related_id in related_ids]
+    return indptr, np.asarray(flat_ids, dtype=np.int64)
+
+
+def main() -> int:
+    args = parse_args()
+    movies_path = Path(args.movies).expanduser().resolve()
+    if not movies_path.exists():
+        raise SystemExit(f"movies.pkl introuvable: {movies_path}")
+
+    models_root = Path(args.models_dir).expanduser().resolve()
+    models_root.mkdir(parents=True, exist_ok=True)
+
+    with open(movies_path, "rb") as movies_file:
+        movies_df = pickle.load(movies_file)
+
+    print(f"1/3 - Preparation du catalogue ({len(movies_df)} film(s))...")
+    movies_df = prepare_movies_catalog(movies_df)
+    features = build_feature_matrix(movies_df)
+
+    related_movie_index = None
+    if args.related:
+        if not TMDB_API_KEY:
+            raise SystemExit("TMDB_API_KEY requis pour --related")
+        print("    Films lies TMDB pour tout le catalogue...")
+        related_movie_index = build_related_movie_index(
+            movies_df["id"].astype(int).to_numpy(dtype=np.int64),
+            args.related_workers,
+        )
+
+    print("2/3 - Ecriture de l'artefact...")
+    version_dir = write_movie_model_artifact(
+        str(models_root),
+        movies_df,
+        features,
+        source_path=str(movies_path),
+        neighbor_top_k=max(0, args.top_k),
+        cold_start_pool_size=max(1, args.cold_start_pool_size),
+        related_movie_index=related_movie_index,
+    )
+
+    if args.no_activate:
+        print(f"3/3 - Version ecrite sans activation : {version_dir}")
+        return 0
+
+    activate_movie_model_version(str(models_root), version_dir)
+    print(f"3/3 - Version active : {version_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
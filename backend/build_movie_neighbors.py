@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Build the top-K movie neighbour index used by the recommendation feed.
+
+The API memory-maps the generated `.npy` files at startup so positive and
+negative similarity vectors can be assembled from neighbour lists instead of
+a full cosine similarity pass over the catalog on every feed request.
+
+`build_movie_model.py` already writes this index inside the versioned model
+artifact; this script keeps the legacy layout next to `movies.pkl`:
+
+    python3 build_movie_neighbors.py --top-k 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from movie_model import build_feature_matrix, compute_top_k_neighbors, save_neighbor_index
+
+
+DEFAULT_MOVIES_PATH = os.getenv("MOVIES_PKL_PATH", "movies.pkl")
+DEFAULT_OUTPUT_DIR = os.getenv("MOVIE_NEIGHBORS_DIR", ".")
+DEFAULT_TOP_K = int(os.getenv("MOVIE_NEIGHBORS_TOP_K", "200") or "200")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Construit l'index des voisins films pour le feed.")
+    parser.add_argument("--movies", default=DEFAULT_MOVIES_PATH, help="Chemin vers movies.pkl")
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="Dossier de sortie des fichiers .npy")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help="Nombre de voisins conserves par film")
+    parser.add_argument("--block-size", type=int, default=512, help="Nombre de films traites par bloc")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    movies_path = Path(args.movies).expanduser().resolve()
+    if not movies_path.exists():
+        raise SystemExit(f"movies.pkl introuvable: {movies_path}")
+
+    output_dir = Path(args.output_dir).expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(movies_path, "rb") as movies_file:
+        movies_df = pickle.load(movies_file)
+
+    print(f"Catalogue : {len(movies_df)} film(s)")
+    features = build_feature_matrix(movies_df)
+    neighbor_indices, neighbor_scores = compute_top_k_neighbors(features, args.top_k, args.block_size)
+    movie_ids = movies_df["id"].astype(int).to_numpy(dtype=np.int64)
+    save_neighbor_index(str(output_dir), movie_ids, neighbor_indices, neighbor_scores)
+    print(f"Index voisins ecrit dans {output_dir} (top-k={neighbor_indices.shape[1]}).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,9 +1,9 @@
-import ast
 import asyncio
 import base64
-from collections import defaultdict, deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from contextlib import suppress
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
 import importlib.util
 import json
 import hashlib
@@ -21,23 +21,37 @@ from functools import lru_cache
 from email.message import EmailMessage
 from email.utils import formataddr
 from html import unescape as html_unescape
-from threading import Lock
-from typing import Any, Optional
-from urllib.parse import parse_qs, quote_plus, unquote, urlparse
+from threading import BoundedSemaphore, Lock, Thread
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import parse_qs, quote_plus, unquote, urlencode, urlparse
 from fastapi import FastAPI, HTTPException, Depends, status, WebSocket, WebSocketDisconnect, Query, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 import pandas as pd
 import pickle
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
 from pydantic import BaseModel
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from movie_model import (
+    COLD_START_POOL_SIZE,
+    build_cold_start_pools,
+    build_feature_matrix,
+    build_local_movie_index,
+    build_token_matrix,
+    build_token_presence_matrix,
+    encode_token_lists,
+    load_movie_model_artifact,
+    load_neighbor_index,
+    prepare_movies_catalog,
+    truncate_token_rows,
+)
 
 try:
     from cryptography.hazmat.primitives import serialization
@@ -54,11 +68,21 @@ try:
 except Exception:
     redis_async = None
 
+try:
+    import redis as redis_sync
+except Exception:
+    redis_sync = None
+
 try:
     import psycopg
 except Exception:
     psycopg = None
 
+try:
+    import httpx
+except Exception:
+    httpx = None
+
 try:
     from psycopg_pool import ConnectionPool
 except Exception:
@@ -80,9 +104,27 @@ REDIS_URL = os.getenv("REDIS_URL", "").strip()
 SECRET_KEY = os.getenv("SECRET_KEY", DEFAULT_SECRET_KEY).strip() or DEFAULT_SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 180 # 180 jours, adapté à une app mobile
+AUTH_PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("AUTH_PRINCIPAL_CACHE_TTL_SECONDS", "30") or "30")
+AUTH_PRINCIPAL_CACHE_MAX_ENTRIES = 4096
 SLOW_REQUEST_LOG_SECONDS = float(os.getenv("SLOW_REQUEST_LOG_SECONDS", "1.5") or "1.5")
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+DB_SLOW_QUERY_LOG_SECONDS = float(os.getenv("DB_SLOW_QUERY_LOG_SECONDS", "0.25") or "0.25")
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "10") or "10")
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "").strip().lower() in {"1", "true", "yes", "on"}
+UPSTREAM_HTTP_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_HTTP_TIMEOUT_SECONDS", "4") or "4")
+UPSTREAM_HTTP_POOL_SIZE = int(os.getenv("UPSTREAM_HTTP_POOL_SIZE", "32") or "32")
+UPSTREAM_HTTP_MAX_RETRIES = int(os.getenv("UPSTREAM_HTTP_MAX_RETRIES", "2") or "2")
+UPSTREAM_HTTP_MAX_CONCURRENCY_PER_HOST = int(os.getenv("UPSTREAM_HTTP_MAX_CONCURRENCY_PER_HOST", "16") or "16")
+# The sync session and the async client draw from one per-host budget, split between them.
+UPSTREAM_SYNC_CONCURRENCY_PER_HOST = max(1, UPSTREAM_HTTP_MAX_CONCURRENCY_PER_HOST // 2)
+UPSTREAM_ASYNC_CONCURRENCY_PER_HOST = max(1, UPSTREAM_HTTP_MAX_CONCURRENCY_PER_HOST - UPSTREAM_SYNC_CONCURRENCY_PER_HOST)
+UPSTREAM_HTTP_RETRY_BACKOFF_SECONDS = 0.25
+UPSTREAM_HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2") or "2")
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "8") or "8")
+PASSWORD_HASH_BCRYPT_ROUNDS = int(os.getenv("PASSWORD_HASH_BCRYPT_ROUNDS", "12") or "12")
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=PASSWORD_HASH_BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 TMDB_API_KEY = os.getenv("TMDB_API_KEY", DEFAULT_TMDB_API_KEY).strip() or DEFAULT_TMDB_API_KEY
@@ -106,18 +148,95 @@ FAVORITES_SYSTEM_ID = -2
 HISTORY_SYSTEM_ID = -3
 WATCH_LATER_NAME = "À regarder plus tard"
 PLAYLIST_SORT_OPTIONS = {"manual", "genre", "recent", "oldest", "rating"}
+PLAYLIST_ADDED_AT_SQL = "COALESCE(added_at, '1970-01-01 00:00:00')"
+# title_key holds str.lower(title): SQLite LOWER/LIKE only fold ASCII. Postgres compares byte-wise
+# ("C"), i.e. in the same codepoint order as the Python sort.
+PLAYLIST_TEXT_COLLATE_SQL = ' COLLATE "C"' if DATABASE_BACKEND == "postgres" else ""
+PLAYLIST_TITLE_SQL = f"COALESCE(title_key, ''){PLAYLIST_TEXT_COLLATE_SQL}"
+PLAYLIST_GENRE_SQL = f"LOWER(COALESCE(NULLIF(primary_genre, ''), 'Autres')){PLAYLIST_TEXT_COLLATE_SQL}"
+PLAYLIST_RATING_SQL = "COALESCE(rating, 0)"
+PLAYLIST_SORT_KEYS: dict[str, tuple[tuple[str, str], ...]] = {
+    "manual": (("COALESCE(sort_index, 2147483647)", "ASC"), (PLAYLIST_ADDED_AT_SQL, "DESC"), ("movie_id", "DESC")),
+    "genre": ((PLAYLIST_GENRE_SQL, "ASC"), (PLAYLIST_TITLE_SQL, "ASC"), ("movie_id", "ASC")),
+    "recent": ((PLAYLIST_ADDED_AT_SQL, "DESC"), ("movie_id", "DESC")),
+    "oldest": ((PLAYLIST_ADDED_AT_SQL, "ASC"), ("movie_id", "ASC")),
+    "rating": ((PLAYLIST_RATING_SQL, "DESC"), (PLAYLIST_TITLE_SQL, "ASC"), ("movie_id", "ASC")),
+}
+# Triggers keep playlists.item_count in step; the startup pass repairs counts copied or truncated outside them.
+PLAYLIST_ITEM_COUNT_BACKFILL_SQL = """
+    UPDATE playlists
+    SET item_count = (SELECT COUNT(*) FROM playlist_items WHERE playlist_items.playlist_id = playlists.id)
+    WHERE item_count <> (SELECT COUNT(*) FROM playlist_items WHERE playlist_items.playlist_id = playlists.id)
+"""
+PLAYLIST_BROWSE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_playlist_items_browse_manual ON playlist_items"
+    f"(playlist_id, COALESCE(sort_index, 2147483647), {PLAYLIST_ADDED_AT_SQL} DESC, movie_id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_playlist_items_browse_genre_key ON playlist_items"
+    f"(playlist_id, {PLAYLIST_GENRE_SQL}, {PLAYLIST_TITLE_SQL}, movie_id)",
+    "CREATE INDEX IF NOT EXISTS idx_playlist_items_browse_added ON playlist_items"
+    f"(playlist_id, {PLAYLIST_ADDED_AT_SQL}, movie_id)",
+    "CREATE INDEX IF NOT EXISTS idx_playlist_items_browse_rating_key ON playlist_items"
+    f"(playlist_id, {PLAYLIST_RATING_SQL} DESC, {PLAYLIST_TITLE_SQL}, movie_id)",
+    "CREATE INDEX IF NOT EXISTS idx_user_ratings_browse_added ON user_ratings"
+    f"(user_id, {PLAYLIST_ADDED_AT_SQL}, movie_id)",
+    "CREATE INDEX IF NOT EXISTS idx_user_ratings_browse_genre_key ON user_ratings"
+    f"(user_id, {PLAYLIST_GENRE_SQL}, {PLAYLIST_TITLE_SQL}, movie_id)",
+    "CREATE INDEX IF NOT EXISTS idx_user_ratings_browse_rating_key ON user_ratings"
+    f"(user_id, {PLAYLIST_RATING_SQL} DESC, {PLAYLIST_TITLE_SQL}, movie_id)",
+)
+# Earlier browse indexes sorted on LOWER(title).
+PLAYLIST_BROWSE_OBSOLETE_INDEXES = (
+    "idx_playlist_items_browse_genre",
+    "idx_playlist_items_browse_rating",
+    "idx_user_ratings_browse_genre",
+    "idx_user_ratings_browse_rating",
+)
 NOW_PLAYING_CACHE_TTL_SECONDS = 300
 NEWS_HIGHLIGHTS_CACHE_TTL_SECONDS = 90
 TMDB_WATCH_PROVIDERS_CACHE_TTL_SECONDS = 60 * 60 * 6
 TMDB_MOVIE_DETAILS_CACHE_TTL_SECONDS = 60 * 60 * 6
+TMDB_RELATED_MOVIE_IDS_CACHE_TTL_SECONDS = 60 * 60 * 24
+TMDB_RELATED_MOVIE_IDS_FAILURE_TTL_SECONDS = 60
+LOCAL_MOVIE_INDEX_REFRESH_SECONDS = int(os.getenv("LOCAL_MOVIE_INDEX_REFRESH_SECONDS", "60") or "60")
+LOCAL_MOVIE_INDEX_REFRESH_BATCH_SIZE = int(os.getenv("LOCAL_MOVIE_INDEX_REFRESH_BATCH_SIZE", "20") or "20")
 WATCHMODE_SOURCES_CACHE_TTL_SECONDS = 60 * 60 * 6
 TMDB_WATCH_PAGE_LINKS_CACHE_TTL_SECONDS = 60 * 60 * 12
+PROVIDER_REFRESH_INTERVAL_SECONDS = int(os.getenv("PROVIDER_REFRESH_INTERVAL_SECONDS", "20") or "20")
+PROVIDER_REFRESH_BATCH_SIZE = int(os.getenv("PROVIDER_REFRESH_BATCH_SIZE", "10") or "10")
+PROVIDER_REFRESH_MAX_AGE_SECONDS = int(os.getenv("PROVIDER_REFRESH_MAX_AGE_SECONDS", str(60 * 60 * 12)) or str(60 * 60 * 12))
+PROVIDER_REFRESH_FEED_WINDOW_SECONDS = int(os.getenv("PROVIDER_REFRESH_FEED_WINDOW_SECONDS", str(60 * 60 * 6)) or str(60 * 60 * 6))
+PROVIDER_REFRESH_SWEEP_LIMIT = 200
+PROVIDER_REFRESH_ENABLED = PROVIDER_REFRESH_INTERVAL_SECONDS > 0 and PROVIDER_REFRESH_BATCH_SIZE > 0
+UPSTREAM_CACHE_STALE_SECONDS = int(os.getenv("UPSTREAM_CACHE_STALE_SECONDS", str(60 * 60 * 24 * 7)) or str(60 * 60 * 24 * 7))
+UPSTREAM_CACHE_MAX_ENTRIES = 4096
+UPSTREAM_CACHE_PURGE_INTERVAL_SECONDS = int(os.getenv("UPSTREAM_CACHE_PURGE_INTERVAL_SECONDS", "3600") or "3600")
+UPSTREAM_CACHE_REDIS_PREFIX = "qulte:upstream:"
 TMDB_WATCH_SCRAPER_STATUS_KEY = "tmdb_watch_scraper_status"
 now_playing_cache: dict[str, object] = {"expires_at": 0.0, "items": []}
 news_highlights_cache: dict[int, tuple[float, dict]] = {}
-tmdb_watch_providers_cache: dict[int, tuple[float, dict[str, Any]]] = {}
-tmdb_movie_details_cache: dict[int, tuple[float, dict[str, Any]]] = {}
-watchmode_sources_cache: dict[str, tuple[float, dict[str, Any]]] = {}
+tmdb_poster_url_cache: OrderedDict[int, str] = OrderedDict()
+tmdb_related_movie_ids_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+tmdb_watch_providers_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+tmdb_movie_details_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+watchmode_sources_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+upstream_refresh_keys: set[str] = set()
+provider_refresh_queue: OrderedDict[int, None] = OrderedDict()
+movie_subscription_provider_names_cache: OrderedDict[int, tuple[float, list[str]]] = OrderedDict()
+COLLABORATIVE_NEIGHBORS_CACHE_TTL_SECONDS = int(os.getenv("COLLABORATIVE_NEIGHBORS_CACHE_TTL_SECONDS", "900") or "900")
+COLLABORATIVE_NEIGHBORS_CACHE_MAX_ENTRIES = 4096
+COLLABORATIVE_MATRIX_REFRESH_SECONDS = int(os.getenv("COLLABORATIVE_MATRIX_REFRESH_SECONDS", "0") or "0")
+collaborative_neighbors_cache: dict[int, tuple[float, list[tuple[int, int, float]]]] = {}
+collaborative_rating_matrix: Optional[dict[str, Any]] = None
+RECOMMENDATION_TASTE_STATE_TTL_SECONDS = int(os.getenv("RECOMMENDATION_TASTE_STATE_TTL_SECONDS", "600") or "600")
+RECOMMENDATION_TASTE_STATE_MAX_ENTRIES = 2048
+RECOMMENDATION_TASTE_STATE_REDIS_PREFIX = "qulte:taste-state:"
+RECOMMENDATION_IMPRESSION_HISTORY_LIMIT = 500
+# Without Redis the taste state lives in each worker: only invalidations from that
+# worker reach it, so multi-worker deployments need REDIS_URL (or a short TTL).
+recommendation_taste_state_cache: dict[int, dict[str, Any]] = {}
+recommendation_taste_state_generations: dict[int, int] = {}
+recommendation_taste_state_generation_counter = 0
+recommendation_taste_state_generation_floor = 0
 TEST_AI_ALGORITHM_VARIANT = "seed_cluster_feedback_v1"
 GLOBAL_RECOMMENDATION_AI_ENABLED = True
 TEST_AI_DASHBOARD_USERNAME = "test"
@@ -134,6 +253,13 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 AVATAR_UPLOAD_DIR = os.path.join(BASE_DIR, "uploads", "avatars")
 AVATAR_PUBLIC_PREFIX = "/uploads/avatars"
 POSTGRES_SCHEMA_PATH = os.path.join(BASE_DIR, "postgres_schema.sql")
+MOVIES_PKL_PATH = os.getenv("MOVIES_PKL_PATH", "movies.pkl").strip() or "movies.pkl"
+MOVIE_MODEL_DIR = os.getenv("MOVIE_MODEL_DIR", "movie_model").strip() or "movie_model"
+MOVIE_NEIGHBORS_DIR = os.getenv("MOVIE_NEIGHBORS_DIR", ".").strip() or "."
+SEED_CLUSTER_KEYWORD_LIMIT = 18
+COLD_START_POOL_SIZE = int(
+    os.getenv("COLD_START_POOL_SIZE", str(COLD_START_POOL_SIZE)) or str(COLD_START_POOL_SIZE)
+)
 MAX_AVATAR_BYTES = 5 * 1024 * 1024
 AVATAR_CONTENT_TYPES = {
     "image/jpeg": ".jpg",
@@ -176,7 +302,151 @@ RATE_LIMIT_HITS = Counter(
     "Nombre de reponses 429",
     ["scope"],
 )
+UPSTREAM_REQUESTS = Counter(
+    "qulte_upstream_requests_total",
+    "Appels HTTP sortants par hote et statut",
+    ["upstream", "status"],
+)
+UPSTREAM_REQUEST_LATENCY = Histogram(
+    "qulte_upstream_request_duration_seconds",
+    "Temps de reponse des appels HTTP sortants",
+    ["upstream"],
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "qulte_password_hash_queue_depth",
+    "Calculs de mot de passe en attente d'un worker dedie",
+)
+PASSWORD_HASH_LATENCY = Histogram(
+    "qulte_password_hash_duration_seconds",
+    "Temps de calcul des hash de mot de passe (attente comprise)",
+    ["operation"],
+)
+UPSTREAM_SINGLE_FLIGHT_REQUESTS = Counter(
+    "qulte_upstream_single_flight_requests_total",
+    "Appels amont par role single-flight (leader ou regroupe)",
+    ["upstream", "role"],
+)
+STAGE_LATENCY = Histogram(
+    "qulte_stage_duration_seconds",
+    "Temps passe par etape des pipelines de recommandation",
+    ["stage"],
+)
+# Per-request stage totals for Server-Timing; the dict is shared with the threadpool through the copied context.
+request_stage_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("request_stage_timings", default=None)
+
+
+@contextmanager
+def timed_stage(stage: str):
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started_at
+        STAGE_LATENCY.labels(stage=stage).observe(elapsed)
+        stage_timings = request_stage_timings.get()
+        if stage_timings is not None:
+            stage_timings[stage] = stage_timings.get(stage, 0.0) + elapsed
+
+
+DB_QUERY_LATENCY = Histogram(
+    "qulte_db_query_duration_seconds",
+    "Temps d'execution des requetes SQL",
+    ["operation"],
+)
+DB_QUERY_ROWS = Histogram(
+    "qulte_db_query_rows",
+    "Lignes lues par fetchall/fetchmany",
+    ["operation"],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+)
+DB_REQUEST_QUERIES = Histogram(
+    "qulte_db_queries_per_request",
+    "Requetes SQL executees par requete HTTP",
+    ["path"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 250, 500),
+)
+DB_N_PLUS_ONE_SUSPECTS = Counter(
+    "qulte_db_n_plus_one_suspects_total",
+    "Requetes HTTP repetant la meme requete SQL au-dela du seuil N+1",
+    ["path"],
+)
+SQL_FINGERPRINT_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?+)"),
+    (re.compile(r"\s+"), " "),
+)
+SQL_TRACKED_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+# Per-request SQL fingerprint counts, shared with the threadpool like request_stage_timings.
+request_query_counts: ContextVar[Optional[dict[str, int]]] = ContextVar("request_query_counts", default=None)
+
+
+@lru_cache(maxsize=4096)
+def fingerprint_sql(query: str) -> tuple[str, str]:
+    fingerprint = str(query)
+    for pattern, replacement in SQL_FINGERPRINT_PATTERNS:
+        fingerprint = pattern.sub(replacement, fingerprint)
+    fingerprint = fingerprint.strip()
+    operation = fingerprint.split(" ", 1)[0].upper()
+    return fingerprint, operation if operation in SQL_TRACKED_OPERATIONS else "OTHER"
+
+
+def record_db_query(query: str, elapsed: float) -> str:
+    fingerprint, operation = fingerprint_sql(query)
+    DB_QUERY_LATENCY.labels(operation=operation).observe(elapsed)
+    if elapsed >= DB_SLOW_QUERY_LOG_SECONDS:
+        logger.warning("Requete SQL lente %.3fs : %s", elapsed, fingerprint[:500])
+    query_counts = request_query_counts.get()
+    if query_counts is not None:
+        query_counts[fingerprint] = query_counts.get(fingerprint, 0) + 1
+    return operation
+
+
+def report_request_queries(method: str, observed_path: str, query_counts: dict[str, int]) -> None:
+    DB_REQUEST_QUERIES.labels(path=observed_path).observe(sum(query_counts.values()))
+    if not query_counts or DB_N_PLUS_ONE_THRESHOLD <= 0:
+        return
+    fingerprint, repeat_count = max(query_counts.items(), key=lambda item: item[1])
+    if repeat_count >= DB_N_PLUS_ONE_THRESHOLD:
+        DB_N_PLUS_ONE_SUSPECTS.labels(path=observed_path).inc()
+        logger.warning(
+            "N+1 probable %s %s : %sx %s",
+            method,
+            observed_path,
+            repeat_count,
+            fingerprint[:500],
+        )
 
+
+def format_server_timing_header(stage_timings: dict[str, float], total_seconds: float) -> str:
+    entries = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in stage_timings.items()]
+    entries.append(f"total;dur={total_seconds * 1000:.1f}")
+    return ", ".join(entries)
+
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "").strip().lower() or "auto"
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "50000") or "50000")
+RATE_LIMIT_EVICTION_INTERVAL_SECONDS = int(os.getenv("RATE_LIMIT_EVICTION_INTERVAL_SECONDS", "60") or "60")
+RATE_LIMIT_REDIS_PREFIX = "qulte:ratelimit:"
+# GCRA: each key stores its theoretical arrival time; a full burst of max_requests is allowed, then one per period/max_requests.
+RATE_LIMIT_REDIS_GCRA_SCRIPT = """
+-- TIME is non-deterministic: effects replication is required before writing on Redis < 5 (no-op since 7).
+redis.replicate_commands()
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local emission = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then
+    tat = now
+end
+if tat - now > tolerance then
+    return 0
+end
+local next_tat = tat + emission
+redis.call('SET', KEYS[1], tostring(next_tat), 'PX', math.ceil((next_tat - now) * 1000))
+return 1
+"""
 DEFAULT_RATE_LIMIT = (120, 60.0)
 STRICT_RATE_LIMITS = {
     "auth.login": (10, 60.0),
@@ -187,14 +457,217 @@ STRICT_RATE_LIMITS = {
     "reviews.create": (20, 60.0),
     "comments.create": (30, 60.0),
 }
-rate_limit_events: dict[tuple[str, str], deque[float]] = defaultdict(deque)
-rate_limit_lock = Lock()
 tmdb_cache_lock = Lock()
+upstream_inflight_lock = Lock()
+upstream_host_semaphores: dict[str, BoundedSemaphore] = {}
+upstream_event_loop_lock = Lock()
+upstream_event_loop: Optional[asyncio.AbstractEventLoop] = None
+upstream_async_client = None
+upstream_async_semaphores: dict[str, asyncio.Semaphore] = {}
+upstream_async_inflight_calls: dict[str, asyncio.Future] = {}
+upstream_inflight_calls: dict[str, Future] = {}
+collaborative_cache_lock = Lock()
+taste_state_lock = Lock()
+authenticated_user_cache_lock = Lock()
+authenticated_user_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
 notification_executor = ThreadPoolExecutor(max_workers=int(os.getenv("NOTIFICATION_WORKERS", "4") or "4"))
+upstream_refresh_executor = ThreadPoolExecutor(max_workers=int(os.getenv("UPSTREAM_REFRESH_WORKERS", "2") or "2"))
+# bcrypt releases the GIL: a small dedicated pool bounds KDF work, and the pending cap bounds how many
+# request threads can wait on it, so a login burst cannot take over the request threadpool.
+password_hash_executor = ThreadPoolExecutor(max_workers=max(1, PASSWORD_HASH_WORKERS), thread_name_prefix="password-hash")
+password_hash_queue_lock = Lock()
+password_hash_pending_jobs = 0
 DBIntegrityError = (sqlite3.IntegrityError, psycopg.IntegrityError) if psycopg is not None else (sqlite3.IntegrityError,)
 SQL_PARAM = "%s" if DATABASE_BACKEND == "postgres" else "?"
 
 
+def build_upstream_http_session() -> requests.Session:
+    session = requests.Session()
+    # Only idempotent reads are retried; push sends (POST) fail fast to the caller.
+    retry = Retry(
+        total=UPSTREAM_HTTP_MAX_RETRIES,
+        backoff_factor=UPSTREAM_HTTP_RETRY_BACKOFF_SECONDS,
+        status_forcelist=UPSTREAM_HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=UPSTREAM_HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+upstream_http_session = build_upstream_http_session()
+
+
+def get_upstream_host_semaphore(host: str) -> BoundedSemaphore:
+    with upstream_inflight_lock:
+        semaphore = upstream_host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = BoundedSemaphore(UPSTREAM_SYNC_CONCURRENCY_PER_HOST)
+            upstream_host_semaphores[host] = semaphore
+        return semaphore
+
+
+def upstream_request(method: str, url: str, *, timeout: float = UPSTREAM_HTTP_TIMEOUT_SECONDS, **kwargs) -> requests.Response:
+    host = urlparse(url).hostname or "unknown"
+    semaphore = get_upstream_host_semaphore(host)
+    started_at = time.perf_counter()
+    status_label = "error"
+    try:
+        if not semaphore.acquire(timeout=timeout):
+            status_label = "saturated"
+            raise requests.exceptions.ConnectTimeout(f"Trop d'appels simultanes vers {host}")
+        try:
+            response = upstream_http_session.request(method, url, timeout=timeout, **kwargs)
+        finally:
+            semaphore.release()
+        status_label = str(response.status_code)
+        return response
+    finally:
+        UPSTREAM_REQUESTS.labels(upstream=host, status=status_label).inc()
+        UPSTREAM_REQUEST_LATENCY.labels(upstream=host).observe(time.perf_counter() - started_at)
+
+
+def upstream_get(url: str, **kwargs) -> requests.Response:
+    return upstream_request("GET", url, **kwargs)
+
+
+def upstream_post(url: str, **kwargs) -> requests.Response:
+    return upstream_request("POST", url, **kwargs)
+
+
+def get_upstream_event_loop() -> asyncio.AbstractEventLoop:
+    # Sync endpoints run in the threadpool; their upstream fan-out shares one
+    # dedicated loop instead of spawning a thread per call.
+    global upstream_event_loop
+    with upstream_event_loop_lock:
+        if upstream_event_loop is None:
+            loop = asyncio.new_event_loop()
+            Thread(target=loop.run_forever, name="upstream-io", daemon=True).start()
+            upstream_event_loop = loop
+        return upstream_event_loop
+
+
+def get_upstream_async_client():
+    global upstream_async_client
+    if upstream_async_client is None:
+        upstream_async_client = httpx.AsyncClient(
+            timeout=UPSTREAM_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=UPSTREAM_HTTP_POOL_SIZE * 4,
+                max_keepalive_connections=UPSTREAM_HTTP_POOL_SIZE,
+            ),
+        )
+    return upstream_async_client
+
+
+async def request_upstream_json_async(url: str, timeout: float, params: Optional[dict[str, Any]]) -> Optional[Any]:
+    host = urlparse(url).hostname or "unknown"
+    semaphore = upstream_async_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(UPSTREAM_ASYNC_CONCURRENCY_PER_HOST)
+        upstream_async_semaphores[host] = semaphore
+    started_at = time.perf_counter()
+    status_label = "error"
+    try:
+        # Same policy as the sync session's Retry: transport errors, 429 and 5xx, with exponential backoff.
+        for attempt in range(max(0, UPSTREAM_HTTP_MAX_RETRIES) + 1):
+            is_last_attempt = attempt >= UPSTREAM_HTTP_MAX_RETRIES
+            try:
+                async with semaphore:
+                    response = await get_upstream_async_client().get(url, params=params, timeout=timeout)
+            except httpx.TransportError:
+                if is_last_attempt:
+                    raise
+            else:
+                status_label = str(response.status_code)
+                if is_last_attempt or response.status_code not in UPSTREAM_HTTP_RETRY_STATUSES:
+                    break
+            await asyncio.sleep(UPSTREAM_HTTP_RETRY_BACKOFF_SECONDS * (2 ** attempt))
+        response.raise_for_status()
+        return response.json()
+    except Exception as exc:
+        logger.warning("Echec appel amont %s%s: %s", host, urlparse(url).path, exc)
+        return None
+    finally:
+        UPSTREAM_REQUESTS.labels(upstream=host, status=status_label).inc()
+        UPSTREAM_REQUEST_LATENCY.labels(upstream=host).observe(time.perf_counter() - started_at)
+
+
+async def fetch_upstream_json_async(
+    url: str,
+    *,
+    timeout: float = UPSTREAM_HTTP_TIMEOUT_SECONDS,
+    params: Optional[dict[str, Any]] = None,
+) -> Optional[Any]:
+    # Single-flight on the loop: concurrent callers of one URL share its task.
+    key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+    upstream = urlparse(url).hostname or "unknown"
+    inflight_call = upstream_async_inflight_calls.get(key)
+    if inflight_call is not None:
+        UPSTREAM_SINGLE_FLIGHT_REQUESTS.labels(upstream=upstream, role="coalesced").inc()
+        return await asyncio.shield(inflight_call)
+
+    UPSTREAM_SINGLE_FLIGHT_REQUESTS.labels(upstream=upstream, role="leader").inc()
+    inflight_call = asyncio.ensure_future(request_upstream_json_async(url, timeout, params))
+    upstream_async_inflight_calls[key] = inflight_call
+    try:
+        return await asyncio.shield(inflight_call)
+    finally:
+        if upstream_async_inflight_calls.get(key) is inflight_call:
+            upstream_async_inflight_calls.pop(key, None)
+
+
+def fetch_upstream_json(url: str, *, timeout: float = UPSTREAM_HTTP_TIMEOUT_SECONDS, params: Optional[dict[str, Any]] = None) -> Optional[Any]:
+    try:
+        response = upstream_get(url, timeout=timeout, params=params)
+        response.raise_for_status()
+        return response.json()
+    except Exception as exc:
+        logger.warning("Echec appel amont %s%s: %s", urlparse(url).hostname, urlparse(url).path, exc)
+        return None
+
+
+def submit_upstream_json(
+    url: str,
+    *,
+    timeout: float = UPSTREAM_HTTP_TIMEOUT_SECONDS,
+    params: Optional[dict[str, Any]] = None,
+) -> Future:
+    if httpx is None:
+        completed_call: Future = Future()
+        key = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        completed_call.set_result(
+            run_single_flight(
+                urlparse(url).hostname or "unknown",
+                key,
+                lambda: fetch_upstream_json(url, timeout=timeout, params=params),
+            )
+        )
+        return completed_call
+
+    return asyncio.run_coroutine_threadsafe(
+        fetch_upstream_json_async(url, timeout=timeout, params=params),
+        get_upstream_event_loop(),
+    )
+
+
+def wait_upstream_json(upstream_call: Future, timeout: float = UPSTREAM_HTTP_TIMEOUT_SECONDS) -> Optional[Any]:
+    # The grace period covers waiting for a per-host slot on top of the request timeout.
+    try:
+        return upstream_call.result(timeout=timeout * 2)
+    except Exception:
+        upstream_call.cancel()
+        return None
+
+
+def fetch_upstream_json_batch(urls: list[str], *, timeout: float = UPSTREAM_HTTP_TIMEOUT_SECONDS) -> list[Optional[Any]]:
+    upstream_calls = [submit_upstream_json(url, timeout=timeout) for url in urls]
+    return [wait_upstream_json(upstream_call, timeout) for upstream_call in upstream_calls]
+
+
 class HybridRow:
     def __init__(self, columns: list[str], values):
         self._columns = list(columns)
@@ -241,13 +714,26 @@ class PostgresCompatCursor:
     def __init__(self, cursor, *, row_factory_enabled: bool):
         self._cursor = cursor
         self._row_factory_enabled = row_factory_enabled
+        self._operation = "OTHER"
         self.lastrowid = None
 
     def execute(self, query, params=None):
-        if params is None:
-            self._cursor.execute(query)
-        else:
-            self._cursor.execute(query, params)
+        started_at = time.perf_counter()
+        try:
+            if params is None:
+                self._cursor.execute(query)
+            else:
+                self._cursor.execute(query, params)
+        finally:
+            self._operation = record_db_query(query, time.perf_counter() - started_at)
+        return self
+
+    def executemany(self, query, params_seq):
+        started_at = time.perf_counter()
+        try:
+            self._cursor.executemany(query, params_seq)
+        finally:
+            self._operation = record_db_query(query, time.perf_counter() - started_at)
         return self
 
     def fetchone(self):
@@ -259,6 +745,15 @@ class PostgresCompatCursor:
 
     def fetchall(self):
         rows = self._cursor.fetchall()
+        DB_QUERY_ROWS.labels(operation=self._operation).observe(len(rows))
+        if not self._row_factory_enabled:
+            return rows
+        columns = [column.name for column in self._cursor.description]
+        return [HybridRow(columns, row) for row in rows]
+
+    def fetchmany(self, size=None):
+        rows = self._cursor.fetchmany(self._cursor.arraysize if size is None else size)
+        DB_QUERY_ROWS.labels(operation=self._operation).observe(len(rows))
         if not self._row_factory_enabled:
             return rows
         columns = [column.name for column in self._cursor.description]
@@ -272,6 +767,38 @@ class PostgresCompatCursor:
         return getattr(self._cursor, name)
 
 
+class InstrumentedSqliteCursor(sqlite3.Cursor):
+    def execute(self, query, params=()):
+        started_at = time.perf_counter()
+        try:
+            return super().execute(query, params)
+        finally:
+            self.query_operation = record_db_query(query, time.perf_counter() - started_at)
+
+    def executemany(self, query, params_seq):
+        started_at = time.perf_counter()
+        try:
+            return super().executemany(query, params_seq)
+        finally:
+            self.query_operation = record_db_query(query, time.perf_counter() - started_at)
+
+    def fetchall(self):
+        rows = super().fetchall()
+        DB_QUERY_ROWS.labels(operation=getattr(self, "query_operation", "OTHER")).observe(len(rows))
+        return rows
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        DB_QUERY_ROWS.labels(operation=getattr(self, "query_operation", "OTHER")).observe(len(rows))
+        return rows
+
+
+class InstrumentedSqliteConnection(sqlite3.Connection):
+    # conn.execute keeps the plain cursor, so the per-connection PRAGMAs stay out of the query counts.
+    def cursor(self, factory=InstrumentedSqliteCursor):
+        return super().cursor(factory)
+
+
 class PostgresCompatConnection:
     def __init__(self, conn, *, row_factory: bool):
         self._conn = conn
@@ -363,8 +890,67 @@ class RealtimeConnectionManager:
 
 
 realtime_manager = RealtimeConnectionManager()
+
+
+class InMemoryRateLimiter:
+    # Only touched from the event loop (middleware and eviction task), so no lock is needed.
+    def __init__(self, max_keys: int):
+        self.max_keys = max(1, max_keys)
+        self.arrival_times: OrderedDict[str, float] = OrderedDict()
+
+    async def allow(self, key: str, max_requests: int, period_seconds: float) -> bool:
+        now = time.monotonic()
+        emission = period_seconds / max(1, max_requests)
+        tat = max(self.arrival_times.get(key, now), now)
+        if tat - now > period_seconds - emission:
+            return False
+
+        self.arrival_times[key] = tat + emission
+        self.arrival_times.move_to_end(key)
+        while len(self.arrival_times) > self.max_keys:
+            self.arrival_times.popitem(last=False)
+        return True
+
+    def evict_expired(self) -> int:
+        now = time.monotonic()
+        expired_keys = [key for key, tat in self.arrival_times.items() if tat <= now]
+        for key in expired_keys:
+            del self.arrival_times[key]
+        return len(expired_keys)
+
+
+class RedisRateLimiter:
+    def __init__(self, client, fallback: InMemoryRateLimiter):
+        self.script = client.register_script(RATE_LIMIT_REDIS_GCRA_SCRIPT)
+        self.fallback = fallback
+        self.failing = False
+
+    async def allow(self, key: str, max_requests: int, period_seconds: float) -> bool:
+        emission = period_seconds / max(1, max_requests)
+        try:
+            allowed = await self.script(
+                keys=[f"{RATE_LIMIT_REDIS_PREFIX}{key}"],
+                args=[emission, period_seconds - emission],
+            )
+        except Exception:
+            if not self.failing:
+                self.failing = True
+                logger.warning("Rate limit Redis indisponible, fallback local par worker.")
+            return await self.fallback.allow(key, max_requests, period_seconds)
+
+        self.failing = False
+        return bool(int(allowed))
+
+
+memory_rate_limiter = InMemoryRateLimiter(RATE_LIMIT_MAX_KEYS)
+rate_limiter: Any = memory_rate_limiter
 redis_client = None
+redis_sync_client = None
 redis_listener_task: Optional[asyncio.Task] = None
+collaborative_matrix_task: Optional[asyncio.Task] = None
+local_movie_index_task: Optional[asyncio.Task] = None
+provider_refresh_task: Optional[asyncio.Task] = None
+rate_limit_eviction_task: Optional[asyncio.Task] = None
 postgres_pool: Optional[Any] = None
 REDIS_REALTIME_CHANNEL = "qulte:realtime"
 
@@ -400,6 +986,11 @@ async def redis_realtime_listener():
             except (TypeError, json.JSONDecodeError):
                 continue
 
+            invalidated_username = event.get("invalidate_authenticated_user")
+            if invalidated_username:
+                drop_cached_authenticated_user(str(invalidated_username))
+                continue
+
             user_ids = [int(user_id) for user_id in event.get("user_ids") or []]
             payload = event.get("payload") or {}
             await realtime_manager.broadcast_to_users(user_ids, payload)
@@ -469,21 +1060,20 @@ def get_rate_limit_client_id(request: Request) -> str:
     return client_host
 
 
-def check_rate_limit(scope: str, request: Request) -> bool:
+async def check_rate_limit(scope: str, request: Request) -> bool:
     max_requests, period_seconds = STRICT_RATE_LIMITS.get(scope, DEFAULT_RATE_LIMIT)
-    key = (scope, get_rate_limit_client_id(request))
-    now = time.time()
+    return await rate_limiter.allow(f"{scope}:{get_rate_limit_client_id(request)}", max_requests, period_seconds)
 
-    with rate_limit_lock:
-        bucket = rate_limit_events[key]
-        while bucket and bucket[0] <= now - period_seconds:
-            bucket.popleft()
 
-        if len(bucket) >= max_requests:
-            return False
-
-        bucket.append(now)
-        return True
+async def rate_limit_evictor():
+    while True:
+        await asyncio.sleep(RATE_LIMIT_EVICTION_INTERVAL_SECONDS)
+        try:
+            evicted_keys = memory_rate_limiter.evict_expired()
+            if evicted_keys:
+                logger.debug("Rate limit local : %s cle(s) expiree(s) purgee(s).", evicted_keys)
+        except Exception:
+            logger.exception("Purge du rate limit local impossible.")
 
 
 @app.middleware("http")
@@ -492,14 +1082,24 @@ async def observability_and_rate_limit_middleware(request: Request, call_next):
     rate_limit_scope = get_rate_limit_scope(request)
     started_at = time.perf_counter()
 
-    if rate_limit_scope and not check_rate_limit(rate_limit_scope, request):
+    if rate_limit_scope and not await check_rate_limit(rate_limit_scope, request):
         RATE_LIMIT_HITS.labels(scope=rate_limit_scope).inc()
         latency = time.perf_counter() - started_at
         REQUEST_COUNT.labels(method=request.method, path=observed_path, status="429").inc()
         REQUEST_LATENCY.labels(method=request.method, path=observed_path).observe(latency)
         return PlainTextResponse("Trop de requetes, reessaie dans un instant.", status_code=429)
 
-    response = await call_next(request)
+    stage_timings_token = request_stage_timings.set({}) if SERVER_TIMING_ENABLED else None
+    query_counts: dict[str, int] = {}
+    query_counts_token = request_query_counts.set(query_counts)
+    try:
+        response = await call_next(request)
+    finally:
+        stage_timings = request_stage_timings.get()
+        if stage_timings_token is not None:
+            request_stage_timings.reset(stage_timings_token)
+        request_query_counts.reset(query_counts_token)
+    report_request_queries(request.method, observed_path, query_counts)
     latency = time.perf_counter() - started_at
     REQUEST_COUNT.labels(
         method=request.method,
@@ -508,6 +1108,8 @@ async def observability_and_rate_limit_middleware(request: Request, call_next):
     ).inc()
     REQUEST_LATENCY.labels(method=request.method, path=observed_path).observe(latency)
     response.headers["X-Response-Time"] = f"{latency:.4f}s"
+    if stage_timings is not None:
+        response.headers["Server-Timing"] = format_server_timing_header(stage_timings, latency)
     if latency >= SLOW_REQUEST_LOG_SECONDS:
         logger.warning(
             "Requete lente %s %s status=%s duration=%.3fs",
@@ -521,7 +1123,7 @@ async def observability_and_rate_limit_middleware(request: Request, call_next):
 
 @app.on_event("startup")
 async def startup_runtime_services():
-    global redis_client, redis_listener_task, postgres_pool
+    global redis_client, redis_listener_task, collaborative_matrix_task, local_movie_index_task, provider_refresh_task, rate_limit_eviction_task, rate_limiter, postgres_pool
     if DATABASE_BACKEND == "postgres":
         if ConnectionPool is None:
             logger.warning("psycopg_pool indisponible. Connexions PostgreSQL directes sans pool.")
@@ -557,11 +1159,57 @@ async def startup_runtime_services():
     elif REDIS_URL and redis_async is None:
         logger.warning("REDIS_URL defini mais package redis indisponible. Fallback local.")
 
+    if redis_client is not None and RATE_LIMIT_BACKEND in {"auto", "redis"}:
+        rate_limiter = RedisRateLimiter(redis_client, memory_rate_limiter)
+        logger.info("Rate limit partage via Redis (GCRA).")
+    else:
+        rate_limiter = memory_rate_limiter
+        if RATE_LIMIT_BACKEND == "redis":
+            logger.warning("RATE_LIMIT_BACKEND=redis mais Redis indisponible. Rate limit local par worker.")
+    if RATE_LIMIT_EVICTION_INTERVAL_SECONDS > 0:
+        rate_limit_eviction_task = asyncio.create_task(rate_limit_evictor())
+
+    if COLLABORATIVE_MATRIX_REFRESH_SECONDS > 0:
+        collaborative_matrix_task = asyncio.create_task(collaborative_matrix_refresher())
+    if LOCAL_MOVIE_INDEX_REFRESH_SECONDS > 0 and LOCAL_MOVIE_INDEX_REFRESH_BATCH_SIZE > 0 and local_movie_index:
+        local_movie_index_task = asyncio.create_task(local_movie_index_refresher())
+    if PROVIDER_REFRESH_ENABLED:
+        provider_refresh_task = asyncio.create_task(provider_refresh_worker())
+
 
 @app.on_event("shutdown")
 async def shutdown_runtime_services():
-    global redis_client, redis_listener_task, postgres_pool
+    global redis_client, redis_listener_task, collaborative_matrix_task, local_movie_index_task, provider_refresh_task, rate_limit_eviction_task, rate_limiter, postgres_pool, upstream_async_client
     notification_executor.shutdown(wait=False, cancel_futures=False)
+    upstream_refresh_executor.shutdown(wait=False, cancel_futures=True)
+    password_hash_executor.shutdown(wait=False, cancel_futures=True)
+    if upstream_event_loop is not None and upstream_async_client is not None:
+        with suppress(Exception):
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(upstream_async_client.aclose(), upstream_event_loop)
+            )
+        upstream_async_client = None
+    if collaborative_matrix_task is not None:
+        collaborative_matrix_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await collaborative_matrix_task
+        collaborative_matrix_task = None
+    if local_movie_index_task is not None:
+        local_movie_index_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await local_movie_index_task
+        local_movie_index_task = None
+    if provider_refresh_task is not None:
+        provider_refresh_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await provider_refresh_task
+        provider_refresh_task = None
+    if rate_limit_eviction_task is not None:
+        rate_limit_eviction_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await rate_limit_eviction_task
+        rate_limit_eviction_task = None
+    rate_limiter = memory_rate_limiter
     if postgres_pool is not None:
         postgres_pool.close()
         postgres_pool = None
@@ -639,6 +1287,7 @@ def get_db_connection(*, row_factory: bool = False):
         DATABASE_PATH,
         timeout=30,
         check_same_thread=False,
+        factory=InstrumentedSqliteConnection,
     )
     conn.execute("PRAGMA foreign_keys = ON")
     conn.execute("PRAGMA journal_mode = WAL")
@@ -649,58 +1298,6 @@ def get_db_connection(*, row_factory: bool = False):
     return conn
 
 
-def extract_json_names(value) -> list[str]:
-    if not isinstance(value, str) or not value:
-        return []
-
-    try:
-        items = ast.literal_eval(value)
-    except (ValueError, SyntaxError):
-        return []
-
-    names: list[str] = []
-    for item in items:
-        name = item.get("name") if isinstance(item, dict) else None
-        if not name:
-            continue
-        names.append(str(name).replace(" ", "").lower())
-    return names
-
-
-def extract_json_ids(value) -> list[int]:
-    if not isinstance(value, str) or not value:
-        return []
-
-    try:
-        items = ast.literal_eval(value)
-    except (ValueError, SyntaxError):
-        return []
-
-    parsed_ids: list[int] = []
-    for item in items:
-        item_id = item.get("id") if isinstance(item, dict) else None
-        if isinstance(item_id, int):
-            parsed_ids.append(item_id)
-    return parsed_ids
-
-
-def extract_primary_genre_name(value) -> str:
-    if not isinstance(value, str) or not value:
-        return "Autres"
-
-    try:
-        items = ast.literal_eval(value)
-    except (ValueError, SyntaxError):
-        return "Autres"
-
-    for item in items:
-        genre_name = item.get("name") if isinstance(item, dict) else None
-        if genre_name:
-            return str(genre_name)
-
-    return "Autres"
-
-
 def normalize_tmdb_movie(movie: dict) -> Optional[dict]:
     movie_id = movie.get("id")
     title = movie.get("title")
@@ -720,7 +1317,7 @@ def normalize_tmdb_movie(movie: dict) -> Optional[dict]:
 def get_tmdb_movie_summary(movie_id: int) -> Optional[dict]:
     try:
         url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR"
-        data = requests.get(url, timeout=2).json()
+        data = upstream_get(url, timeout=2).json()
     except Exception:
         return None
 
@@ -741,6 +1338,23 @@ def get_display_movie_title(movie_id: int) -> str:
     return f"Film #{movie_id}"
 
 
+def build_title_key(title: Any) -> str:
+    return str(title or "").lower()
+
+
+def backfill_title_keys(cursor) -> None:
+    # Rows written before title_key existed; folded in Python for the same reason as on write.
+    for table_name, owner_column in (("playlist_items", "playlist_id"), ("user_ratings", "user_id")):
+        cursor.execute(f"SELECT {owner_column}, movie_id, title FROM {table_name} WHERE title_key IS NULL")
+        rows = cursor.fetchall()
+        if not rows:
+            continue
+        cursor.executemany(
+            f"UPDATE {table_name} SET title_key = {SQL_PARAM} WHERE {owner_column} = {SQL_PARAM} AND movie_id = {SQL_PARAM}",
+            [(build_title_key(row[2]), row[0], row[1]) for row in rows],
+        )
+
+
 def init_postgres_db():
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -757,6 +1371,39 @@ def init_postgres_db():
     cursor.execute(
         "ALTER TABLE playlist_items ADD COLUMN IF NOT EXISTS subscription_provider_names TEXT DEFAULT '[]'"
     )
+    cursor.execute("ALTER TABLE user_ratings ADD COLUMN IF NOT EXISTS primary_genre TEXT")
+    cursor.execute("ALTER TABLE playlist_items ADD COLUMN IF NOT EXISTS title_key TEXT")
+    cursor.execute("ALTER TABLE user_ratings ADD COLUMN IF NOT EXISTS title_key TEXT")
+    backfill_title_keys(cursor)
+    for index_name in PLAYLIST_BROWSE_OBSOLETE_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+    for index_statement in PLAYLIST_BROWSE_INDEXES:
+        cursor.execute(index_statement)
+    cursor.execute("ALTER TABLE playlists ADD COLUMN IF NOT EXISTS item_count INTEGER NOT NULL DEFAULT 0")
+    cursor.execute(
+        """
+        CREATE OR REPLACE FUNCTION maintain_playlist_item_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE playlists SET item_count = item_count - 1 WHERE id = OLD.playlist_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE playlists SET item_count = item_count + 1 WHERE id = NEW.playlist_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    cursor.execute("DROP TRIGGER IF EXISTS trg_playlist_items_item_count ON playlist_items")
+    cursor.execute(
+        """
+        CREATE TRIGGER trg_playlist_items_item_count
+        AFTER INSERT OR DELETE OR UPDATE OF playlist_id ON playlist_items
+        FOR EACH ROW EXECUTE FUNCTION maintain_playlist_item_count()
+        """
+    )
+    cursor.execute(PLAYLIST_ITEM_COUNT_BACKFILL_SQL)
     cursor.execute("ALTER TABLE playlist_items ADD COLUMN IF NOT EXISTS metadata_updated_at TIMESTAMP")
     cursor.execute(
         """
@@ -789,6 +1436,19 @@ def init_postgres_db():
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_movie_provider_link_cache_expires ON movie_provider_link_cache(expires_at)"
     )
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS upstream_response_cache (
+            cache_key TEXT PRIMARY KEY,
+            payload_json TEXT NOT NULL,
+            fetched_at DOUBLE PRECISION NOT NULL,
+            expires_at DOUBLE PRECISION NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_upstream_response_cache_expires ON upstream_response_cache(expires_at)"
+    )
     conn.commit()
     conn.close()
 
@@ -875,6 +1535,8 @@ def init_sqlite_db():
         cursor.execute("ALTER TABLE playlist_items ADD COLUMN subscription_provider_names TEXT DEFAULT '[]'")
     if "metadata_updated_at" not in playlist_item_columns:
         cursor.execute("ALTER TABLE playlist_items ADD COLUMN metadata_updated_at TIMESTAMP")
+    if "title_key" not in playlist_item_columns:
+        cursor.execute("ALTER TABLE playlist_items ADD COLUMN title_key TEXT")
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_playlist_items_playlist_sort ON playlist_items(playlist_id, sort_index)"
     )
@@ -884,6 +1546,41 @@ def init_sqlite_db():
     cursor.execute(
         "CREATE INDEX IF NOT EXISTS idx_playlist_items_movie_id ON playlist_items(movie_id)"
     )
+    ensure_column("user_ratings", "primary_genre", "TEXT")
+    ensure_column("user_ratings", "title_key", "TEXT")
+    backfill_title_keys(cursor)
+    for index_name in PLAYLIST_BROWSE_OBSOLETE_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+    for index_statement in PLAYLIST_BROWSE_INDEXES:
+        cursor.execute(index_statement)
+    ensure_column("playlists", "item_count", "INTEGER NOT NULL DEFAULT 0")
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_playlist_items_count_insert AFTER INSERT ON playlist_items
+        BEGIN
+            UPDATE playlists SET item_count = item_count + 1 WHERE id = NEW.playlist_id;
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_playlist_items_count_delete AFTER DELETE ON playlist_items
+        BEGIN
+            UPDATE playlists SET item_count = item_count - 1 WHERE id = OLD.playlist_id;
+        END
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_playlist_items_count_move AFTER UPDATE OF playlist_id ON playlist_items
+        WHEN OLD.playlist_id IS NOT NEW.playlist_id
+        BEGIN
+            UPDATE playlists SET item_count = item_count - 1 WHERE id = OLD.playlist_id;
+            UPDATE playlists SET item_count = item_count + 1 WHERE id = NEW.playlist_id;
+        END
+        """
+    )
+    cursor.execute(PLAYLIST_ITEM_COUNT_BACKFILL_SQL)
 
     # Table FOLLOWS
     cursor.execute('''CREATE TABLE IF NOT EXISTS follows (
@@ -1044,6 +1741,16 @@ def init_sqlite_db():
         "CREATE INDEX IF NOT EXISTS idx_movie_provider_link_cache_expires ON movie_provider_link_cache(expires_at)"
     )
 
+    # Table UPSTREAM_RESPONSE_CACHE
+    cursor.execute('''CREATE TABLE IF NOT EXISTS upstream_response_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        payload_json TEXT NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        expires_at REAL NOT NULL)''')
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_upstream_response_cache_expires ON upstream_response_cache(expires_at)"
+    )
+
     # Table WEB_PUSH_SUBSCRIPTIONS
     cursor.execute('''CREATE TABLE IF NOT EXISTS web_push_subscriptions (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -1121,71 +1828,108 @@ init_db()
 # --- 2. IA ---
 print("⏳ Chargement IA...")
 try:
-    movies_df = pickle.load(open("movies.pkl", "rb"))
-    movies_df["vote_average"] = pd.to_numeric(movies_df["vote_average"], errors="coerce").fillna(5.0)
-    movies_df["popularity"] = pd.to_numeric(movies_df.get("popularity", 0), errors="coerce").fillna(0.0)
-    movies_df["vote_count"] = pd.to_numeric(movies_df.get("vote_count", 0), errors="coerce").fillna(0.0)
-    movies_df["genre_tokens"] = (
-        movies_df["genres"].apply(extract_json_names)
-        if "genres" in movies_df.columns
-        else [[] for _ in range(len(movies_df))]
-    )
-    movies_df["genre_ids"] = (
-        movies_df["genres"].apply(extract_json_ids)
-        if "genres" in movies_df.columns
-        else [[] for _ in range(len(movies_df))]
-    )
-    movies_df["keyword_tokens"] = (
-        movies_df["keywords"].apply(extract_json_names)
-        if "keywords" in movies_df.columns
-        else [[] for _ in range(len(movies_df))]
-    )
-    movies_df["primary_genre"] = (
-        movies_df["genres"].apply(extract_primary_genre_name)
-        if "genres" in movies_df.columns
-        else ["Autres" for _ in range(len(movies_df))]
-    )
-    max_popularity = max(float(movies_df["popularity"].max()), 1.0)
-    max_vote_count = max(float(movies_df["vote_count"].max()), 1.0)
-    global_vote_average = float(movies_df["vote_average"].mean() or 6.2)
-    rating_confidence_threshold = max(
-        60.0,
-        float(movies_df["vote_count"].quantile(0.60) or 0.0),
-    )
-    movies_df["audience_rating_score"] = (
-        (
-            (movies_df["vote_count"] / (movies_df["vote_count"] + rating_confidence_threshold))
-            * (movies_df["vote_average"] / 10.0)
+    movie_model_artifact = load_movie_model_artifact(MOVIE_MODEL_DIR)
+    if movie_model_artifact is not None:
+        # Versioned artifact built offline: memory-mapped read-only, shared by every worker.
+        movies_df = movie_model_artifact["catalog"]
+        vectors = movie_model_artifact["vectors"]
+        movie_neighbor_indices = movie_model_artifact["neighbor_indices"]
+        movie_neighbor_scores = movie_model_artifact["neighbor_scores"]
+        logger.info(
+            "Artefact modele %s charge depuis %s.",
+            movie_model_artifact["manifest"].get("version"),
+            movie_model_artifact["model_dir"],
         )
-        + (
-            (rating_confidence_threshold / (movies_df["vote_count"] + rating_confidence_threshold))
-            * (global_vote_average / 10.0)
+    else:
+        logger.warning("Aucun artefact modele dans %s, reconstruction depuis %s.", MOVIE_MODEL_DIR, MOVIES_PKL_PATH)
+        with open(MOVIES_PKL_PATH, "rb") as movies_file:
+            movies_df = prepare_movies_catalog(pickle.load(movies_file))
+        vectors = build_feature_matrix(movies_df)
+        movie_neighbor_indices = None
+        movie_neighbor_scores = None
+    if movie_model_artifact is not None:
+        model_arrays = movie_model_artifact["arrays"]
+        genre_token_indptr = model_arrays["genre_token_indptr"]
+        genre_token_ids = model_arrays["genre_token_ids"]
+        genre_vocabulary = movie_model_artifact["manifest"]["genre_vocabulary"]
+        keyword_token_indptr = model_arrays["keyword_token_indptr"]
+        keyword_token_ids = model_arrays["keyword_token_ids"]
+        keyword_vocabulary = movie_model_artifact["manifest"]["keyword_vocabulary"]
+    else:
+        genre_token_indptr, genre_token_ids, genre_vocabulary = encode_token_lists(movies_df["genre_tokens"])
+        keyword_token_indptr, keyword_token_ids, keyword_vocabulary = encode_token_lists(movies_df["keyword_tokens"])
+    genre_token_matrix = build_token_matrix(genre_token_indptr, genre_token_ids, len(genre_vocabulary))
+    genre_token_presence_matrix = build_token_presence_matrix(genre_token_matrix)
+    genre_token_counts = np.diff(np.asarray(genre_token_indptr))
+    genre_token_index = {str(token): index for index, token in enumerate(genre_vocabulary)}
+    keyword_token_matrix = build_token_matrix(keyword_token_indptr, keyword_token_ids, len(keyword_vocabulary))
+    keyword_token_counts = np.diff(np.asarray(keyword_token_indptr))
+    keyword_token_index = {str(token): index for index, token in enumerate(keyword_vocabulary)}
+    # Seed clusters only compare the leading keywords of each movie.
+    keyword_lead_token_presence_matrix = build_token_presence_matrix(
+        build_token_matrix(
+            *truncate_token_rows(keyword_token_indptr, keyword_token_ids, SEED_CLUSTER_KEYWORD_LIMIT),
+            len(keyword_vocabulary),
         )
     )
-    movies_df["quality_score"] = (
-        (movies_df["audience_rating_score"] * 0.68)
-        + ((np.log1p(movies_df["popularity"]) / np.log1p(max_popularity)) * 0.12)
-        + ((np.log1p(movies_df["vote_count"]) / np.log1p(max_vote_count)) * 0.20)
-    )
-    cv = CountVectorizer(max_features=5000, stop_words='english')
-    vectors = cv.fit_transform(movies_df['soup']).toarray()
+    if movie_model_artifact is not None and "related_movie_indptr" in model_arrays:
+        related_movie_indptr = model_arrays["related_movie_indptr"]
+        related_movie_ids = model_arrays["related_movie_ids"]
+    else:
+        related_movie_indptr = None
+        related_movie_ids = None
+    if movie_model_artifact is not None and "cold_start_pool_indptr" in model_arrays:
+        cold_start_pool_indptr = model_arrays["cold_start_pool_indptr"]
+        cold_start_pool_positions = model_arrays["cold_start_pool_positions"]
+    else:
+        cold_start_pool_indptr, cold_start_pool_positions = build_cold_start_pools(
+            genre_token_indptr,
+            genre_token_ids,
+            len(genre_vocabulary),
+            movies_df["quality_score"].to_numpy(dtype=float),
+            COLD_START_POOL_SIZE,
+        )
     movie_ids_array = movies_df["id"].astype(int).to_numpy()
     movie_index_by_id = {
         int(movie_id): index
         for index, movie_id in enumerate(movie_ids_array.tolist())
     }
+    if movie_neighbor_indices is None:
+        movie_neighbor_indices, movie_neighbor_scores = load_neighbor_index(MOVIE_NEIGHBORS_DIR, movie_ids_array)
+    if movie_neighbor_indices is None:
+        logger.info("Index voisins films absent, similarite dense en fallback.")
+    else:
+        logger.info("Index voisins films charge (top-k=%s).", movie_neighbor_indices.shape[1])
     movie_primary_genre_by_id = {
         int(row["id"]): str(row["primary_genre"] or "Autres")
         for _, row in movies_df[["id", "primary_genre"]].iterrows()
     }
+    local_movie_index = build_local_movie_index(movies_df)
+    logger.info("Index local des films : %s affiche(s) servie(s) sans TMDB.", len(local_movie_index))
     print("✅ IA Prête !")
 except Exception as ex:
     print(f"Erreur IA (ou démarrage sans modèle): {ex}")
+    movie_model_artifact = None
     movies_df = pd.DataFrame()
     vectors = None
     movie_ids_array = np.array([])
     movie_index_by_id = {}
+    movie_neighbor_indices = None
+    movie_neighbor_scores = None
+    genre_token_matrix = sparse.csr_matrix((0, 0))
+    genre_token_presence_matrix = sparse.csr_matrix((0, 0))
+    genre_token_counts = np.array([], dtype=np.int64)
+    genre_token_index = {}
+    keyword_token_matrix = sparse.csr_matrix((0, 0))
+    keyword_token_counts = np.array([], dtype=np.int64)
+    keyword_token_index = {}
+    keyword_lead_token_presence_matrix = sparse.csr_matrix((0, 0))
+    cold_start_pool_indptr = np.zeros(1, dtype=np.int64)
+    related_movie_indptr = None
+    related_movie_ids = None
+    cold_start_pool_positions = np.array([], dtype=np.int32)
     movie_primary_genre_by_id = {}
+    local_movie_index = {}
 
 # --- 3. OUTILS AUTHENTIFICATION ---
 class UserCreate(BaseModel):
@@ -1574,7 +2318,7 @@ def search_tmdb_people(query: str) -> tuple[dict, ...]:
         return ()
 
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://api.themoviedb.org/3/search/person",
             params={
                 "api_key": TMDB_API_KEY,
@@ -1689,7 +2433,7 @@ def search_soundtracks(query: str) -> tuple[dict, ...]:
         return ()
 
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://itunes.apple.com/search",
             params={
                 "term": normalized_query,
@@ -1879,12 +2623,91 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+
+def release_password_hash_slot() -> None:
+    global password_hash_pending_jobs
+    with password_hash_queue_lock:
+        password_hash_pending_jobs = max(0, password_hash_pending_jobs - 1)
+        PASSWORD_HASH_QUEUE_DEPTH.set(password_hash_pending_jobs)
+
+
+def run_password_hash_job(operation: str, func: Callable[..., Any], args: tuple, queued_at: float) -> Any:
+    release_password_hash_slot()
+    try:
+        return func(*args)
+    finally:
+        PASSWORD_HASH_LATENCY.labels(operation=operation).observe(time.perf_counter() - queued_at)
+
+
+def run_password_kdf(operation: str, func: Callable[..., Any], *args: Any) -> Any:
+    global password_hash_pending_jobs
+    with password_hash_queue_lock:
+        if password_hash_pending_jobs >= PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(status_code=503, detail="Service d'authentification sature, reessaie dans un instant.")
+        password_hash_pending_jobs += 1
+        PASSWORD_HASH_QUEUE_DEPTH.set(password_hash_pending_jobs)
+
+    try:
+        future = password_hash_executor.submit(run_password_hash_job, operation, func, args, time.perf_counter())
+    except RuntimeError:
+        release_password_hash_slot()
+        raise HTTPException(status_code=503, detail="Service d'authentification indisponible.")
+    return future.result()
+
+
+def verify_password_in_executor(plain_password, hashed_password) -> bool:
+    return bool(run_password_kdf("verify", verify_password, plain_password, hashed_password))
+
+
+def get_password_hash_in_executor(password) -> str:
+    return run_password_kdf("hash", get_password_hash, password)
+
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.datetime.utcnow() + datetime.timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+def get_cached_authenticated_user(username: str) -> Optional[dict[str, Any]]:
+    with authenticated_user_cache_lock:
+        entry = authenticated_user_cache.get(username)
+        if entry is None:
+            return None
+        if entry[0] <= time.time():
+            authenticated_user_cache.pop(username, None)
+            return None
+        authenticated_user_cache.move_to_end(username)
+        return dict(entry[1])
+
+
+def store_authenticated_user(username: str, user: dict[str, Any]) -> None:
+    # Users still onboarding flip their flags through ratings and watch-later adds; keep them uncached.
+    if AUTH_PRINCIPAL_CACHE_TTL_SECONDS <= 0 or not user["has_completed_onboarding"]:
+        return
+    with authenticated_user_cache_lock:
+        authenticated_user_cache[username] = (time.time() + AUTH_PRINCIPAL_CACHE_TTL_SECONDS, dict(user))
+        authenticated_user_cache.move_to_end(username)
+        while len(authenticated_user_cache) > AUTH_PRINCIPAL_CACHE_MAX_ENTRIES:
+            authenticated_user_cache.popitem(last=False)
+
+
+def drop_cached_authenticated_user(username: str) -> None:
+    with authenticated_user_cache_lock:
+        authenticated_user_cache.pop(str(username), None)
+
+
+def invalidate_authenticated_user(username: str) -> None:
+    drop_cached_authenticated_user(username)
+    # Other workers drop their copy through the realtime channel listener.
+    client = get_redis_sync_client()
+    if client is None:
+        return
+    try:
+        client.publish(REDIS_REALTIME_CHANNEL, json.dumps({"invalidate_authenticated_user": str(username)}))
+    except Exception:
+        logger.warning("Diffusion Redis de l'invalidation du compte %s impossible.", username)
+
+
 def get_user_from_token(token: str) -> dict:
     credentials_exception = HTTPException(status_code=401, detail="Non autorisé", headers={"WWW-Authenticate": "Bearer"})
     try:
@@ -1892,24 +2715,34 @@ def get_user_from_token(token: str) -> dict:
         username: str = payload.get("sub")
         if username is None: raise credentials_exception
     except JWTError: raise credentials_exception
-    
+
+    cached_user = get_cached_authenticated_user(username)
+    if cached_user is not None:
+        return cached_user
+
     conn = get_db_connection()
     cursor = conn.cursor()
-    cursor.execute(f"SELECT id, username, avatar_url FROM users WHERE username = {SQL_PARAM}", (username,))
+    token_user_id = payload.get("uid")
+    if isinstance(token_user_id, int):
+        cursor.execute(f"SELECT id, username, avatar_url FROM users WHERE id = {SQL_PARAM}", (token_user_id,))
+    else:
+        cursor.execute(f"SELECT id, username, avatar_url FROM users WHERE username = {SQL_PARAM}", (username,))
     user = cursor.fetchone()
-    if user is None:
+    if user is None or user[1] != username:
         conn.close()
         raise credentials_exception
 
     preferences = get_user_preferences(cursor, int(user[0]))
     conn.close()
-    return {
+    authenticated_user = {
         "id": int(user[0]),
         "username": user[1],
         "avatar_url": user[2],
         "has_completed_onboarding": preferences["has_completed_onboarding"],
         "has_completed_tutorial": preferences["has_completed_tutorial"],
     }
+    store_authenticated_user(username, authenticated_user)
+    return authenticated_user
 
 
 async def get_current_user(token: str = Depends(oauth2_scheme)):
@@ -1942,6 +2775,7 @@ def signup(user: UserCreate):
     if len(password) < 4:
         raise HTTPException(status_code=400, detail="Le mot de passe doit contenir au moins 4 caractères")
 
+    hashed_pw = get_password_hash_in_executor(password)
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
@@ -1952,7 +2786,6 @@ def signup(user: UserCreate):
             )
             if cursor.fetchone():
                 raise HTTPException(status_code=400, detail="Cette adresse e-mail est deja utilisee")
-        hashed_pw = get_password_hash(password)
         user_id = execute_insert_and_get_id(
             cursor,
             f"INSERT INTO users (username, password_hash, email) VALUES ({SQL_PARAM}, {SQL_PARAM}, {SQL_PARAM})",
@@ -1970,7 +2803,7 @@ def signup(user: UserCreate):
         raise HTTPException(status_code=400, detail="Ce nom d'utilisateur existe déjà")
     
     conn.close()
-    access_token = create_access_token(data={"sub": username})
+    access_token = create_access_token(data={"sub": username, "uid": int(user_id)})
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -1985,17 +2818,20 @@ def login(form_data: OAuth2PasswordRequestForm = Depends()):
     cursor = conn.cursor()
     cursor.execute(f"SELECT id, password_hash FROM users WHERE username = {SQL_PARAM}", (username,))
     row = cursor.fetchone()
-    
-    if not row or not verify_password(form_data.password, row[1]):
-        conn.close()
+    conn.close()
+
+    if not row or not verify_password_in_executor(form_data.password, row[1]):
         raise HTTPException(status_code=400, detail="Identifiants incorrects")
 
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
     get_or_create_watch_later_id(cursor, row[0])
     preferences = get_user_preferences(cursor, int(row[0]))
     conn.commit()
     conn.close()
     
-    access_token = create_access_token(data={"sub": username})
+    access_token = create_access_token(data={"sub": username, "uid": int(row[0])})
     return {
         "access_token": access_token,
         "token_type": "bearer",
@@ -2082,11 +2918,13 @@ def confirm_password_reset(payload: PasswordResetConfirmPayload):
         (user_id, code_hash),
     )
     code_row = cursor.fetchone()
+    conn.close()
     if not code_row:
-        conn.close()
         raise HTTPException(status_code=400, detail="Code ou identifiant invalide")
 
-    hashed_pw = get_password_hash(normalized_password)
+    hashed_pw = get_password_hash_in_executor(normalized_password)
+    conn = get_db_connection()
+    cursor = conn.cursor()
     cursor.execute(
         f"UPDATE users SET password_hash = {SQL_PARAM} WHERE id = {SQL_PARAM}",
         (hashed_pw, user_id),
@@ -2193,6 +3031,7 @@ async def upload_profile_avatar(
     )
     conn.commit()
     conn.close()
+    invalidate_authenticated_user(current_user["username"])
 
     previous_path = local_avatar_path_from_url(previous_avatar_url)
     if previous_path and previous_path != avatar_path and os.path.exists(previous_path):
@@ -2220,6 +3059,7 @@ def complete_tutorial(current_user: dict = Depends(get_current_user)):
     )
     conn.commit()
     conn.close()
+    invalidate_authenticated_user(current_user["username"])
     return {"status": "completed"}
 
 
@@ -2265,6 +3105,9 @@ def reset_test_user_data(current_user: dict = Depends(get_current_user)):
         raise HTTPException(status_code=403, detail="Reset reserve au compte test.")
     reset_counts, previous_avatar_url = purge_user_data(cursor, user_id, delete_account=False)
     conn.commit()
+    invalidate_authenticated_user(current_user["username"])
+    invalidate_collaborative_neighbors(cursor, user_id)
+    invalidate_recommendation_taste_state(user_id)
     conn.close()
 
     previous_avatar_path = local_avatar_path_from_url(previous_avatar_url)
@@ -2289,6 +3132,9 @@ def reset_recommendation_profile_route(current_user: dict = Depends(get_current_
     cursor = conn.cursor()
     reset_counts = reset_recommendation_profile(cursor, user_id)
     conn.commit()
+    invalidate_authenticated_user(current_user["username"])
+    invalidate_collaborative_neighbors(cursor, user_id)
+    invalidate_recommendation_taste_state(user_id)
     preferences = get_user_preferences(cursor, user_id)
     conn.close()
 
@@ -2307,6 +3153,9 @@ def delete_current_user_account(current_user: dict = Depends(get_current_user)):
     cursor = conn.cursor()
     reset_counts, previous_avatar_url = purge_user_data(cursor, user_id, delete_account=True)
     conn.commit()
+    invalidate_authenticated_user(current_user["username"])
+    invalidate_collaborative_neighbors(cursor, user_id)
+    invalidate_recommendation_taste_state(user_id)
     conn.close()
 
     previous_avatar_path = local_avatar_path_from_url(previous_avatar_url)
@@ -2393,7 +3242,9 @@ def save_onboarding_preferences(
     )
     conn.commit()
     preferences = get_user_preferences(cursor, current_user["id"])
+    record_taste_state_preferences(current_user["id"], preferences)
     conn.close()
+    invalidate_authenticated_user(current_user["username"])
     return preferences
 
 
@@ -2474,115 +3325,351 @@ def save_profile_preferences(
     )
     conn.commit()
     preferences = get_user_preferences(cursor, current_user["id"])
+    record_taste_state_preferences(current_user["id"], preferences)
     conn.close()
+    invalidate_authenticated_user(current_user["username"])
     return serialize_profile_preferences(preferences)
 
 # --- 5. OUTILS TMDB (Inchangé) ---
-@lru_cache(maxsize=2048)
+def build_tmdb_poster_url(data: Optional[Any]) -> str:
+    poster_path = data.get("poster_path") if isinstance(data, dict) else None
+    return "https://image.tmdb.org/t/p/w500" + poster_path if poster_path else "https://via.placeholder.com/500"
+
+
 def fetch_poster_from_tmdb(movie_id):
-    try:
-        url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR"
-        data = requests.get(url, timeout=1).json()
-        return "https://image.tmdb.org/t/p/w500" + data.get('poster_path') if data.get('poster_path') else "https://via.placeholder.com/500"
-    except: return "https://via.placeholder.com/500"
+    return fetch_posters_from_tmdb([int(movie_id)])[int(movie_id)]
 
 
+@timed_stage("tmdb.posters")
 def fetch_posters_from_tmdb(movie_ids: list[int]) -> dict[int, str]:
     unique_movie_ids = [int(movie_id) for movie_id in dict.fromkeys(movie_ids)]
-    if not unique_movie_ids:
-        return {}
-    if len(unique_movie_ids) == 1:
-        movie_id = unique_movie_ids[0]
-        return {movie_id: fetch_poster_from_tmdb(movie_id)}
-
     poster_urls: dict[int, str] = {}
-    max_workers = min(8, len(unique_movie_ids))
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_by_movie_id = {
-            executor.submit(fetch_poster_from_tmdb, movie_id): movie_id
-            for movie_id in unique_movie_ids
-        }
-        for future in as_completed(future_by_movie_id):
-            movie_id = future_by_movie_id[future]
-            try:
-                poster_urls[movie_id] = future.result()
-            except Exception:
-                poster_urls[movie_id] = "https://via.placeholder.com/500"
+    for movie_id in unique_movie_ids:
+        local_poster_url = local_movie_index.get(movie_id)
+        if local_poster_url is not None:
+            poster_urls[movie_id] = local_poster_url
 
+    with tmdb_cache_lock:
+        for movie_id in unique_movie_ids:
+            if movie_id in poster_urls:
+                continue
+            poster_url = tmdb_poster_url_cache.get(movie_id)
+            if poster_url is not None:
+                tmdb_poster_url_cache.move_to_end(movie_id)
+                poster_urls[movie_id] = poster_url
+
+    upstream_calls = {
+        movie_id: submit_upstream_json(
+            f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR",
+            timeout=1,
+        )
+        for movie_id in unique_movie_ids
+        if movie_id not in poster_urls
+    }
+    for movie_id, upstream_call in upstream_calls.items():
+        poster_urls[movie_id] = build_tmdb_poster_url(wait_upstream_json(upstream_call, 1))
+
+    if upstream_calls:
+        with tmdb_cache_lock:
+            for movie_id in upstream_calls:
+                tmdb_poster_url_cache[movie_id] = poster_urls[movie_id]
+            while len(tmdb_poster_url_cache) > 2048:
+                tmdb_poster_url_cache.popitem(last=False)
     return poster_urls
 
-def get_cached_tmdb_payload(
-    cache: dict[int, tuple[float, dict[str, Any]]],
-    key: int,
-    *,
-    allow_stale: bool = False,
-) -> Optional[dict[str, Any]]:
-    with tmdb_cache_lock:
-        cached_entry = cache.get(int(key))
 
-    if not cached_entry:
+def read_shared_upstream_cache_entry(cache_key: str) -> Optional[tuple[float, dict[str, Any]]]:
+    client = get_redis_sync_client()
+    if client is not None:
+        try:
+            raw_entry = client.get(f"{UPSTREAM_CACHE_REDIS_PREFIX}{cache_key}")
+            if not raw_entry:
+                return None
+            entry = json.loads(raw_entry)
+            return float(entry["expires_at"]), entry["payload"]
+        except Exception:
+            logger.warning("Lecture Redis du cache amont impossible pour %s.", cache_key)
+            return None
+
+    try:
+        conn = get_db_connection(row_factory=True)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT payload_json, expires_at FROM upstream_response_cache WHERE cache_key = {SQL_PARAM}",
+                (cache_key,),
+            )
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        return float(row_get_value(row, "expires_at", 1)), json.loads(str(row_get_value(row, "payload_json", 0)))
+    except Exception:
+        logger.warning("Lecture SQL du cache amont impossible pour %s.", cache_key)
         return None
 
-    expires_at, payload = cached_entry
-    if expires_at > time.time() or allow_stale:
-        return payload
 
-    return None
+def read_shared_upstream_cache_entries(cache_keys: list[str]) -> dict[str, tuple[float, dict[str, Any]]]:
+    if not cache_keys:
+        return {}
+
+    entries: dict[str, tuple[float, dict[str, Any]]] = {}
+    client = get_redis_sync_client()
+    if client is not None:
+        try:
+            raw_entries = client.mget([f"{UPSTREAM_CACHE_REDIS_PREFIX}{cache_key}" for cache_key in cache_keys])
+            for cache_key, raw_entry in zip(cache_keys, raw_entries):
+                if raw_entry:
+                    entry = json.loads(raw_entry)
+                    entries[cache_key] = (float(entry["expires_at"]), entry["payload"])
+        except Exception:
+            logger.warning("Lecture Redis groupee du cache amont impossible (%s cle(s)).", len(cache_keys))
+        return entries
+
+    try:
+        conn = get_db_connection(row_factory=True)
+        try:
+            cursor = conn.cursor()
+            for start in range(0, len(cache_keys), 500):
+                chunk = cache_keys[start:start + 500]
+                cursor.execute(
+                    f"""
+                    SELECT cache_key, payload_json, expires_at
+                    FROM upstream_response_cache
+                    WHERE cache_key IN ({sql_placeholders(len(chunk))})
+                    """,
+                    tuple(chunk),
+                )
+                for row in cursor.fetchall():
+                    entries[str(row_get_value(row, "cache_key", 0))] = (
+                        float(row_get_value(row, "expires_at", 2)),
+                        json.loads(str(row_get_value(row, "payload_json", 1))),
+                    )
+        finally:
+            conn.close()
+    except Exception:
+        logger.warning("Lecture SQL groupee du cache amont impossible (%s cle(s)).", len(cache_keys))
+    return entries
+
+
+def write_shared_upstream_cache_entry(cache_key: str, expires_at: float, payload: dict[str, Any]) -> None:
+    client = get_redis_sync_client()
+    if client is not None:
+        try:
+            client.set(
+                f"{UPSTREAM_CACHE_REDIS_PREFIX}{cache_key}",
+                json.dumps({"expires_at": expires_at, "payload": payload}, ensure_ascii=False, separators=(",", ":")),
+                ex=max(int(expires_at - time.time()), 1) + UPSTREAM_CACHE_STALE_SECONDS,
+            )
+        except Exception:
+            logger.warning("Ecriture Redis du cache amont impossible pour %s.", cache_key)
+        return
+
+    try:
+        conn = get_db_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                INSERT INTO upstream_response_cache (cache_key, payload_json, fetched_at, expires_at)
+                VALUES ({SQL_PARAM}, {SQL_PARAM}, {SQL_PARAM}, {SQL_PARAM})
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    payload_json = excluded.payload_json,
+                    fetched_at = excluded.fetched_at,
+                    expires_at = excluded.expires_at
+                """,
+                (
+                    cache_key,
+                    json.dumps(payload, ensure_ascii=False, separators=(",", ":")),
+                    time.time(),
+                    expires_at,
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception:
+        logger.warning("Ecriture SQL du cache amont impossible pour %s.", cache_key)
+
+
+def purge_expired_upstream_cache_entries() -> int:
+    # Redis drops its copies through the key TTL; the SQL fallback has to be swept.
+    if get_redis_sync_client() is not None:
+        return 0
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"DELETE FROM upstream_response_cache WHERE expires_at < {SQL_PARAM}",
+            (time.time() - UPSTREAM_CACHE_STALE_SECONDS,),
+        )
+        deleted_count = max(cursor.rowcount, 0)
+        conn.commit()
+    finally:
+        conn.close()
+    return deleted_count
+
+
+def store_local_upstream_cache_entry(
+    cache: OrderedDict[str, tuple[float, dict[str, Any]]],
+    cache_key: str,
+    entry: tuple[float, dict[str, Any]],
+) -> None:
+    with tmdb_cache_lock:
+        cache[cache_key] = entry
+        cache.move_to_end(cache_key)
+        while len(cache) > UPSTREAM_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+def read_upstream_cache_entry(
+    cache: OrderedDict[str, tuple[float, dict[str, Any]]],
+    cache_key: str,
+) -> Optional[tuple[float, dict[str, Any]]]:
+    with tmdb_cache_lock:
+        local_entry = cache.get(cache_key)
+        if local_entry is not None:
+            cache.move_to_end(cache_key)
+    if local_entry is not None and local_entry[0] > time.time():
+        return local_entry
+
+    # Another worker may already have refreshed an entry this process only holds stale.
+    shared_entry = read_shared_upstream_cache_entry(cache_key)
+    if shared_entry is None or (local_entry is not None and shared_entry[0] <= local_entry[0]):
+        return local_entry
+
+    store_local_upstream_cache_entry(cache, cache_key, shared_entry)
+    return shared_entry
 
 
-def set_cached_tmdb_payload(
-    cache: dict[int, tuple[float, dict[str, Any]]],
-    key: int,
+def write_upstream_cache_entry(
+    cache: OrderedDict[str, tuple[float, dict[str, Any]]],
+    cache_key: str,
     payload: dict[str, Any],
     ttl_seconds: int,
 ) -> dict[str, Any]:
-    with tmdb_cache_lock:
-        cache[int(key)] = (time.time() + ttl_seconds, payload)
-        if len(cache) > 4096:
-            oldest_keys = sorted(cache.items(), key=lambda item: item[1][0])[:1024]
-            for cached_key, _ in oldest_keys:
-                cache.pop(cached_key, None)
+    expires_at = time.time() + ttl_seconds
+    store_local_upstream_cache_entry(cache, cache_key, (expires_at, payload))
+    write_shared_upstream_cache_entry(cache_key, expires_at, payload)
     return payload
 
 
-def get_cached_watchmode_sources(cache_key: str, *, allow_stale: bool = False) -> Optional[dict[str, Any]]:
+def refresh_upstream_cache_entry(
+    cache: OrderedDict[str, tuple[float, dict[str, Any]]],
+    cache_key: str,
+    ttl_seconds: int,
+    loader: Callable[[], Optional[dict[str, Any]]],
+) -> None:
+    try:
+        payload = loader()
+        if payload is not None:
+            write_upstream_cache_entry(cache, cache_key, payload, ttl_seconds)
+    except Exception:
+        logger.exception("Rafraichissement du cache amont impossible pour %s.", cache_key)
+    finally:
+        with tmdb_cache_lock:
+            upstream_refresh_keys.discard(cache_key)
+
+
+def schedule_upstream_cache_refresh(
+    cache: OrderedDict[str, tuple[float, dict[str, Any]]],
+    cache_key: str,
+    ttl_seconds: int,
+    loader: Callable[[], Optional[dict[str, Any]]],
+) -> None:
     with tmdb_cache_lock:
-        cached_entry = watchmode_sources_cache.get(cache_key)
+        if cache_key in upstream_refresh_keys:
+            return
+        upstream_refresh_keys.add(cache_key)
+    try:
+        upstream_refresh_executor.submit(refresh_upstream_cache_entry, cache, cache_key, ttl_seconds, loader)
+    except RuntimeError:
+        with tmdb_cache_lock:
+            upstream_refresh_keys.discard(cache_key)
 
-    if not cached_entry:
-        return None
 
-    expires_at, payload = cached_entry
-    if expires_at > time.time() or allow_stale:
+def read_servable_upstream_payload(
+    cache: OrderedDict[str, tuple[float, dict[str, Any]]],
+    cache_key: str,
+    ttl_seconds: int,
+    loader: Callable[[], Optional[dict[str, Any]]],
+) -> tuple[Optional[dict[str, Any]], Optional[tuple[float, dict[str, Any]]]]:
+    # Returns the payload to serve now, or the too-old entry kept as a fallback for a failed fetch.
+    entry = read_upstream_cache_entry(cache, cache_key)
+    now = time.time()
+    if entry is not None:
+        expires_at, payload = entry
+        if expires_at > now:
+            return payload, None
+        if expires_at + UPSTREAM_CACHE_STALE_SECONDS > now:
+            schedule_upstream_cache_refresh(cache, cache_key, ttl_seconds, loader)
+            return payload, None
+    return None, entry
+
+
+def get_tiered_upstream_payload(
+    cache: OrderedDict[str, tuple[float, dict[str, Any]]],
+    cache_key: str,
+    ttl_seconds: int,
+    loader: Callable[[], Optional[dict[str, Any]]],
+) -> Optional[dict[str, Any]]:
+    payload, entry = read_servable_upstream_payload(cache, cache_key, ttl_seconds, loader)
+    if payload is not None:
         return payload
 
-    return None
+    payload = loader()
+    if payload is not None:
+        return write_upstream_cache_entry(cache, cache_key, payload, ttl_seconds)
 
+    return entry[1] if entry is not None else None
 
-def set_cached_watchmode_sources(cache_key: str, payload: dict[str, Any]) -> dict[str, Any]:
-    with tmdb_cache_lock:
-        watchmode_sources_cache[cache_key] = (
-            time.time() + WATCHMODE_SOURCES_CACHE_TTL_SECONDS,
-            payload,
-        )
-        if len(watchmode_sources_cache) > 4096:
-            oldest_keys = sorted(watchmode_sources_cache.items(), key=lambda item: item[1][0])[:1024]
-            for cached_key, _ in oldest_keys:
-                watchmode_sources_cache.pop(cached_key, None)
-    return payload
 
+def run_single_flight(upstream: str, key: str, fetch: Callable[[], Any]) -> Any:
+    # Concurrent misses on the same upstream URL wait for the first caller's fetch.
+    with upstream_inflight_lock:
+        inflight_call = upstream_inflight_calls.get(key)
+        if inflight_call is None:
+            inflight_call = Future()
+            upstream_inflight_calls[key] = inflight_call
+            is_leader = True
+        else:
+            is_leader = False
 
-def fetch_tmdb_watch_providers_payload(movie_id: int) -> Optional[dict]:
+    if not is_leader:
+        UPSTREAM_SINGLE_FLIGHT_REQUESTS.labels(upstream=upstream, role="coalesced").inc()
+        return inflight_call.result()
+
+    UPSTREAM_SINGLE_FLIGHT_REQUESTS.labels(upstream=upstream, role="leader").inc()
     try:
-        url = f"https://api.themoviedb.org/3/movie/{movie_id}/watch/providers?api_key={TMDB_API_KEY}"
-        response = requests.get(url, timeout=2)
-        response.raise_for_status()
-        data = response.json()
-    except Exception as exc:
-        logger.warning("Echec TMDB watch providers pour movie_id=%s: %s", movie_id, exc)
-        return None
+        result = fetch()
+    except BaseException as exc:
+        inflight_call.set_exception(exc)
+        raise
+    else:
+        inflight_call.set_result(result)
+        return result
+    finally:
+        with upstream_inflight_lock:
+            upstream_inflight_calls.pop(key, None)
 
-    return data if isinstance(data, dict) else None
+
+def fetch_tmdb_watch_providers_payload(movie_id: int) -> Optional[dict]:
+    url = f"https://api.themoviedb.org/3/movie/{movie_id}/watch/providers?api_key={TMDB_API_KEY}"
+
+    def fetch() -> Optional[dict]:
+        try:
+            response = upstream_get(url, timeout=2)
+            response.raise_for_status()
+            data = response.json()
+        except Exception as exc:
+            logger.warning("Echec TMDB watch providers pour movie_id=%s: %s", movie_id, exc)
+            return None
+
+        return data if isinstance(data, dict) else None
+
+    return run_single_flight("tmdb", url, fetch)
 
 
 def normalize_watch_provider_name(value: str) -> str:
@@ -2789,7 +3876,7 @@ def scrape_tmdb_watch_page_provider_links(page_url: str) -> dict[str, str]:
         return {}
 
     try:
-        response = requests.get(
+        response = upstream_get(
             page_url,
             timeout=5,
             headers={"User-Agent": "Mozilla/5.0 (compatible; QulteBot/1.0)"},
@@ -2943,18 +4030,23 @@ def fetch_watchmode_payload(path: str, params: dict[str, Any]) -> Optional[Any]:
     if not WATCHMODE_API_KEY:
         return None
 
-    try:
-        response = requests.get(
-            f"https://api.watchmode.com/v1{path}",
-            params=params,
-            headers={"X-API-Key": WATCHMODE_API_KEY},
-            timeout=3,
-        )
-        response.raise_for_status()
-        return response.json()
-    except Exception as exc:
-        logger.warning("Echec Watchmode path=%s params=%s: %s", path, params, exc)
-        return None
+    url = f"https://api.watchmode.com/v1{path}"
+
+    def fetch() -> Optional[Any]:
+        try:
+            response = upstream_get(
+                url,
+                params=params,
+                headers={"X-API-Key": WATCHMODE_API_KEY},
+                timeout=3,
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception as exc:
+            logger.warning("Echec Watchmode path=%s params=%s: %s", path, params, exc)
+            return None
+
+    return run_single_flight("watchmode", f"{url}?{urlencode(sorted(params.items()))}", fetch)
 
 
 def resolve_watchmode_title_id_for_tmdb_movie(movie_id: int) -> Optional[str]:
@@ -2986,24 +4078,17 @@ def resolve_watchmode_title_id_for_tmdb_movie(movie_id: int) -> Optional[str]:
     return None
 
 
-def fetch_watchmode_sources_for_movie(movie_id: int, region_code: str) -> Optional[dict[str, Any]]:
-    normalized_region = (region_code or "FR").strip().upper() or "FR"
-    cache_key = f"{int(movie_id)}:{normalized_region}"
-    cached_payload = get_cached_watchmode_sources(cache_key)
-    if cached_payload is not None:
-        return cached_payload
-
+def load_watchmode_sources_for_movie(movie_id: int, normalized_region: str) -> Optional[dict[str, Any]]:
     watchmode_title_id = resolve_watchmode_title_id_for_tmdb_movie(int(movie_id))
     if not watchmode_title_id:
-        return get_cached_watchmode_sources(cache_key, allow_stale=True)
+        return None
 
     payload = fetch_watchmode_payload(
         f"/title/{watchmode_title_id}/sources",
         {"regions": normalized_region},
     )
     if not isinstance(payload, list):
-        stale_payload = get_cached_watchmode_sources(cache_key, allow_stale=True)
-        return stale_payload
+        return None
 
     source_map: dict[str, dict[str, Any]] = {}
     first_web_url: Optional[str] = None
@@ -3028,16 +4113,31 @@ def fetch_watchmode_sources_for_movie(movie_id: int, region_code: str) -> Option
         if source_payload["web_url"] and not first_web_url:
             first_web_url = source_payload["web_url"]
 
-    return set_cached_watchmode_sources(
-        cache_key,
-        {
-            "region": normalized_region,
-            "link": first_web_url or "",
-            "sources_by_name": source_map,
-        },
+    return {
+        "region": normalized_region,
+        "link": first_web_url or "",
+        "sources_by_name": source_map,
+    }
+
+
+def fetch_watchmode_sources_for_movie(movie_id: int, region_code: str) -> Optional[dict[str, Any]]:
+    normalized_region = (region_code or "FR").strip().upper() or "FR"
+    return get_tiered_upstream_payload(
+        watchmode_sources_cache,
+        f"watchmode-sources:{int(movie_id)}:{normalized_region}",
+        WATCHMODE_SOURCES_CACHE_TTL_SECONDS,
+        lambda: load_watchmode_sources_for_movie(int(movie_id), normalized_region),
     )
 
 
+def get_cached_watchmode_sources_for_movie(movie_id: int, region_code: str) -> Optional[dict[str, Any]]:
+    normalized_region = (region_code or "FR").strip().upper() or "FR"
+    entry = read_upstream_cache_entry(watchmode_sources_cache, f"watchmode-sources:{int(movie_id)}:{normalized_region}")
+    if entry is None or entry[0] <= time.time():
+        enqueue_provider_refresh([int(movie_id)])
+    return entry[1] if entry is not None else None
+
+
 def attach_watchmode_links_to_provider(provider: dict[str, Any], watchmode_sources_by_name: dict[str, Any]) -> dict[str, Any]:
     enriched_provider = dict(provider)
     match = lookup_provider_alias_match(str(provider.get("name") or ""), watchmode_sources_by_name)
@@ -3061,7 +4161,7 @@ def attach_tmdb_scraped_links_to_provider(provider: dict[str, Any], scraped_link
     return enriched_provider
 
 
-def enhance_watch_providers_with_tmdb_scrape(movie_id: int, watch_providers: dict) -> dict:
+def enhance_watch_providers_with_tmdb_scrape(movie_id: int, watch_providers: dict, *, allow_scrape: bool = False) -> dict:
     region_code = str(watch_providers.get("region") or "FR").strip().upper() or "FR"
     page_url = str(watch_providers.get("link") or "").strip()
     expected_missing_provider_count = sum(
@@ -3082,6 +4182,18 @@ def enhance_watch_providers_with_tmdb_scrape(movie_id: int, watch_providers: dic
                 if str(value or "").startswith(("http://", "https://"))
             }
 
+    if provider_links_by_name is None and not allow_scrape:
+        # Scraping only runs in the provider refresh worker; serve whatever is stored meanwhile.
+        if page_url:
+            enqueue_provider_refresh([int(movie_id)])
+        stale_payload = get_cached_tmdb_page_provider_links(int(movie_id), region_code, allow_stale=True)
+        stale_links = stale_payload.get("provider_links") if isinstance(stale_payload, dict) else None
+        provider_links_by_name = {
+            normalize_watch_provider_name(str(key)): str(value)
+            for key, value in (stale_links if isinstance(stale_links, dict) else {}).items()
+            if str(value or "").startswith(("http://", "https://"))
+        }
+
     if provider_links_by_name is None:
         scraped_links = scrape_tmdb_watch_page_provider_links(page_url)
         if scraped_links:
@@ -3136,12 +4248,16 @@ def enhance_watch_providers_with_tmdb_scrape(movie_id: int, watch_providers: dic
     return enriched
 
 
-def enhance_watch_providers_with_watchmode(movie_id: int, watch_providers: dict) -> dict:
+def enhance_watch_providers_with_watchmode(movie_id: int, watch_providers: dict, *, allow_fetch: bool = False) -> dict:
     if not WATCHMODE_API_KEY:
         return watch_providers
 
     region_code = str(watch_providers.get("region") or "FR").strip().upper() or "FR"
-    watchmode_payload = fetch_watchmode_sources_for_movie(int(movie_id), region_code)
+    watchmode_payload = (
+        fetch_watchmode_sources_for_movie(int(movie_id), region_code)
+        if allow_fetch
+        else get_cached_watchmode_sources_for_movie(int(movie_id), region_code)
+    )
     if not isinstance(watchmode_payload, dict):
         return watch_providers
 
@@ -3196,27 +4312,22 @@ def serialize_tmdb_watch_providers(data: dict) -> dict:
     }
 
 
-def get_tmdb_watch_providers(movie_id: int) -> dict:
-    cached_payload = get_cached_tmdb_payload(tmdb_watch_providers_cache, movie_id)
-    if cached_payload is not None:
-        enhanced_payload = enhance_watch_providers_with_watchmode(movie_id, cached_payload)
-        return enhance_watch_providers_with_tmdb_scrape(movie_id, enhanced_payload)
-
+def load_tmdb_watch_providers(movie_id: int) -> Optional[dict[str, Any]]:
     provider_payload = fetch_tmdb_watch_providers_payload(movie_id)
-    if provider_payload is not None:
-        tmdb_payload = set_cached_tmdb_payload(
-            tmdb_watch_providers_cache,
-            movie_id,
-            serialize_tmdb_watch_providers(provider_payload),
-            TMDB_WATCH_PROVIDERS_CACHE_TTL_SECONDS,
-        )
-        enhanced_payload = enhance_watch_providers_with_watchmode(movie_id, tmdb_payload)
-        return enhance_watch_providers_with_tmdb_scrape(movie_id, enhanced_payload)
+    return serialize_tmdb_watch_providers(provider_payload) if provider_payload is not None else None
 
-    stale_payload = get_cached_tmdb_payload(tmdb_watch_providers_cache, movie_id, allow_stale=True)
-    if stale_payload is not None:
-        enhanced_payload = enhance_watch_providers_with_watchmode(movie_id, stale_payload)
-        return enhance_watch_providers_with_tmdb_scrape(movie_id, enhanced_payload)
+
+def get_tmdb_watch_providers(movie_id: int, *, refresh_links: bool = False) -> dict:
+    tmdb_payload = get_tiered_upstream_payload(
+        tmdb_watch_providers_cache,
+        f"tmdb-providers:{int(movie_id)}",
+        TMDB_WATCH_PROVIDERS_CACHE_TTL_SECONDS,
+        lambda: load_tmdb_watch_providers(movie_id),
+    )
+    if tmdb_payload is not None:
+        refresh_links = refresh_links or not PROVIDER_REFRESH_ENABLED
+        enhanced_payload = enhance_watch_providers_with_watchmode(movie_id, tmdb_payload, allow_fetch=refresh_links)
+        return enhance_watch_providers_with_tmdb_scrape(movie_id, enhanced_payload, allow_scrape=refresh_links)
 
     return {
         "region": "",
@@ -3227,19 +4338,22 @@ def get_tmdb_watch_providers(movie_id: int) -> dict:
     }
 
 
-def fetch_tmdb_movie_details_payload(movie_id: int) -> Optional[dict]:
-    try:
-        url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR&append_to_response=videos,credits"
-        response = requests.get(url, timeout=3)
-        response.raise_for_status()
-        data = response.json()
-    except Exception as exc:
-        logger.warning("Echec TMDB details pour movie_id=%s: %s", movie_id, exc)
-        return None
+def submit_tmdb_movie_details_payload(movie_id: int) -> Future:
+    return submit_upstream_json(
+        f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR&append_to_response=videos,credits",
+        timeout=3,
+    )
+
 
+def resolve_tmdb_movie_details_payload(upstream_call: Future) -> Optional[dict]:
+    data = wait_upstream_json(upstream_call, 3)
     return data if isinstance(data, dict) and isinstance(data.get("id"), int) else None
 
 
+def fetch_tmdb_movie_details_payload(movie_id: int) -> Optional[dict]:
+    return resolve_tmdb_movie_details_payload(submit_tmdb_movie_details_payload(movie_id))
+
+
 def build_tmdb_movie_details_payload(data: dict, watch_providers: dict) -> dict:
     resolved_watch_providers = apply_provider_search_fallbacks(
         watch_providers,
@@ -3290,30 +4404,27 @@ def build_tmdb_movie_details_payload(data: dict, watch_providers: dict) -> dict:
     }
 
 
+@timed_stage("tmdb.details")
 def get_tmdb_details(movie_id):
-    cached_payload = get_cached_tmdb_payload(tmdb_movie_details_cache, movie_id)
-    if cached_payload is not None:
-        return cached_payload
-
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        details_future = executor.submit(fetch_tmdb_movie_details_payload, movie_id)
-        watch_providers_future = executor.submit(get_tmdb_watch_providers, movie_id)
-        data = details_future.result()
-        watch_providers = watch_providers_future.result()
-
-    if data is not None:
-        payload = build_tmdb_movie_details_payload(data, watch_providers)
-        return set_cached_tmdb_payload(
-            tmdb_movie_details_cache,
-            movie_id,
-            payload,
-            TMDB_MOVIE_DETAILS_CACHE_TTL_SECONDS,
-        )
-
-    stale_payload = get_cached_tmdb_payload(tmdb_movie_details_cache, movie_id, allow_stale=True)
-    if stale_payload is not None:
-        return stale_payload
+    fetched_watch_providers: dict[str, Any] = {}
+
+    def load_tmdb_movie_details() -> Optional[dict[str, Any]]:
+        # The details call runs on the upstream loop while this thread resolves the providers.
+        details_call = submit_tmdb_movie_details_payload(movie_id)
+        fetched_watch_providers.update(get_tmdb_watch_providers(movie_id))
+        data = resolve_tmdb_movie_details_payload(details_call)
+        return build_tmdb_movie_details_payload(data, fetched_watch_providers) if data is not None else None
+
+    payload = get_tiered_upstream_payload(
+        tmdb_movie_details_cache,
+        f"tmdb-details:{int(movie_id)}",
+        TMDB_MOVIE_DETAILS_CACHE_TTL_SECONDS,
+        load_tmdb_movie_details,
+    )
+    if payload is not None:
+        return payload
 
+    watch_providers = fetched_watch_providers or get_tmdb_watch_providers(movie_id)
     summary = get_tmdb_movie_summary(movie_id)
     if summary is not None:
         return {
@@ -3338,7 +4449,7 @@ def get_tmdb_details(movie_id):
 @lru_cache(maxsize=512)
 def get_tmdb_person_details(person_id: int) -> Optional[dict]:
     try:
-        response = requests.get(
+        response = upstream_get(
             f"https://api.themoviedb.org/3/person/{person_id}",
             params={
                 "api_key": TMDB_API_KEY,
@@ -3465,8 +4576,7 @@ def get_user_owned_streaming_services(cursor, user_id: int) -> list[str]:
     )
 
 
-def build_movie_subscription_provider_names(movie_id: int) -> list[str]:
-    watch_providers = get_tmdb_watch_providers(int(movie_id))
+def extract_subscription_provider_names(watch_providers: dict) -> list[str]:
     return dedupe_list(
         [
             normalized
@@ -3479,123 +4589,331 @@ def build_movie_subscription_provider_names(movie_id: int) -> list[str]:
     )
 
 
-def fetch_playlist_base_rows(cursor, playlist_id: int, user_id: int) -> tuple[list[dict], bool, Optional[int]]:
-    if playlist_id == WATCH_LATER_SYSTEM_ID:
-        target_id = get_or_create_watch_later_id(cursor, user_id)
+def build_movie_subscription_provider_names(movie_id: int) -> list[str]:
+    return extract_subscription_provider_names(get_tmdb_watch_providers(int(movie_id)))
+
+
+def store_movie_subscription_provider_names(movie_id: int, expires_at: float, provider_names: list[str]) -> None:
+    with tmdb_cache_lock:
+        movie_subscription_provider_names_cache[int(movie_id)] = (expires_at, list(provider_names))
+        movie_subscription_provider_names_cache.move_to_end(int(movie_id))
+        while len(movie_subscription_provider_names_cache) > UPSTREAM_CACHE_MAX_ENTRIES:
+            movie_subscription_provider_names_cache.popitem(last=False)
+
+
+def get_movie_subscription_provider_names_batch(movie_ids: list[int]) -> dict[int, list[str]]:
+    # Names come from the TMDB providers payload alone (cached, else fetched as one batch on
+    # the upstream loop); Watchmode links and page scraping are left to the refresh worker.
+    unique_movie_ids = [int(movie_id) for movie_id in dict.fromkeys(movie_ids)]
+    if not PROVIDER_REFRESH_ENABLED:
+        return {movie_id: build_movie_subscription_provider_names(movie_id) for movie_id in unique_movie_ids}
+
+    now = time.time()
+    provider_names_by_movie_id: dict[int, list[str]] = {}
+    with tmdb_cache_lock:
+        for movie_id in unique_movie_ids:
+            cached = movie_subscription_provider_names_cache.get(movie_id)
+            if cached is not None and cached[0] > now:
+                movie_subscription_provider_names_cache.move_to_end(movie_id)
+                provider_names_by_movie_id[movie_id] = list(cached[1])
+
+    missing_movie_ids = [movie_id for movie_id in unique_movie_ids if movie_id not in provider_names_by_movie_id]
+    entries_by_movie_id: dict[int, tuple[float, dict[str, Any]]] = {}
+    with tmdb_cache_lock:
+        for movie_id in missing_movie_ids:
+            local_entry = tmdb_watch_providers_cache.get(f"tmdb-providers:{movie_id}")
+            if local_entry is not None and local_entry[0] > now:
+                entries_by_movie_id[movie_id] = local_entry
+
+    shared_entries = read_shared_upstream_cache_entries(
+        [f"tmdb-providers:{movie_id}" for movie_id in missing_movie_ids if movie_id not in entries_by_movie_id]
+    )
+    for cache_key, entry in shared_entries.items():
+        store_local_upstream_cache_entry(tmdb_watch_providers_cache, cache_key, entry)
+        entries_by_movie_id[int(cache_key.rsplit(":", 1)[1])] = entry
+
+    unknown_movie_ids: list[int] = []
+    for movie_id in missing_movie_ids:
+        entry = entries_by_movie_id.get(movie_id)
+        if entry is None or entry[0] + UPSTREAM_CACHE_STALE_SECONDS <= now:
+            unknown_movie_ids.append(movie_id)
+            continue
+        if entry[0] <= now:
+            unknown_movie_ids.append(movie_id)
+        provider_names_by_movie_id[movie_id] = extract_subscription_provider_names(entry[1])
+        store_movie_subscription_provider_names(movie_id, entry[0], provider_names_by_movie_id[movie_id])
+
+    uncached_movie_ids = [movie_id for movie_id in missing_movie_ids if movie_id not in provider_names_by_movie_id]
+    provider_payloads = fetch_upstream_json_batch(
+        [
+            f"https://api.themoviedb.org/3/movie/{movie_id}/watch/providers?api_key={TMDB_API_KEY}"
+            for movie_id in uncached_movie_ids
+        ],
+        timeout=2,
+    )
+    for movie_id, provider_payload in zip(uncached_movie_ids, provider_payloads):
+        if not isinstance(provider_payload, dict):
+            continue
+        watch_providers = write_upstream_cache_entry(
+            tmdb_watch_providers_cache,
+            f"tmdb-providers:{movie_id}",
+            serialize_tmdb_watch_providers(provider_payload),
+            TMDB_WATCH_PROVIDERS_CACHE_TTL_SECONDS,
+        )
+        provider_names_by_movie_id[movie_id] = extract_subscription_provider_names(watch_providers)
+        store_movie_subscription_provider_names(
+            movie_id,
+            now + TMDB_WATCH_PROVIDERS_CACHE_TTL_SECONDS,
+            provider_names_by_movie_id[movie_id],
+        )
+
+    enqueue_provider_refresh(unknown_movie_ids)
+    return provider_names_by_movie_id
+
+
+def enqueue_provider_refresh(movie_ids: Iterable[int]) -> None:
+    if not PROVIDER_REFRESH_ENABLED:
+        return
+    with tmdb_cache_lock:
+        for movie_id in movie_ids:
+            provider_refresh_queue[int(movie_id)] = None
+
+
+def take_provider_refresh_batch(limit: int) -> list[int]:
+    with tmdb_cache_lock:
+        return [provider_refresh_queue.popitem(last=False)[0] for _ in range(min(limit, len(provider_refresh_queue)))]
+
+
+def collect_provider_refresh_candidates() -> list[int]:
+    # Movies sitting in playlists with old provider data, then movies shown in recent feeds.
+    now = utcnow_naive()
+    stale_before = (now - datetime.timedelta(seconds=PROVIDER_REFRESH_MAX_AGE_SECONDS)).isoformat(sep=" ")
+    shown_after = (now - datetime.timedelta(seconds=PROVIDER_REFRESH_FEED_WINDOW_SECONDS)).isoformat(sep=" ")
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
         cursor.execute(
             f"""
-            SELECT
-                movie_id AS id,
-                title,
-                poster_url,
-                rating,
-                COALESCE(added_at, '1970-01-01 00:00:00') AS added_at,
-                COALESCE(sort_index, 2147483647) AS sort_index,
-                COALESCE(primary_genre, '') AS primary_genre,
-                COALESCE(subscription_provider_names, '[]') AS subscription_provider_names
+            SELECT movie_id
             FROM playlist_items
-            WHERE playlist_id = {SQL_PARAM}
-            ORDER BY COALESCE(sort_index, 2147483647) ASC, COALESCE(added_at, '1970-01-01 00:00:00') DESC, movie_id DESC
+            WHERE metadata_updated_at IS NULL OR metadata_updated_at < {SQL_PARAM}
+            GROUP BY movie_id
+            ORDER BY MIN(COALESCE(metadata_updated_at, '1970-01-01 00:00:00')) ASC
+            LIMIT {SQL_PARAM}
             """,
-            (target_id,),
+            (stale_before, PROVIDER_REFRESH_SWEEP_LIMIT),
         )
-        return [dict(row) for row in cursor.fetchall()], True, target_id
-
-    if playlist_id == FAVORITES_SYSTEM_ID:
+        movie_ids = [int(row[0]) for row in cursor.fetchall()]
         cursor.execute(
             f"""
-            SELECT
-                movie_id AS id,
-                title,
-                poster_url,
-                rating,
-                COALESCE(added_at, '1970-01-01 00:00:00') AS added_at,
-                2147483647 AS sort_index
-            FROM user_ratings
-            WHERE user_id = {SQL_PARAM} AND rating >= 4
-            ORDER BY COALESCE(added_at, '1970-01-01 00:00:00') DESC, movie_id DESC
+            SELECT movie_id
+            FROM recommendation_impressions
+            WHERE shown_at >= {SQL_PARAM}
+            GROUP BY movie_id
+            ORDER BY MAX(shown_at) DESC
+            LIMIT {SQL_PARAM}
             """,
-            (user_id,),
+            (shown_after, PROVIDER_REFRESH_SWEEP_LIMIT),
         )
-        return [dict(row) for row in cursor.fetchall()], False, None
+        movie_ids.extend(int(row[0]) for row in cursor.fetchall())
+    finally:
+        conn.close()
+    return list(dict.fromkeys(movie_ids))
 
-    if playlist_id == HISTORY_SYSTEM_ID:
-        cursor.execute(
-            f"""
-            SELECT
-                movie_id AS id,
-                title,
-                poster_url,
-                rating,
-                COALESCE(added_at, '1970-01-01 00:00:00') AS added_at,
-                2147483647 AS sort_index
-            FROM user_ratings
-            WHERE user_id = {SQL_PARAM}
-            ORDER BY COALESCE(added_at, '1970-01-01 00:00:00') DESC, movie_id DESC
+
+def refresh_movie_provider_data(movie_id: int) -> None:
+    watch_providers = get_tmdb_watch_providers(int(movie_id), refresh_links=True)
+    provider_names = extract_subscription_provider_names(watch_providers)
+    store_movie_subscription_provider_names(movie_id, time.time() + TMDB_WATCH_PROVIDERS_CACHE_TTL_SECONDS, provider_names)
+
+    # Cached movie details embed the providers; keep their links in step.
+    details_key = f"tmdb-details:{int(movie_id)}"
+    details_entry = read_upstream_cache_entry(tmdb_movie_details_cache, details_key)
+    if details_entry is not None and details_entry[0] > time.time():
+        details = details_entry[1]
+        write_upstream_cache_entry(
+            tmdb_movie_details_cache,
+            details_key,
+            {
+                **details,
+                "watch_providers": apply_provider_search_fallbacks(
+                    watch_providers,
+                    str(details.get("title") or ""),
+                    str(watch_providers.get("region") or ""),
+                ),
+            },
+            max(1, int(details_entry[0] - time.time())),
+        )
+
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            UPDATE playlist_items
+            SET subscription_provider_names = {SQL_PARAM},
+                metadata_updated_at = CURRENT_TIMESTAMP
+            WHERE movie_id = {SQL_PARAM}
             """,
-            (user_id,),
+            (dump_json_list(provider_names), int(movie_id)),
         )
-        return [dict(row) for row in cursor.fetchall()], False, None
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def run_provider_refresh_batch() -> int:
+    movie_ids = take_provider_refresh_batch(PROVIDER_REFRESH_BATCH_SIZE)
+    if not movie_ids:
+        enqueue_provider_refresh(collect_provider_refresh_candidates())
+        movie_ids = take_provider_refresh_batch(PROVIDER_REFRESH_BATCH_SIZE)
+
+    for movie_id in movie_ids:
+        try:
+            refresh_movie_provider_data(movie_id)
+        except Exception:
+            logger.exception("Rafraichissement des plateformes impossible pour movie_id=%s.", movie_id)
+    return len(movie_ids)
+
+
+def resolve_playlist_browse_source(cursor, playlist_id: int, user_id: int) -> dict[str, Any]:
+    if playlist_id == WATCH_LATER_SYSTEM_ID:
+        target_id = get_or_create_watch_later_id(cursor, user_id)
+        return {"table": "playlist_items", "where": f"playlist_id = {SQL_PARAM}", "params": [target_id], "playlist_db_id": target_id}
+    if playlist_id == FAVORITES_SYSTEM_ID:
+        return {"table": "user_ratings", "where": f"user_id = {SQL_PARAM} AND rating >= 4", "params": [user_id], "playlist_db_id": None}
+    if playlist_id == HISTORY_SYSTEM_ID:
+        return {"table": "user_ratings", "where": f"user_id = {SQL_PARAM}", "params": [user_id], "playlist_db_id": None}
 
     target_id = get_custom_playlist_id(cursor, playlist_id, user_id)
+    return {"table": "playlist_items", "where": f"playlist_id = {SQL_PARAM}", "params": [target_id], "playlist_db_id": target_id}
+
+
+def encode_playlist_cursor(sort_mode: str, values: list[Any]) -> str:
+    raw_cursor = json.dumps({"sort": sort_mode, "values": values}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw_cursor.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_playlist_cursor(raw_cursor: str, sort_mode: str) -> list[Any]:
+    try:
+        padded_cursor = raw_cursor + "=" * (-len(raw_cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded_cursor.encode("ascii")).decode("utf-8"))
+        values = payload["values"]
+        if payload["sort"] != sort_mode or len(values) != len(PLAYLIST_SORT_KEYS[sort_mode]):
+            raise ValueError
+    except Exception:
+        raise HTTPException(status_code=400, detail="Curseur de pagination invalide.")
+    return values
+
+
+def build_playlist_keyset_clause(sort_keys: tuple[tuple[str, str], ...], values: list[Any]) -> tuple[str, list[Any]]:
+    # The leading bound lets the index seek to the page start; the OR chain settles ties.
+    leading_expression, leading_direction = sort_keys[0]
+    clauses: list[str] = []
+    params: list[Any] = [values[0]]
+    for index, (expression, direction) in enumerate(sort_keys):
+        parts = [f"{previous_expression} = {SQL_PARAM}" for previous_expression, _ in sort_keys[:index]]
+        parts.append(f"{expression} {'>' if direction == 'ASC' else '<'} {SQL_PARAM}")
+        clauses.append(f"({' AND '.join(parts)})")
+        params.extend(values[: index + 1])
+    leading_operator = ">=" if leading_direction == "ASC" else "<="
+    return f"{leading_expression} {leading_operator} {SQL_PARAM} AND ({' OR '.join(clauses)})", params
+
+
+def escape_sql_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def backfill_playlist_browse_metadata(cursor, source: dict[str, Any], user_id: int, *, include_watch_providers: bool) -> None:
+    # Rows written before genres/providers were stored get them once, so SQL can sort and filter on them.
+    missing_conditions = ["primary_genre IS NULL", "primary_genre = ''"]
+    provider_names_sql = "'[]'"
+    if source["table"] == "playlist_items":
+        provider_names_sql = "COALESCE(subscription_provider_names, '[]')"
+        if include_watch_providers:
+            missing_conditions.append(f"(metadata_updated_at IS NULL AND {provider_names_sql} = '[]')")
     cursor.execute(
         f"""
-        SELECT
-            movie_id AS id,
-            title,
-            poster_url,
-            rating,
-            COALESCE(added_at, '1970-01-01 00:00:00') AS added_at,
-            COALESCE(sort_index, 2147483647) AS sort_index,
-            COALESCE(primary_genre, '') AS primary_genre,
-            COALESCE(subscription_provider_names, '[]') AS subscription_provider_names
-        FROM playlist_items
-        WHERE playlist_id = {SQL_PARAM}
-        ORDER BY COALESCE(sort_index, 2147483647) ASC, COALESCE(added_at, '1970-01-01 00:00:00') DESC, movie_id DESC
+        SELECT movie_id AS id, COALESCE(primary_genre, '') AS primary_genre, {provider_names_sql} AS subscription_provider_names
+        FROM {source["table"]}
+        WHERE {source["where"]} AND ({" OR ".join(missing_conditions)})
         """,
-        (target_id,),
+        tuple(source["params"]),
+    )
+    rows = [dict(row) for row in cursor.fetchall()]
+    if not rows:
+        return
+
+    if source["table"] == "playlist_items":
+        hydrate_playlist_rows_metadata(
+            cursor,
+            source["playlist_db_id"],
+            rows,
+            include_watch_providers=include_watch_providers,
+        )
+        return
+
+    cursor.executemany(
+        f"UPDATE user_ratings SET primary_genre = {SQL_PARAM} WHERE user_id = {SQL_PARAM} AND movie_id = {SQL_PARAM}",
+        [(get_movie_primary_genre(int(row["id"])), int(user_id), int(row["id"])) for row in rows],
     )
-    return [dict(row) for row in cursor.fetchall()], False, target_id
 
 
-def hydrate_playlist_row_metadata(
+def hydrate_playlist_rows_metadata(
     cursor,
     playlist_db_id: Optional[int],
-    row: dict,
+    rows: list[dict],
     *,
     include_watch_providers: bool,
-) -> dict:
-    movie_id = int(row.get("id") or 0)
-    next_primary_genre = decode_db_text(row.get("primary_genre")) or get_movie_primary_genre(movie_id)
-    raw_provider_names = row.get("subscription_provider_names")
-    if isinstance(raw_provider_names, list):
-        parsed_provider_names = raw_provider_names
-    else:
-        parsed_provider_names = load_json_list(raw_provider_names)
-    next_provider_names = dedupe_list(
-        [
-            normalized
-            for normalized in (
-                normalize_streaming_service_label(str(value))
-                for value in parsed_provider_names
+) -> list[dict]:
+    missing_provider_movie_ids: list[int] = []
+    stored_metadata: dict[int, tuple[str, list[str]]] = {}
+    for row in rows:
+        movie_id = int(row.get("id") or 0)
+        raw_provider_names = row.get("subscription_provider_names")
+        parsed_provider_names = (
+            raw_provider_names if isinstance(raw_provider_names, list) else load_json_list(raw_provider_names)
+        )
+        provider_names = dedupe_list(
+            [
+                normalized
+                for normalized in (normalize_streaming_service_label(str(value)) for value in parsed_provider_names)
+                if normalized
+            ]
+        )
+        stored_metadata[movie_id] = (decode_db_text(row.get("primary_genre")), provider_names)
+        row["primary_genre"] = stored_metadata[movie_id][0] or get_movie_primary_genre(movie_id) or "Autres"
+        row["subscription_provider_names"] = provider_names
+        if include_watch_providers and not provider_names:
+            missing_provider_movie_ids.append(movie_id)
+
+    fetched_provider_names = (
+        get_movie_subscription_provider_names_batch(missing_provider_movie_ids)
+        if missing_provider_movie_ids
+        else {}
+    )
+
+    # metadata_updated_at marks resolved providers: a genre-only update must not stamp it,
+    # or the owned-services backfill would never pick the row up again.
+    provider_updates: list[tuple[str, str, int, int]] = []
+    genre_updates: list[tuple[str, int, int]] = []
+    for row in rows:
+        movie_id = int(row.get("id") or 0)
+        stored_genre, _ = stored_metadata[movie_id]
+        provider_names = fetched_provider_names.get(movie_id)
+        if provider_names is not None:
+            row["subscription_provider_names"] = provider_names
+        if playlist_db_id is None:
+            continue
+        if provider_names is not None:
+            provider_updates.append(
+                (row["primary_genre"], dump_json_list(provider_names), int(playlist_db_id), movie_id)
             )
-            if normalized
-        ]
-    )
-
-    should_persist = False
-    if decode_db_text(row.get("primary_genre")) != next_primary_genre:
-        should_persist = True
-
-    if include_watch_providers and not next_provider_names:
-        next_provider_names = build_movie_subscription_provider_names(movie_id)
-        should_persist = True
+        elif stored_genre != row["primary_genre"]:
+            genre_updates.append((row["primary_genre"], int(playlist_db_id), movie_id))
 
-    row["primary_genre"] = next_primary_genre or "Autres"
-    row["subscription_provider_names"] = next_provider_names
-
-    if playlist_db_id is not None and should_persist:
-        cursor.execute(
+    if provider_updates:
+        cursor.executemany(
             f"""
             UPDATE playlist_items
             SET primary_genre = {SQL_PARAM},
@@ -3603,60 +4921,14 @@ def hydrate_playlist_row_metadata(
                 metadata_updated_at = CURRENT_TIMESTAMP
             WHERE playlist_id = {SQL_PARAM} AND movie_id = {SQL_PARAM}
             """,
-            (
-                row["primary_genre"],
-                dump_json_list(next_provider_names),
-                int(playlist_db_id),
-                movie_id,
-            ),
-        )
-
-    return row
-
-
-def sort_playlist_rows(rows: list[dict], sort_mode: str) -> list[dict]:
-    ordered_rows = list(rows)
-    if sort_mode == "manual":
-        ordered_rows.sort(
-            key=lambda row: (
-                str(row.get("added_at") or ""),
-                int(row.get("id") or 0),
-            ),
-            reverse=True,
+            provider_updates,
         )
-        ordered_rows.sort(key=lambda row: int(row.get("sort_index") or 2147483647))
-    elif sort_mode == "genre":
-        ordered_rows.sort(
-            key=lambda row: (
-                str(row.get("primary_genre") or "Autres").lower(),
-                str(row.get("title") or "").lower(),
-                int(row.get("id") or 0),
-            )
-        )
-    elif sort_mode == "oldest":
-        ordered_rows.sort(
-            key=lambda row: (
-                str(row.get("added_at") or ""),
-                int(row.get("id") or 0),
-            )
-        )
-    elif sort_mode == "rating":
-        ordered_rows.sort(
-            key=lambda row: (
-                -float(row.get("rating") or 0.0),
-                str(row.get("title") or "").lower(),
-                int(row.get("id") or 0),
-            )
-        )
-    else:
-        ordered_rows.sort(
-            key=lambda row: (
-                str(row.get("added_at") or ""),
-                int(row.get("id") or 0),
-            ),
-            reverse=True,
+    if genre_updates:
+        cursor.executemany(
+            f"UPDATE playlist_items SET primary_genre = {SQL_PARAM} WHERE playlist_id = {SQL_PARAM} AND movie_id = {SQL_PARAM}",
+            genre_updates,
         )
-    return ordered_rows
+    return rows
 
 
 def browse_playlist_rows(
@@ -3669,69 +4941,78 @@ def browse_playlist_rows(
     sort_mode: str,
     query: str,
     only_owned_streaming_services: bool,
+    page_cursor: str = "",
 ) -> dict:
-    base_rows, is_watch_later, playlist_db_id = fetch_playlist_base_rows(cursor, playlist_id, user_id)
-    playlist_total_count = len(base_rows)
-    trimmed_query = query.strip().lower()
+    source = resolve_playlist_browse_source(cursor, playlist_id, user_id)
+    owned_services = (
+        set(get_user_owned_streaming_services(cursor, user_id))
+        if playlist_id == WATCH_LATER_SYSTEM_ID and only_owned_streaming_services
+        else set()
+    )
+    backfill_playlist_browse_metadata(cursor, source, user_id, include_watch_providers=bool(owned_services))
 
-    hydrated_rows = [
-        hydrate_playlist_row_metadata(
-            cursor,
-            playlist_db_id,
-            row,
-            include_watch_providers=False,
-        )
-        for row in base_rows
-    ]
+    cursor.execute(f"SELECT COUNT(*) FROM {source['table']} WHERE {source['where']}", tuple(source["params"]))
+    playlist_total_count = int(cursor.fetchone()[0] or 0)
 
+    conditions = [source["where"]]
+    params: list[Any] = list(source["params"])
+    trimmed_query = query.strip().lower()
     if trimmed_query:
-        hydrated_rows = [
-            row for row in hydrated_rows if trimmed_query in str(row.get("title") or "").lower()
-        ]
+        conditions.append(f"{PLAYLIST_TITLE_SQL} LIKE {SQL_PARAM} ESCAPE '\\'")
+        params.append(f"%{escape_sql_like(trimmed_query)}%")
+    if owned_services:
+        conditions.append(
+            "(" + " OR ".join(f"subscription_provider_names LIKE {SQL_PARAM} ESCAPE '\\'" for _ in owned_services) + ")"
+        )
+        params.extend(
+            f"%{escape_sql_like(json.dumps(service_name, ensure_ascii=False))}%" for service_name in sorted(owned_services)
+        )
 
-    ordered_rows = sort_playlist_rows(hydrated_rows, sort_mode)
-
-    if is_watch_later and only_owned_streaming_services:
-        owned_services = set(get_user_owned_streaming_services(cursor, user_id))
-        if owned_services:
-            page_rows: list[dict] = []
-            matched_count = 0
-            for row in ordered_rows:
-                hydrated_row = hydrate_playlist_row_metadata(
-                    cursor,
-                    playlist_db_id,
-                    row,
-                    include_watch_providers=True,
-                )
-                if not owned_services.intersection(hydrated_row.get("subscription_provider_names") or []):
-                    continue
-                if matched_count < offset:
-                    matched_count += 1
-                    continue
-                if len(page_rows) < limit:
-                    page_rows.append(hydrated_row)
-                    matched_count += 1
-                    continue
-                return {
-                    "items": page_rows,
-                    "playlist_total_count": playlist_total_count,
-                    "next_offset": offset + len(page_rows),
-                    "has_more": True,
-                }
+    sort_keys = PLAYLIST_SORT_KEYS.get(sort_mode, PLAYLIST_SORT_KEYS["recent"])
+    if page_cursor:
+        keyset_clause, keyset_params = build_playlist_keyset_clause(sort_keys, decode_playlist_cursor(page_cursor, sort_mode))
+        conditions.append(keyset_clause)
+        params.extend(keyset_params)
+        page_offset = 0
+    else:
+        page_offset = offset
 
-            return {
-                "items": page_rows,
-                "playlist_total_count": playlist_total_count,
-                "next_offset": offset + len(page_rows),
-                "has_more": False,
-            }
+    playlist_columns = (
+        "COALESCE(sort_index, 2147483647) AS sort_index, COALESCE(subscription_provider_names, '[]') AS subscription_provider_names"
+        if source["table"] == "playlist_items"
+        else "2147483647 AS sort_index, '[]' AS subscription_provider_names"
+    )
+    sort_key_columns = ", ".join(f"{expression} AS sort_key_{index}" for index, (expression, _) in enumerate(sort_keys))
+    cursor.execute(
+        f"""
+        SELECT
+            movie_id AS id,
+            title,
+            poster_url,
+            rating,
+            {PLAYLIST_ADDED_AT_SQL} AS added_at,
+            COALESCE(primary_genre, '') AS primary_genre,
+            {playlist_columns},
+            {sort_key_columns}
+        FROM {source["table"]}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {", ".join(f"{expression} {direction}" for expression, direction in sort_keys)}
+        LIMIT {SQL_PARAM} OFFSET {SQL_PARAM}
+        """,
+        tuple(params + [limit + 1, page_offset]),
+    )
+    rows = [dict(row) for row in cursor.fetchall()]
+    has_more = len(rows) > limit
+    page_rows = rows[:limit]
+    sort_key_values = [[row.pop(f"sort_key_{index}") for index in range(len(sort_keys))] for row in rows]
+    hydrate_playlist_rows_metadata(cursor, None, page_rows, include_watch_providers=False)
 
-    page_rows = ordered_rows[offset : offset + limit]
     return {
         "items": page_rows,
         "playlist_total_count": playlist_total_count,
         "next_offset": offset + len(page_rows),
-        "has_more": offset + len(page_rows) < len(ordered_rows),
+        "next_cursor": encode_playlist_cursor(sort_mode, sort_key_values[len(page_rows) - 1]) if has_more else None,
+        "has_more": has_more,
     }
 
 
@@ -3814,10 +5095,9 @@ def get_test_ai_feedback_profile(cursor, user_id: int) -> dict[str, object]:
             negative_count += 1
 
         decay = max(0.42, 1.0 - (index * 0.006))
-        movie_row = movies_df.iloc[movie_index]
-        for token in movie_row.get("genre_tokens") or []:
+        for token in get_movie_genre_tokens(movie_index):
             genre_biases[token] += feedback_value * decay * 0.42
-        for token in (movie_row.get("keyword_tokens") or [])[:14]:
+        for token in get_movie_keyword_tokens(movie_index, 14):
             keyword_biases[token] += feedback_value * decay * 0.34
 
     return {
@@ -3969,31 +5249,94 @@ def record_recommendation_impression(
             seed_similarity=seed_similarity,
         )
         conn.commit()
+        record_taste_state_impression(user_id, movie_id, mode)
         return True
     finally:
         conn.close()
 
 
-@lru_cache(maxsize=256)
-def get_tmdb_related_movie_ids(movie_id: int) -> tuple[int, ...]:
-    related_ids: list[int] = []
-    endpoints = (
-        f"https://api.themoviedb.org/3/movie/{movie_id}/recommendations?api_key={TMDB_API_KEY}&language=fr-FR&page=1",
-        f"https://api.themoviedb.org/3/movie/{movie_id}/similar?api_key={TMDB_API_KEY}&language=fr-FR&page=1",
-    )
+def submit_tmdb_related_movie_ids(movie_id: int) -> list[Future]:
+    return [
+        submit_upstream_json(
+            f"https://api.themoviedb.org/3/movie/{movie_id}/{endpoint}?api_key={TMDB_API_KEY}&language=fr-FR&page=1",
+            timeout=2,
+        )
+        for endpoint in ("recommendations", "similar")
+    ]
 
-    for url in endpoints:
-        try:
-            results = requests.get(url, timeout=2).json().get("results", [])[:10]
-        except Exception:
-            results = []
 
+def resolve_tmdb_related_movie_ids(endpoint_calls: list[Future]) -> Optional[dict[str, Any]]:
+    endpoint_payloads = [wait_upstream_json(endpoint_call, 2) for endpoint_call in endpoint_calls]
+    if not any(isinstance(data, dict) for data in endpoint_payloads):
+        return None
+
+    related_ids: list[int] = []
+    for data in endpoint_payloads:
+        results = data.get("results", [])[:10] if isinstance(data, dict) else []
         for movie in results:
-            movie_id_value = movie.get("id")
+            movie_id_value = movie.get("id") if isinstance(movie, dict) else None
             if isinstance(movie_id_value, int):
                 related_ids.append(movie_id_value)
+    return {"ids": related_ids}
+
+
+def get_precomputed_related_movie_ids(movie_id: int) -> Optional[tuple[int, ...]]:
+    movie_index = movie_index_by_id.get(int(movie_id))
+    if related_movie_indptr is None or movie_index is None:
+        return None
+
+    start, stop = int(related_movie_indptr[movie_index]), int(related_movie_indptr[movie_index + 1])
+    # An empty row usually means the offline fetch failed; let the live path retry it.
+    return tuple(int(related_id) for related_id in related_movie_ids[start:stop]) if stop > start else None
+
+
+@timed_stage("tmdb.related")
+def get_tmdb_related_movie_ids_batch(movie_ids: list[int]) -> dict[int, tuple[int, ...]]:
+    related_ids_by_movie_id: dict[int, tuple[int, ...]] = {}
+    fallback_entries: dict[int, Optional[tuple[float, dict[str, Any]]]] = {}
+    for movie_id in dict.fromkeys(int(movie_id) for movie_id in movie_ids):
+        precomputed_ids = get_precomputed_related_movie_ids(movie_id)
+        if precomputed_ids is not None:
+            related_ids_by_movie_id[movie_id] = precomputed_ids
+            continue
+
+        payload, fallback_entries[movie_id] = read_servable_upstream_payload(
+            tmdb_related_movie_ids_cache,
+            f"tmdb-related:{movie_id}",
+            TMDB_RELATED_MOVIE_IDS_CACHE_TTL_SECONDS,
+            lambda movie_id=movie_id: resolve_tmdb_related_movie_ids(submit_tmdb_related_movie_ids(movie_id)),
+        )
+        if payload is not None:
+            related_ids_by_movie_id[movie_id] = tuple(payload.get("ids") or ())
+            del fallback_entries[movie_id]
+
+    # Every seed missing from the caches is fetched at once on the upstream loop.
+    upstream_calls = {movie_id: submit_tmdb_related_movie_ids(movie_id) for movie_id in fallback_entries}
+    for movie_id, endpoint_calls in upstream_calls.items():
+        payload = resolve_tmdb_related_movie_ids(endpoint_calls)
+        if payload is not None:
+            write_upstream_cache_entry(
+                tmdb_related_movie_ids_cache,
+                f"tmdb-related:{movie_id}",
+                payload,
+                TMDB_RELATED_MOVIE_IDS_CACHE_TTL_SECONDS,
+            )
+        elif fallback_entries[movie_id] is not None:
+            payload = fallback_entries[movie_id][1]
+        else:
+            # Short negative entry: an unreachable TMDB is not retried on every feed.
+            payload = write_upstream_cache_entry(
+                tmdb_related_movie_ids_cache,
+                f"tmdb-related:{movie_id}",
+                {"ids": []},
+                TMDB_RELATED_MOVIE_IDS_FAILURE_TTL_SECONDS,
+            )
+        related_ids_by_movie_id[movie_id] = tuple((payload or {}).get("ids") or ())
+    return related_ids_by_movie_id
 
-    return tuple(related_ids)
+
+def get_tmdb_related_movie_ids(movie_id: int) -> tuple[int, ...]:
+    return get_tmdb_related_movie_ids_batch([int(movie_id)])[int(movie_id)]
 
 
 @lru_cache(maxsize=256)
@@ -4007,7 +5350,7 @@ def get_tmdb_related_movies(movie_id: int) -> tuple[dict, ...]:
     seen_ids: set[int] = set()
     for url in endpoints:
         try:
-            results = requests.get(url, timeout=2).json().get("results", [])[:12]
+            results = upstream_get(url, timeout=2).json().get("results", [])[:12]
         except Exception:
             results = []
 
@@ -4030,7 +5373,7 @@ def get_tmdb_person_seed_movie_ids(person_name: str) -> tuple[int, ...]:
         return ()
 
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://api.themoviedb.org/3/search/person",
             params={
                 "api_key": TMDB_API_KEY,
@@ -4076,11 +5419,95 @@ def get_rating_signal_weight(rating: float) -> float:
     }.get(rounded_rating, 0.0)
 
 
-def squash_affinity(value: float) -> float:
-    return float(0.5 + (0.5 * np.tanh(value)))
+def squash_affinity(values: np.ndarray) -> np.ndarray:
+    return 0.5 + (0.5 * np.tanh(values))
 
 
-def build_collaborative_candidate_scores(cursor, current_user_id: int, blocked_ids: set[int]) -> dict[int, float]:
+def build_token_weight_vector(token_index: dict[str, int], token_weights: dict[str, float]) -> np.ndarray:
+    weight_vector = np.zeros(len(token_index))
+    for token, weight in token_weights.items():
+        token_id = token_index.get(str(token))
+        if token_id is not None:
+            weight_vector[token_id] = float(weight)
+    return weight_vector
+
+
+def compute_token_affinity_scores(
+    token_matrix: sparse.csr_matrix,
+    token_counts: np.ndarray,
+    token_index: dict[str, int],
+    affinity_map: dict[str, float],
+) -> np.ndarray:
+    if not affinity_map:
+        return np.zeros(token_matrix.shape[0])
+
+    mean_affinity = (token_matrix @ build_token_weight_vector(token_index, affinity_map)) / np.maximum(token_counts, 1)
+    return np.where(token_counts > 0, squash_affinity(mean_affinity), 0.0)
+
+
+def compute_token_overlap_scores(presence_matrix: sparse.csr_matrix, token_ids, token_count: int) -> np.ndarray:
+    if token_count <= 0:
+        return np.zeros(presence_matrix.shape[0])
+
+    token_weights = np.zeros(presence_matrix.shape[1])
+    token_weights[np.asarray(token_ids, dtype=np.int64)] = 1.0
+    return (presence_matrix @ token_weights) / token_count
+
+
+def get_movie_genre_tokens(movie_index: int) -> list[str]:
+    start, stop = int(genre_token_indptr[movie_index]), int(genre_token_indptr[movie_index + 1])
+    return [genre_vocabulary[int(token_id)] for token_id in genre_token_ids[start:stop]]
+
+
+def get_movie_keyword_tokens(movie_index: int, limit: int) -> list[str]:
+    start = int(keyword_token_indptr[movie_index])
+    stop = min(int(keyword_token_indptr[movie_index + 1]), start + max(0, limit))
+    return [keyword_vocabulary[int(token_id)] for token_id in keyword_token_ids[start:stop]]
+
+
+def compute_genre_overlap_scores(genre_tokens: set[str]) -> np.ndarray:
+    genre_ids = [genre_token_index[token] for token in genre_tokens if token in genre_token_index]
+    return compute_token_overlap_scores(genre_token_presence_matrix, genre_ids, len(genre_tokens))
+
+
+def get_cold_start_pool_positions(genre_tokens: set[str]) -> np.ndarray:
+    pool_count = len(cold_start_pool_indptr) - 1
+    if pool_count <= 0:
+        return np.array([], dtype=np.int64)
+
+    # The last pool ranks the whole catalog and backs every genre selection.
+    pool_ids = [genre_token_index[token] for token in genre_tokens if token in genre_token_index]
+    pool_ids.append(pool_count - 1)
+    return np.unique(
+        np.concatenate(
+            [
+                np.asarray(cold_start_pool_positions[cold_start_pool_indptr[pool_id]:cold_start_pool_indptr[pool_id + 1]])
+                for pool_id in pool_ids
+            ]
+        ).astype(np.int64, copy=False)
+    )
+
+
+@timed_stage("similarity.cosine")
+def build_signal_similarity_matrix(signal_indices: list[int]) -> np.ndarray:
+    if movie_neighbor_indices is None or movie_neighbor_scores is None:
+        return (vectors @ vectors[signal_indices].T).toarray().astype(float)
+
+    signal_index_array = np.asarray(signal_indices, dtype=np.int64)
+    neighbor_rows = np.asarray(movie_neighbor_indices[signal_index_array], dtype=np.int64)
+    neighbor_values = np.asarray(movie_neighbor_scores[signal_index_array], dtype=float)
+    signal_columns = np.broadcast_to(
+        np.arange(len(signal_index_array))[:, None],
+        neighbor_rows.shape,
+    )
+    valid_neighbors = neighbor_rows >= 0
+    similarity_matrix = np.zeros((len(movie_ids_array), len(signal_index_array)))
+    # Outside its top-K list a signal contributes 0, as a near-orthogonal movie would.
+    similarity_matrix[neighbor_rows[valid_neighbors], signal_columns[valid_neighbors]] = neighbor_values[valid_neighbors]
+    return similarity_matrix
+
+
+def compute_collaborative_neighbors_from_db(cursor, current_user_id: int) -> list[tuple[int, int, float]]:
     cursor.execute(
         """
         WITH base AS (
@@ -4112,81 +5539,319 @@ def build_collaborative_candidate_scores(cursor, current_user_id: int, blocked_i
         """.format(param=SQL_PARAM),
         (current_user_id, current_user_id),
     )
-    neighbors = cursor.fetchall()
-    collaborative_scores: dict[int, float] = {}
-
-    for neighbor_id, overlap_count, similarity_score in neighbors:
-        if not overlap_count or not similarity_score:
-            continue
+    return [
+        (int(neighbor_id), int(overlap_count or 0), float(similarity_score or 0.0))
+        for neighbor_id, overlap_count, similarity_score in cursor.fetchall()
+    ]
 
-        affinity_weight = min(1.9, max(0.25, float(similarity_score) / max(int(overlap_count), 1)))
-        cursor.execute(
-            """
-            SELECT movie_id, rating
-            FROM user_ratings
-            WHERE user_id = {param} AND rating >= 4
-            ORDER BY added_at DESC
-            LIMIT 24
-            """.format(param=SQL_PARAM),
-            (neighbor_id,),
-        )
-        for rank, (movie_id, rating) in enumerate(cursor.fetchall()):
-            movie_id = int(movie_id)
-            if movie_id in blocked_ids:
-                continue
-            freshness_weight = max(0.35, 1.0 - (rank * 0.05))
-            rating_weight = 1.0 + ((int(rating) - 4) * 0.22)
-            collaborative_scores[movie_id] = collaborative_scores.get(movie_id, 0.0) + (
-                affinity_weight * freshness_weight * rating_weight
-            )
 
-    return collaborative_scores
+def refresh_collaborative_rating_matrix() -> None:
+    global collaborative_rating_matrix
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT user_id, movie_id, rating FROM user_ratings")
+        rating_rows = cursor.fetchall()
+    finally:
+        conn.close()
 
+    user_ids = np.array([int(row[0]) for row in rating_rows], dtype=np.int64)
+    movie_ids = np.array([int(row[1]) for row in rating_rows], dtype=np.int64)
+    ratings = np.array([float(row[2]) for row in rating_rows], dtype=float)
+    matrix_user_ids, user_positions = np.unique(user_ids, return_inverse=True)
+    matrix_movie_ids, movie_positions = np.unique(movie_ids, return_inverse=True)
+    rating_matrix = sparse.csc_matrix(
+        (ratings, (user_positions, movie_positions)),
+        shape=(len(matrix_user_ids), len(matrix_movie_ids)),
+    )
+    with collaborative_cache_lock:
+        collaborative_rating_matrix = {
+            "matrix": rating_matrix,
+            "user_ids": matrix_user_ids,
+            "movie_columns": {int(movie_id): index for index, movie_id in enumerate(matrix_movie_ids.tolist())},
+        }
+    logger.info(
+        "Matrice collaborative reconstruite: %s utilisateur(s), %s film(s), %s note(s).",
+        len(matrix_user_ids),
+        len(matrix_movie_ids),
+        len(ratings),
+    )
 
-def pick_diverse_movie_ids(ranked_ids: list[int], limit: int, per_genre_cap: int) -> list[int]:
-    if limit <= 0:
-        return []
 
-    selected_ids: list[int] = []
-    deferred_ids: list[int] = []
-    genre_counts: dict[str, int] = {}
+async def collaborative_matrix_refresher():
+    while True:
+        try:
+            await asyncio.to_thread(refresh_collaborative_rating_matrix)
+        except Exception:
+            logger.exception("Reconstruction de la matrice collaborative impossible.")
+        await asyncio.sleep(COLLABORATIVE_MATRIX_REFRESH_SECONDS)
 
-    for movie_id in ranked_ids:
-        genre_name = get_movie_primary_genre(movie_id)
-        current_count = genre_counts.get(genre_name, 0)
-        if current_count < per_genre_cap or len(selected_ids) < max(2, limit // 2):
-            selected_ids.append(movie_id)
-            genre_counts[genre_name] = current_count + 1
-        else:
-            deferred_ids.append(movie_id)
-        if len(selected_ids) >= limit:
-            return selected_ids[:limit]
 
-    for movie_id in deferred_ids:
-        if len(selected_ids) >= limit:
-            break
-        selected_ids.append(movie_id)
+def refresh_local_movie_index_batch(offset: int) -> int:
+    # TMDB serves fr-FR posters that can differ from the catalog ones; the index
+    # converges to them a small batch at a time.
+    movie_ids = list(local_movie_index)[offset:offset + LOCAL_MOVIE_INDEX_REFRESH_BATCH_SIZE]
+    if not movie_ids:
+        return 0
 
-    return selected_ids[:limit]
+    payloads = fetch_upstream_json_batch(
+        [f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR" for movie_id in movie_ids],
+        timeout=3,
+    )
+    for movie_id, data in zip(movie_ids, payloads):
+        poster_path = data.get("poster_path") if isinstance(data, dict) else None
+        if poster_path:
+            local_movie_index[movie_id] = build_tmdb_poster_url(data)
+    return offset + len(movie_ids)
 
 
-def build_recommendation_reason(
-    *,
-    movie_id: int,
-    positive_indices: list[int],
-    positive_signal_weights: dict[int, float],
-    positive_similarity_scores: np.ndarray,
-    onboarding_genre_tokens: set[str],
-    genre_profile: set[str],
-    mode: str,
-    seed_context: Optional[dict[str, object]] = None,
-    is_test_experiment: bool = False,
-) -> str:
-    movie_index = movie_index_by_id.get(int(movie_id))
-    if movie_index is None:
-        return "Choisi pour coller à tes goûts du moment"
+async def provider_refresh_worker():
+    upstream_cache_purged_at = 0.0
+    while True:
+        await asyncio.sleep(PROVIDER_REFRESH_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(run_provider_refresh_batch)
+        except Exception:
+            logger.exception("File de rafraichissement des plateformes en echec.")
 
-    row = movies_df.iloc[movie_index]
+        if UPSTREAM_CACHE_PURGE_INTERVAL_SECONDS <= 0:
+            continue
+        if time.monotonic() - upstream_cache_purged_at < UPSTREAM_CACHE_PURGE_INTERVAL_SECONDS:
+            continue
+        upstream_cache_purged_at = time.monotonic()
+        try:
+            deleted_count = await asyncio.to_thread(purge_expired_upstream_cache_entries)
+            if deleted_count:
+                logger.info("Cache amont SQL : %s entree(s) expiree(s) purgee(s).", deleted_count)
+        except Exception:
+            logger.exception("Purge du cache amont SQL impossible.")
+
+
+async def local_movie_index_refresher():
+    offset = 0
+    while True:
+        await asyncio.sleep(LOCAL_MOVIE_INDEX_REFRESH_SECONDS)
+        try:
+            offset = await asyncio.to_thread(refresh_local_movie_index_batch, offset)
+        except Exception:
+            logger.exception("Rafraichissement de l'index local des films impossible.")
+
+
+def compute_collaborative_neighbors_in_memory(
+    cursor,
+    current_user_id: int,
+    rating_snapshot: dict[str, Any],
+) -> list[tuple[int, int, float]]:
+    # Same scoring as the SQL self-join; the current user's ratings are read live,
+    # everyone else's come from the last matrix rebuild.
+    cursor.execute(
+        f"SELECT movie_id, rating FROM user_ratings WHERE user_id = {SQL_PARAM}",
+        (current_user_id,),
+    )
+    movie_columns = rating_snapshot["movie_columns"]
+    base_entries = [
+        (movie_columns[int(movie_id)], float(rating))
+        for movie_id, rating in cursor.fetchall()
+        if int(movie_id) in movie_columns
+    ]
+    if not base_entries:
+        return []
+
+    base_columns, base_ratings = (np.array(values) for values in zip(*base_entries))
+    shared_ratings = rating_snapshot["matrix"][:, base_columns].tocoo()
+    other_ratings = shared_ratings.data
+    own_ratings = base_ratings[shared_ratings.col]
+    pair_scores = np.select(
+        [
+            (own_ratings >= 4) & (other_ratings >= 4),
+            (own_ratings <= 2) & (other_ratings <= 2),
+            np.abs(own_ratings - other_ratings) <= 1,
+            ((own_ratings >= 4) & (other_ratings <= 2)) | ((own_ratings <= 2) & (other_ratings >= 4)),
+        ],
+        [1.45 + ((other_ratings - 4) * 0.15), 0.90, 0.30, -1.70],
+        default=-0.15,
+    )
+    user_count = len(rating_snapshot["user_ids"])
+    overlap_counts = np.bincount(shared_ratings.row, minlength=user_count)
+    similarity_scores = np.bincount(shared_ratings.row, weights=pair_scores, minlength=user_count)
+    neighbor_mask = (
+        (overlap_counts >= 2)
+        & (similarity_scores > 0)
+        & (rating_snapshot["user_ids"] != int(current_user_id))
+    )
+    neighbor_positions = np.flatnonzero(neighbor_mask)
+    neighbor_order = np.lexsort((-overlap_counts[neighbor_positions], -similarity_scores[neighbor_positions]))[:10]
+    return [
+        (
+            int(rating_snapshot["user_ids"][position]),
+            int(overlap_counts[position]),
+            float(similarity_scores[position]),
+        )
+        for position in neighbor_positions[neighbor_order]
+    ]
+
+
+def get_collaborative_neighbors(cursor, current_user_id: int) -> list[tuple[int, int, float]]:
+    now = time.time()
+    with collaborative_cache_lock:
+        cached_entry = collaborative_neighbors_cache.get(int(current_user_id))
+        rating_snapshot = collaborative_rating_matrix
+    if cached_entry and cached_entry[0] > now:
+        return cached_entry[1]
+
+    if rating_snapshot is not None:
+        neighbors = compute_collaborative_neighbors_in_memory(cursor, current_user_id, rating_snapshot)
+    else:
+        neighbors = compute_collaborative_neighbors_from_db(cursor, current_user_id)
+
+    with collaborative_cache_lock:
+        if len(collaborative_neighbors_cache) >= COLLABORATIVE_NEIGHBORS_CACHE_MAX_ENTRIES:
+            expired_user_ids = [
+                user_id
+                for user_id, (expires_at, _) in collaborative_neighbors_cache.items()
+                if expires_at <= now
+            ]
+            for user_id in expired_user_ids or list(collaborative_neighbors_cache)[: COLLABORATIVE_NEIGHBORS_CACHE_MAX_ENTRIES // 4]:
+                collaborative_neighbors_cache.pop(user_id, None)
+        collaborative_neighbors_cache[int(current_user_id)] = (
+            now + COLLABORATIVE_NEIGHBORS_CACHE_TTL_SECONDS,
+            neighbors,
+        )
+    return neighbors
+
+
+def invalidate_collaborative_neighbors(cursor, user_id: int, movie_id: Optional[int] = None) -> None:
+    if movie_id is None:
+        # Whole rating profile changed: any cached neighbourhood may include this user.
+        with collaborative_cache_lock:
+            collaborative_neighbors_cache.clear()
+        return
+
+    with collaborative_cache_lock:
+        collaborative_neighbors_cache.pop(int(user_id), None)
+        if not collaborative_neighbors_cache:
+            return
+
+    # A rating only changes the similarity between its author and the users
+    # who rated the same movie, so only their cached neighbourhoods go stale.
+    cursor.execute(
+        f"SELECT user_id FROM user_ratings WHERE movie_id = {SQL_PARAM}",
+        (movie_id,),
+    )
+    co_rater_ids = [int(row[0]) for row in cursor.fetchall()]
+    with collaborative_cache_lock:
+        for co_rater_id in co_rater_ids:
+            collaborative_neighbors_cache.pop(co_rater_id, None)
+
+
+@timed_stage("feed.collaborative")
+def build_collaborative_candidate_scores(cursor, current_user_id: int, blocked_ids: set[int]) -> dict[int, float]:
+    neighbors = [
+        (neighbor_id, overlap_count, similarity_score)
+        for neighbor_id, overlap_count, similarity_score in get_collaborative_neighbors(cursor, current_user_id)
+        if overlap_count and similarity_score
+    ]
+    collaborative_scores: dict[int, float] = {}
+    if not neighbors:
+        return collaborative_scores
+
+    cursor.execute(
+        """
+        SELECT user_id, movie_id, rating
+        FROM (
+            SELECT
+                user_id,
+                movie_id,
+                rating,
+                ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY added_at DESC) AS favorite_rank
+            FROM user_ratings
+            WHERE rating >= 4 AND user_id IN ({placeholders})
+        ) ranked_favorites
+        WHERE favorite_rank <= 24
+        ORDER BY user_id, favorite_rank
+        """.format(placeholders=sql_placeholders(len(neighbors))),
+        [neighbor_id for neighbor_id, _, _ in neighbors],
+    )
+    favorites_by_neighbor_id: dict[int, list[tuple[int, float]]] = defaultdict(list)
+    for neighbor_id, movie_id, rating in cursor.fetchall():
+        favorites_by_neighbor_id[int(neighbor_id)].append((int(movie_id), rating))
+
+    for neighbor_id, overlap_count, similarity_score in neighbors:
+        affinity_weight = min(1.9, max(0.25, float(similarity_score) / max(int(overlap_count), 1)))
+        for rank, (movie_id, rating) in enumerate(favorites_by_neighbor_id.get(neighbor_id, [])):
+            if movie_id in blocked_ids:
+                continue
+            freshness_weight = max(0.35, 1.0 - (rank * 0.05))
+            rating_weight = 1.0 + ((int(rating) - 4) * 0.22)
+            collaborative_scores[movie_id] = collaborative_scores.get(movie_id, 0.0) + (
+                affinity_weight * freshness_weight * rating_weight
+            )
+
+    return collaborative_scores
+
+
+def select_top_positions(positions: np.ndarray, scores: np.ndarray, limit: int) -> np.ndarray:
+    if limit <= 0 or len(positions) == 0:
+        return positions[:0]
+
+    # Same order as DataFrame.sort_values(ascending=False).head(limit): quicksort on the
+    # reversed scores, so ties fall exactly where the pandas ranking put them.
+    reversed_order = np.argsort(scores[::-1], kind="quicksort")
+    return positions[(len(positions) - 1 - reversed_order)[::-1][:limit]]
+
+
+def get_catalog_positions(movie_ids: list[int]) -> list[int]:
+    return [
+        movie_index_by_id[int(movie_id)]
+        for movie_id in dict.fromkeys(movie_ids)
+        if int(movie_id) in movie_index_by_id
+    ]
+
+
+def pick_diverse_movie_ids(ranked_ids: list[int], limit: int, per_genre_cap: int) -> list[int]:
+    if limit <= 0:
+        return []
+
+    selected_ids: list[int] = []
+    deferred_ids: list[int] = []
+    genre_counts: dict[str, int] = {}
+
+    for movie_id in ranked_ids:
+        genre_name = get_movie_primary_genre(movie_id)
+        current_count = genre_counts.get(genre_name, 0)
+        if current_count < per_genre_cap or len(selected_ids) < max(2, limit // 2):
+            selected_ids.append(movie_id)
+            genre_counts[genre_name] = current_count + 1
+        else:
+            deferred_ids.append(movie_id)
+        if len(selected_ids) >= limit:
+            return selected_ids[:limit]
+
+    for movie_id in deferred_ids:
+        if len(selected_ids) >= limit:
+            break
+        selected_ids.append(movie_id)
+
+    return selected_ids[:limit]
+
+
+def build_recommendation_reason(
+    *,
+    movie_id: int,
+    positive_indices: list[int],
+    positive_signal_weights: dict[int, float],
+    positive_similarity_scores: np.ndarray,
+    onboarding_genre_tokens: set[str],
+    genre_profile: set[str],
+    mode: str,
+    seed_context: Optional[dict[str, object]] = None,
+    is_test_experiment: bool = False,
+) -> str:
+    movie_index = movie_index_by_id.get(int(movie_id))
+    if movie_index is None:
+        return "Choisi pour coller à tes goûts du moment"
+
+    row = movies_df.iloc[movie_index]
     primary_genre = str(row.get("primary_genre") or "ce registre")
     primary_genre_token = normalize_genre_token(primary_genre)
     vote_average = float(row.get("vote_average") or 0.0)
@@ -4203,11 +5868,10 @@ def build_recommendation_reason(
     if vectors is not None and positive_indices:
         best_reference_index = positive_indices[0]
         best_reference_score = -1.0
-        for reference_index in positive_indices[:8]:
-            similarity_score = float(cosine_similarity(
-                vectors[movie_index].reshape(1, -1),
-                vectors[reference_index].reshape(1, -1),
-            )[0][0])
+        reference_indices = positive_indices[:8]
+        reference_similarities = (vectors[reference_indices] @ vectors[movie_index].T).toarray().ravel()
+        for reference_index, similarity_value in zip(reference_indices, reference_similarities):
+            similarity_score = float(similarity_value)
             weighted_score = similarity_score * positive_signal_weights.get(int(movie_ids_array[reference_index]), 1.0)
             if weighted_score > best_reference_score:
                 best_reference_score = weighted_score
@@ -4253,7 +5917,7 @@ def get_tmdb_discover_movies(page: int, genre_ids_key: str) -> tuple[dict, ...]:
 
     url = f"https://api.themoviedb.org/3/discover/movie?{'&'.join(params)}"
     try:
-        results = requests.get(url, timeout=2).json().get("results", [])[:20]
+        results = upstream_get(url, timeout=2).json().get("results", [])[:20]
     except Exception:
         results = []
 
@@ -4696,7 +6360,7 @@ def send_native_push_notifications(
         for index in range(0, len(expo_tokens), 100):
             chunk = expo_tokens[index : index + 100]
             try:
-                response = requests.post(
+                response = upstream_post(
                     "https://exp.host/--/api/v2/push/send",
                     headers={
                         "Accept": "application/json",
@@ -4753,7 +6417,7 @@ def send_native_push_notifications(
 
     for device_token in fcm_tokens:
         try:
-            response = requests.post(
+            response = upstream_post(
                 "https://fcm.googleapis.com/fcm/send",
                 headers=headers,
                 json={
@@ -5588,10 +7252,75 @@ def get_playlist_previews(current_user: dict = Depends(get_current_user)):
     conn.commit()
 
     cursor.execute(
-        f"SELECT id, name FROM playlists WHERE user_id = {SQL_PARAM} AND name != {SQL_PARAM} ORDER BY id DESC",
-        (current_user["id"], WATCH_LATER_NAME),
+        f"SELECT id, name, item_count FROM playlists WHERE user_id = {SQL_PARAM} ORDER BY id DESC",
+        (current_user["id"],),
     )
-    custom_playlists = [dict(row) for row in cursor.fetchall()]
+    playlist_rows = [dict(row) for row in cursor.fetchall()]
+    item_counts = {int(row["id"]): int(row["item_count"] or 0) for row in playlist_rows}
+    custom_playlists = [row for row in playlist_rows if row["name"] != WATCH_LATER_NAME]
+
+    # One windowed pass ranks the first three movies of every list; the user_ratings
+    # lists get their counts from the same window.
+    cursor.execute(
+        f"""
+        WITH ranked_previews AS (
+            SELECT
+                playlist_id AS list_id,
+                movie_id AS id,
+                title,
+                poster_url,
+                rating,
+                COALESCE(added_at, '1970-01-01 00:00:00') AS added_at,
+                ROW_NUMBER() OVER (
+                    PARTITION BY playlist_id
+                    ORDER BY
+                        CASE WHEN playlist_id = {SQL_PARAM} THEN 2147483647 ELSE COALESCE(sort_index, 2147483647) END ASC,
+                        COALESCE(added_at, '1970-01-01 00:00:00') DESC,
+                        movie_id DESC
+                ) AS preview_rank,
+                0 AS list_count
+            FROM playlist_items
+            WHERE playlist_id IN (SELECT id FROM playlists WHERE user_id = {SQL_PARAM})
+            UNION ALL
+            SELECT
+                {FAVORITES_SYSTEM_ID} AS list_id,
+                movie_id AS id,
+                title,
+                poster_url,
+                rating,
+                added_at,
+                ROW_NUMBER() OVER (ORDER BY added_at DESC, movie_id DESC) AS preview_rank,
+                COUNT(*) OVER () AS list_count
+            FROM user_ratings
+            WHERE user_id = {SQL_PARAM} AND rating >= 4
+            UNION ALL
+            SELECT
+                {HISTORY_SYSTEM_ID} AS list_id,
+                movie_id AS id,
+                title,
+                poster_url,
+                rating,
+                added_at,
+                ROW_NUMBER() OVER (ORDER BY added_at DESC, movie_id DESC) AS preview_rank,
+                COUNT(*) OVER () AS list_count
+            FROM user_ratings
+            WHERE user_id = {SQL_PARAM}
+        )
+        SELECT list_id, id, title, poster_url, rating, added_at, list_count
+        FROM ranked_previews
+        WHERE preview_rank <= 3
+        ORDER BY list_id, preview_rank
+        """,
+        (watch_later_id, current_user["id"], current_user["id"], current_user["id"]),
+    )
+    preview_movies_by_list: dict[int, list[dict]] = defaultdict(list)
+    for row in cursor.fetchall():
+        preview_row = dict(row)
+        list_id = int(preview_row.pop("list_id"))
+        list_count = int(preview_row.pop("list_count") or 0)
+        if list_id < 0:
+            item_counts[list_id] = list_count
+        preview_movies_by_list[list_id].append(preview_row)
 
     playlist_sources = [
         {
@@ -5600,8 +7329,7 @@ def get_playlist_previews(current_user: dict = Depends(get_current_user)):
             "type": "system",
             "system_key": "watch-later",
             "readonly": False,
-            "real_id": watch_later_id,
-            "source": "playlist_items",
+            "list_id": watch_later_id,
         },
         {
             "id": FAVORITES_SYSTEM_ID,
@@ -5609,7 +7337,7 @@ def get_playlist_previews(current_user: dict = Depends(get_current_user)):
             "type": "system",
             "system_key": "favorites",
             "readonly": True,
-            "source": "favorites",
+            "list_id": FAVORITES_SYSTEM_ID,
         },
         {
             "id": HISTORY_SYSTEM_ID,
@@ -5617,7 +7345,7 @@ def get_playlist_previews(current_user: dict = Depends(get_current_user)):
             "type": "system",
             "system_key": "history",
             "readonly": True,
-            "source": "history",
+            "list_id": HISTORY_SYSTEM_ID,
         },
     ] + [
         {
@@ -5626,79 +7354,23 @@ def get_playlist_previews(current_user: dict = Depends(get_current_user)):
             "type": "custom",
             "system_key": None,
             "readonly": False,
-            "real_id": int(playlist["id"]),
-            "source": "custom",
+            "list_id": int(playlist["id"]),
         }
         for playlist in custom_playlists
     ]
 
-    previews = []
-    for playlist in playlist_sources:
-        source = playlist["source"]
-        if source in {"playlist_items", "custom"}:
-            cursor.execute(
-                f"SELECT COUNT(*) AS count FROM playlist_items WHERE playlist_id = {SQL_PARAM}",
-                (playlist["real_id"],),
-            )
-            count = int(cursor.fetchone()["count"] or 0)
-            order_clause = (
-                "COALESCE(added_at, '1970-01-01 00:00:00') DESC, movie_id DESC"
-                if source == "playlist_items"
-                else "COALESCE(sort_index, 2147483647) ASC, COALESCE(added_at, '1970-01-01 00:00:00') DESC, movie_id DESC"
-            )
-            cursor.execute(
-                f"""
-                SELECT movie_id AS id, title, poster_url, rating, COALESCE(added_at, '1970-01-01 00:00:00') AS added_at
-                FROM playlist_items
-                WHERE playlist_id = {SQL_PARAM}
-                ORDER BY {order_clause}
-                LIMIT 3
-                """,
-                (playlist["real_id"],),
-            )
-        elif source == "favorites":
-            cursor.execute(
-                f"SELECT COUNT(*) AS count FROM user_ratings WHERE user_id = {SQL_PARAM} AND rating >= 4",
-                (current_user["id"],),
-            )
-            count = int(cursor.fetchone()["count"] or 0)
-            cursor.execute(
-                f"""
-                SELECT movie_id AS id, title, poster_url, rating, added_at
-                FROM user_ratings
-                WHERE user_id = {SQL_PARAM} AND rating >= 4
-                ORDER BY added_at DESC
-                LIMIT 3
-                """,
-                (current_user["id"],),
-            )
-        else:
-            cursor.execute(
-                f"SELECT COUNT(*) AS count FROM user_ratings WHERE user_id = {SQL_PARAM}",
-                (current_user["id"],),
-            )
-            count = int(cursor.fetchone()["count"] or 0)
-            cursor.execute(
-                f"""
-                SELECT movie_id AS id, title, poster_url, rating, added_at
-                FROM user_ratings
-                WHERE user_id = {SQL_PARAM}
-                ORDER BY added_at DESC
-                LIMIT 3
-                """,
-                (current_user["id"],),
-            )
-
-        preview_movies = [dict(row) for row in cursor.fetchall()]
-        previews.append({
+    previews = [
+        {
             "id": playlist["id"],
             "name": playlist["name"],
             "type": playlist["type"],
             "system_key": playlist["system_key"],
             "readonly": playlist["readonly"],
-            "count": count,
-            "preview_movies": preview_movies,
-        })
+            "count": item_counts.get(playlist["list_id"], 0),
+            "preview_movies": preview_movies_by_list.get(playlist["list_id"], []),
+        }
+        for playlist in playlist_sources
+    ]
 
     conn.close()
     return previews
@@ -5768,15 +7440,9 @@ def get_playlist_content(playlist_id: int, current_user: dict = Depends(get_curr
         movie["subscription_provider_names"] = []
 
     if playlist_id == WATCH_LATER_SYSTEM_ID:
+        provider_names_by_movie_id = get_movie_subscription_provider_names_batch([int(movie["id"]) for movie in movies])
         for movie in movies:
-            watch_providers = get_tmdb_watch_providers(int(movie["id"]))
-            movie["subscription_provider_names"] = dedupe_list(
-                [
-                    normalize_streaming_service_label(provider.get("name", ""))
-                    for provider in watch_providers.get("subscription", [])
-                    if normalize_streaming_service_label(provider.get("name", ""))
-                ]
-            )
+            movie["subscription_provider_names"] = provider_names_by_movie_id.get(int(movie["id"])) or []
 
     if playlist_id == WATCH_LATER_SYSTEM_ID:
         movies.sort(
@@ -5797,6 +7463,7 @@ def get_playlist_content_paged(
     sort: Optional[str] = None,
     query: str = "",
     only_owned_streaming_services: bool = False,
+    page_cursor: str = Query("", alias="cursor"),
     current_user: dict = Depends(get_current_user),
 ):
     safe_limit = max(1, min(limit, 240))
@@ -5817,12 +7484,17 @@ def get_playlist_content_paged(
         sort_mode=resolved_sort,
         query=query,
         only_owned_streaming_services=only_owned_streaming_services,
+        page_cursor=page_cursor.strip(),
     )
     conn.commit()
     conn.close()
     payload["resolved_sort"] = resolved_sort
     return payload
 
+def get_playlist_taste_state_components(playlist_id: int) -> tuple[str, ...]:
+    return ("watch_later",) if playlist_id == WATCH_LATER_SYSTEM_ID else ()
+
+
 @app.post("/playlists/{playlist_id}/add/{movie_id}")
 def add_to_specific_playlist(playlist_id: int, movie_id: int, current_user: dict = Depends(get_current_user)):
     conn = get_db_connection()
@@ -5834,7 +7506,7 @@ def add_to_specific_playlist(playlist_id: int, movie_id: int, current_user: dict
         try:
             primary_genre = get_movie_primary_genre(movie_id)
             subscription_provider_names = (
-                build_movie_subscription_provider_names(movie_id)
+                extract_subscription_provider_names(info.get("watch_providers") or {})
                 if playlist_id == WATCH_LATER_SYSTEM_ID
                 else []
             )
@@ -5849,6 +7521,7 @@ def add_to_specific_playlist(playlist_id: int, movie_id: int, current_user: dict
                     playlist_id,
                     movie_id,
                     title,
+                    title_key,
                     poster_url,
                     rating,
                     added_at,
@@ -5862,6 +7535,7 @@ def add_to_specific_playlist(playlist_id: int, movie_id: int, current_user: dict
                     {SQL_PARAM},
                     {SQL_PARAM},
                     {SQL_PARAM},
+                    {SQL_PARAM},
                     CURRENT_TIMESTAMP,
                     {SQL_PARAM},
                     {SQL_PARAM},
@@ -5873,6 +7547,7 @@ def add_to_specific_playlist(playlist_id: int, movie_id: int, current_user: dict
                     target_id,
                     info["id"],
                     info["title"],
+                    build_title_key(info["title"]),
                     info["poster_url"],
                     info["rating"],
                     next_sort_index,
@@ -5888,6 +7563,12 @@ def add_to_specific_playlist(playlist_id: int, movie_id: int, current_user: dict
                 reaction_type,
             )
             conn.commit()
+            invalidate_recommendation_taste_state(
+                current_user["id"],
+                *get_playlist_taste_state_components(playlist_id),
+                "impressions",
+                "feedback_profile",
+            )
         except DBIntegrityError:
             pass
         
@@ -5913,6 +7594,12 @@ def remove_from_specific_playlist(playlist_id: int, movie_id: int, current_user:
     )
     conn.commit()
     conn.close()
+    invalidate_recommendation_taste_state(
+        current_user["id"],
+        *get_playlist_taste_state_components(playlist_id),
+        "impressions",
+        "feedback_profile",
+    )
     return {"status": "removed"}
 
 @app.post("/playlists/{playlist_id}/reorder")
@@ -5946,6 +7633,7 @@ def reorder_playlist(
 
     conn.commit()
     conn.close()
+    invalidate_recommendation_taste_state(current_user["id"], *get_playlist_taste_state_components(playlist_id))
     return {"status": "reordered"}
 
 @app.post("/playlists/{playlist_id}/move")
@@ -5989,6 +7677,7 @@ def move_playlist_movie(
 
     conn.commit()
     conn.close()
+    invalidate_recommendation_taste_state(current_user["id"], *get_playlist_taste_state_components(playlist_id))
     return {"status": "moved"}
 
 @app.post("/movies/rate/{movie_id}/{rating}")
@@ -6012,15 +7701,16 @@ def rate_movie(movie_id: int, rating: float, current_user: dict = Depends(get_cu
     
     cursor.execute(
         """
-        INSERT INTO user_ratings (user_id, movie_id, rating, title, poster_url)
-        VALUES ({param}, {param}, {param}, {param}, {param})
+        INSERT INTO user_ratings (user_id, movie_id, rating, title, title_key, poster_url)
+        VALUES ({param}, {param}, {param}, {param}, {param}, {param})
         ON CONFLICT(user_id, movie_id) DO UPDATE SET
             rating = EXCLUDED.rating,
             title = EXCLUDED.title,
+            title_key = EXCLUDED.title_key,
             poster_url = EXCLUDED.poster_url,
             added_at = CURRENT_TIMESTAMP
         """.format(param=SQL_PARAM),
-        (current_user["id"], movie_id, rounded_rating, title, poster),
+        (current_user["id"], movie_id, rounded_rating, title, build_title_key(title), poster),
     )
     cursor.execute(
         f"UPDATE reviews SET rating = {SQL_PARAM} WHERE user_id = {SQL_PARAM} AND movie_id = {SQL_PARAM}",
@@ -6038,7 +7728,10 @@ def rate_movie(movie_id: int, rating: float, current_user: dict = Depends(get_cu
         rounded_rating,
     )
     conn.commit()
+    invalidate_collaborative_neighbors(cursor, current_user["id"], movie_id)
     conn.close()
+    record_taste_state_rating(current_user["id"], movie_id, rounded_rating)
+    invalidate_recommendation_taste_state(current_user["id"], "watch_later", "impressions", "feedback_profile")
     return {"status": "rated"}
 
 
@@ -6060,35 +7753,643 @@ def delete_movie_rating(movie_id: int, current_user: dict = Depends(get_current_
         f"DELETE FROM user_ratings WHERE user_id = {SQL_PARAM} AND movie_id = {SQL_PARAM}",
         (current_user["id"], movie_id),
     )
-    mark_recommendation_reaction(
-        cursor,
-        current_user["id"],
-        movie_id,
-        "undo_rating",
+    mark_recommendation_reaction(
+        cursor,
+        current_user["id"],
+        movie_id,
+        "undo_rating",
+    )
+    conn.commit()
+    invalidate_collaborative_neighbors(cursor, current_user["id"], movie_id)
+    conn.close()
+    record_taste_state_rating(current_user["id"], movie_id, None)
+    invalidate_recommendation_taste_state(current_user["id"], "impressions", "feedback_profile")
+    return {"status": "removed"}
+
+
+@app.get("/movies/user-rating/{movie_id}")
+def get_user_movie_rating(movie_id: int, current_user: dict = Depends(get_current_user)):
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT rating FROM user_ratings WHERE user_id = {SQL_PARAM} AND movie_id = {SQL_PARAM}",
+        (current_user["id"], movie_id),
+    )
+    row = cursor.fetchone()
+    conn.close()
+    return {"rating": float(row[0]) if row else None}
+
+# --- 7. RECOMMANDATIONS ---
+def get_redis_sync_client():
+    global redis_sync_client
+    if not REDIS_URL or redis_sync is None:
+        return None
+    if redis_sync_client is None:
+        redis_sync_client = redis_sync.Redis.from_url(REDIS_URL, decode_responses=True)
+    return redis_sync_client
+
+
+def get_taste_state_redis_key(user_id: int) -> str:
+    return f"{RECOMMENDATION_TASTE_STATE_REDIS_PREFIX}{int(user_id)}"
+
+
+def get_taste_state_generation_redis_key(user_id: int) -> str:
+    return f"{RECOMMENDATION_TASTE_STATE_REDIS_PREFIX}generation:{int(user_id)}"
+
+
+def get_taste_state_generation(user_id: int) -> Optional[int]:
+    client = get_redis_sync_client()
+    if client is not None:
+        try:
+            return int(client.get(get_taste_state_generation_redis_key(user_id)) or 0)
+        except Exception:
+            logger.warning("Lecture Redis de la generation de gout impossible pour user_id=%s.", user_id)
+            return None
+
+    with taste_state_lock:
+        return recommendation_taste_state_generations.get(int(user_id), recommendation_taste_state_generation_floor)
+
+
+def bump_taste_state_generation(user_id: int) -> None:
+    # Every write bumps the generation: a feed that read the DB before the write can no
+    # longer store what it loaded, even if the component was not cached yet.
+    global recommendation_taste_state_generation_counter, recommendation_taste_state_generation_floor
+    client = get_redis_sync_client()
+    if client is not None:
+        generation_key = get_taste_state_generation_redis_key(user_id)
+        try:
+            with client.pipeline() as pipeline:
+                pipeline.incr(generation_key)
+                pipeline.expire(generation_key, RECOMMENDATION_TASTE_STATE_TTL_SECONDS * 2)
+                pipeline.execute()
+        except Exception:
+            # The state may now be stale: drop it so the next feed reloads from the DB.
+            logger.warning("Increment Redis de la generation de gout impossible pour user_id=%s.", user_id)
+            with suppress(Exception):
+                client.delete(get_taste_state_redis_key(user_id))
+        return
+
+    with taste_state_lock:
+        recommendation_taste_state_generation_counter += 1
+        recommendation_taste_state_generations.pop(int(user_id), None)
+        recommendation_taste_state_generations[int(user_id)] = recommendation_taste_state_generation_counter
+        if len(recommendation_taste_state_generations) > RECOMMENDATION_TASTE_STATE_MAX_ENTRIES * 4:
+            # Pruned users fall back to the floor, which rejects any store started before the prune.
+            for pruned_user_id in list(recommendation_taste_state_generations)[:RECOMMENDATION_TASTE_STATE_MAX_ENTRIES]:
+                recommendation_taste_state_generation_floor = max(
+                    recommendation_taste_state_generation_floor,
+                    recommendation_taste_state_generations.pop(pruned_user_id),
+                )
+
+
+def read_taste_state_components(user_id: int) -> dict[str, Any]:
+    client = get_redis_sync_client()
+    if client is not None:
+        try:
+            raw_components = client.hgetall(get_taste_state_redis_key(user_id))
+            return {name: json.loads(value) for name, value in raw_components.items()}
+        except Exception:
+            logger.warning("Lecture Redis de l'etat de gout impossible pour user_id=%s.", user_id)
+            return {}
+
+    with taste_state_lock:
+        entry = recommendation_taste_state_cache.get(int(user_id))
+        if not entry or entry["expires_at"] <= time.time():
+            return {}
+        return dict(entry["components"])
+
+
+def store_taste_state_components(user_id: int, components: dict[str, Any], generation: Optional[int]) -> None:
+    # generation is read before the DB: a write committed since then makes these components stale.
+    if not components or generation is None:
+        return
+
+    client = get_redis_sync_client()
+    if client is not None:
+        redis_key = get_taste_state_redis_key(user_id)
+        generation_key = get_taste_state_generation_redis_key(user_id)
+        try:
+            with client.pipeline() as pipeline:
+                pipeline.watch(generation_key)
+                if int(pipeline.get(generation_key) or 0) != generation:
+                    return
+                # The TTL starts with the first component so cross-worker staleness stays bounded.
+                needs_ttl = pipeline.ttl(redis_key) < 0
+                pipeline.multi()
+                pipeline.hset(redis_key, mapping={name: json.dumps(value) for name, value in components.items()})
+                if needs_ttl:
+                    pipeline.expire(redis_key, RECOMMENDATION_TASTE_STATE_TTL_SECONDS)
+                pipeline.execute()
+        except Exception:
+            # WatchError included: a write landed meanwhile, the next feed reloads from the DB.
+            logger.debug("Etat de gout non stocke pour user_id=%s.", user_id)
+        return
+
+    now = time.time()
+    with taste_state_lock:
+        if recommendation_taste_state_generations.get(int(user_id), recommendation_taste_state_generation_floor) != generation:
+            return
+        entry = recommendation_taste_state_cache.get(int(user_id))
+        if not entry or entry["expires_at"] <= now:
+            if len(recommendation_taste_state_cache) >= RECOMMENDATION_TASTE_STATE_MAX_ENTRIES:
+                expired_user_ids = [
+                    cached_user_id
+                    for cached_user_id, cached_entry in recommendation_taste_state_cache.items()
+                    if cached_entry["expires_at"] <= now
+                ]
+                for cached_user_id in expired_user_ids or list(recommendation_taste_state_cache)[: RECOMMENDATION_TASTE_STATE_MAX_ENTRIES // 4]:
+                    recommendation_taste_state_cache.pop(cached_user_id, None)
+            entry = {"expires_at": now + RECOMMENDATION_TASTE_STATE_TTL_SECONDS, "components": {}}
+            recommendation_taste_state_cache[int(user_id)] = entry
+        entry["components"].update(components)
+
+
+def invalidate_recommendation_taste_state(user_id: int, *component_names: str) -> None:
+    bump_taste_state_generation(user_id)
+    client = get_redis_sync_client()
+    if client is not None:
+        try:
+            if component_names:
+                client.hdel(get_taste_state_redis_key(user_id), *component_names)
+            else:
+                client.delete(get_taste_state_redis_key(user_id))
+        except Exception:
+            logger.warning("Invalidation Redis de l'etat de gout impossible pour user_id=%s.", user_id)
+        return
+
+    with taste_state_lock:
+        if not component_names:
+            recommendation_taste_state_cache.pop(int(user_id), None)
+            return
+        entry = recommendation_taste_state_cache.get(int(user_id))
+        if entry:
+            for component_name in component_names:
+                entry["components"].pop(component_name, None)
+
+
+def patch_taste_state_component(user_id: int, component_name: str, update_component) -> None:
+    bump_taste_state_generation(user_id)
+    client = get_redis_sync_client()
+    if client is not None:
+        redis_key = get_taste_state_redis_key(user_id)
+        try:
+            with client.pipeline() as pipeline:
+                pipeline.watch(redis_key)
+                raw_component = pipeline.hget(redis_key, component_name)
+                if raw_component is None:
+                    return
+                pipeline.multi()
+                pipeline.hset(redis_key, component_name, json.dumps(update_component(json.loads(raw_component))))
+                pipeline.execute()
+        except Exception:
+            # Concurrent write (WatchError) or Redis failure: drop the component, the next feed reloads it.
+            invalidate_recommendation_taste_state(user_id, component_name)
+        return
+
+    with taste_state_lock:
+        entry = recommendation_taste_state_cache.get(int(user_id))
+        if entry and component_name in entry["components"]:
+            entry["components"][component_name] = update_component(entry["components"][component_name])
+
+
+def record_taste_state_rating(user_id: int, movie_id: int, rating: Optional[float]) -> None:
+    def update_ratings(rating_rows: list) -> list:
+        # Ratings are ordered newest first: a new or updated rating moves to the front.
+        remaining_rows = [row for row in rating_rows if int(row[0]) != int(movie_id)]
+        return remaining_rows if rating is None else [[int(movie_id), float(rating)], *remaining_rows]
+
+    patch_taste_state_component(user_id, "ratings", update_ratings)
+
+
+def record_taste_state_impression(user_id: int, movie_id: int, mode: str) -> None:
+    if mode != "tinder":
+        return
+
+    shown_at = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+
+    def update_impressions(impression_rows: list) -> list:
+        return [[int(movie_id), "", "", shown_at], *impression_rows][:RECOMMENDATION_IMPRESSION_HISTORY_LIMIT]
+
+    patch_taste_state_component(user_id, "impressions", update_impressions)
+
+
+def record_taste_state_preferences(user_id: int, preferences: dict) -> None:
+    patch_taste_state_component(user_id, "profile", lambda profile: {**profile, "preferences": preferences})
+
+
+def load_recommendation_taste_state(conn, cursor, user_id: int, *, include_feedback_profile: bool) -> dict[str, Any]:
+    generation = get_taste_state_generation(user_id)
+    taste_state = read_taste_state_components(user_id)
+    loaded_components: dict[str, Any] = {}
+
+    if "profile" not in taste_state:
+        watch_later_id = get_or_create_watch_later_id(cursor, user_id)
+        conn.commit()
+        loaded_components["profile"] = {
+            "watch_later_id": int(watch_later_id),
+            "preferences": get_user_preferences(cursor, user_id),
+        }
+    watch_later_id = (taste_state.get("profile") or loaded_components["profile"])["watch_later_id"]
+
+    if "ratings" not in taste_state:
+        # movie_id settles same-second ratings, whichever index the planner picks.
+        cursor.execute(
+            f"SELECT movie_id, rating FROM user_ratings WHERE user_id = {SQL_PARAM} ORDER BY added_at DESC, movie_id ASC",
+            (user_id,),
+        )
+        loaded_components["ratings"] = [[int(row[0]), float(row[1])] for row in cursor.fetchall()]
+
+    if "watch_later" not in taste_state:
+        cursor.execute(
+            f"SELECT movie_id FROM playlist_items WHERE playlist_id = {SQL_PARAM}",
+            (watch_later_id,),
+        )
+        watch_later_ids = [int(row[0]) for row in cursor.fetchall()]
+        cursor.execute(
+            f"SELECT movie_id FROM playlist_items WHERE playlist_id = {SQL_PARAM} ORDER BY COALESCE(sort_index, 999999), added_at DESC LIMIT 12",
+            (watch_later_id,),
+        )
+        loaded_components["watch_later"] = {
+            "ids": watch_later_ids,
+            "recent_ids": [int(row[0]) for row in cursor.fetchall()],
+        }
+
+    if "impressions" not in taste_state:
+        cursor.execute(
+            """
+            SELECT movie_id, reaction_type, responded_at, shown_at
+            FROM recommendation_impressions
+            WHERE user_id = {param}
+              AND mode = 'tinder'
+            ORDER BY COALESCE(responded_at, shown_at) DESC
+            LIMIT {limit}
+            """.format(param=SQL_PARAM, limit=RECOMMENDATION_IMPRESSION_HISTORY_LIMIT),
+            (user_id,),
+        )
+        loaded_components["impressions"] = [
+            [int(row[0]), str(row[1] or ""), str(row[2] or ""), str(row[3] or "")]
+            for row in cursor.fetchall()
+        ]
+
+    if include_feedback_profile and "feedback_profile" not in taste_state:
+        loaded_components["feedback_profile"] = get_test_ai_feedback_profile(cursor, user_id)
+
+    store_taste_state_components(user_id, loaded_components, generation)
+    taste_state.update(loaded_components)
+    return taste_state
+
+
+@timed_stage("feed.context")
+def load_recommendation_feed_context(current_user_id: int, *, include_collaborative: bool = True) -> dict[str, Any]:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    is_test_ai_experiment = is_recommendation_ai_enabled_user(cursor, current_user_id)
+    taste_state = load_recommendation_taste_state(
+        conn,
+        cursor,
+        current_user_id,
+        include_feedback_profile=is_test_ai_experiment,
+    )
+    preferences = taste_state["profile"]["preferences"]
+
+    rating_rows = [(int(movie_id), float(rating)) for movie_id, rating in taste_state["ratings"]]
+    rated_ids = {movie_id for movie_id, _ in rating_rows}
+    disliked_ids = [movie_id for movie_id, rating in rating_rows if rating <= 2.5][:12]
+
+    watch_later_ids = {int(movie_id) for movie_id in taste_state["watch_later"]["ids"]}
+
+    latest_reaction_by_movie: dict[int, tuple[str, str, str]] = {}
+    for movie_id, reaction_type, responded_at, shown_at in taste_state["impressions"]:
+        movie_id = int(movie_id)
+        if movie_id in latest_reaction_by_movie:
+            continue
+        latest_reaction_by_movie[movie_id] = (reaction_type, responded_at, shown_at)
+    passed_ids = {
+        movie_id
+        for movie_id, (reaction_type, _, _) in latest_reaction_by_movie.items()
+        if reaction_type in PASS_REACTION_TYPES
+    }
+    pass_cooldown_cutoff = datetime.datetime.utcnow() - datetime.timedelta(
+        days=PASS_RECONSIDER_COOLDOWN_DAYS
+    )
+    def parse_reaction_datetime(raw_value: str):
+        if not raw_value:
+            return None
+        normalized_value = raw_value.strip().replace("Z", "+00:00")
+        if " " in normalized_value and "T" not in normalized_value:
+            normalized_value = normalized_value.replace(" ", "T", 1)
+        try:
+            parsed_value = datetime.datetime.fromisoformat(normalized_value)
+        except ValueError:
+            return None
+        if parsed_value.tzinfo is not None:
+            parsed_value = parsed_value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return parsed_value
+
+    tinder_history_blocked_ids = set()
+    for movie_id, (reaction_type, responded_at, _shown_at) in latest_reaction_by_movie.items():
+        if reaction_type in PASS_REACTION_TYPES:
+            responded_at_datetime = parse_reaction_datetime(responded_at)
+            if responded_at_datetime is not None and responded_at_datetime < pass_cooldown_cutoff:
+                continue
+        tinder_history_blocked_ids.add(movie_id)
+
+    recent_watch_later_ids = [int(movie_id) for movie_id in taste_state["watch_later"]["recent_ids"]]
+    test_feedback_profile = (
+        taste_state["feedback_profile"]
+        if is_test_ai_experiment
+        else {
+            "genre_biases": {},
+            "keyword_biases": {},
+            "positive_count": 0,
+            "negative_count": 0,
+            "total_feedback_count": 0,
+        }
+    )
+
+    collaborative_scores = build_collaborative_candidate_scores(
+        cursor,
+        current_user_id,
+        rated_ids | watch_later_ids | tinder_history_blocked_ids,
+    ) if include_collaborative else {}
+    conn.close()
+
+    return {
+        "is_test_ai_experiment": is_test_ai_experiment,
+        "preferences": preferences,
+        "rating_rows": rating_rows,
+        "rated_ids": rated_ids,
+        "disliked_ids": disliked_ids,
+        "watch_later_ids": watch_later_ids,
+        "passed_ids": passed_ids,
+        "tinder_history_blocked_ids": tinder_history_blocked_ids,
+        "recent_watch_later_ids": recent_watch_later_ids,
+        "test_feedback_profile": test_feedback_profile,
+        "collaborative_scores": collaborative_scores,
+        # Signal similarity columns do not depend on the surface: computed once per context.
+        "similarity_matrices": {},
+    }
+
+
+def get_feed_similarity_matrix(feed_context: dict[str, Any], signal_indices: list[int]) -> np.ndarray:
+    cache_key = tuple(int(index) for index in signal_indices)
+    similarity_matrices = feed_context["similarity_matrices"]
+    if cache_key not in similarity_matrices:
+        similarity_matrices[cache_key] = build_signal_similarity_matrix(list(cache_key))
+    return similarity_matrices[cache_key]
+
+
+def get_feed_hybrid_weights(
+    is_test_ai_experiment: bool,
+    is_tinder_mode: bool,
+    interaction_count: int,
+) -> tuple[float, float, float, float, float, float, float, float, float]:
+    # (positive sim, negative sim, genre, keyword, audience, audience boost, audience penalty, quality, social)
+    if is_test_ai_experiment:
+        return (
+            0.56 if is_tinder_mode else 0.42,
+            0.44 if is_tinder_mode else 0.30,
+            0.14 if is_tinder_mode else 0.14,
+            0.26 if is_tinder_mode else 0.20,
+            0.35 if is_tinder_mode else 0.13,
+            0.48 if is_tinder_mode else 0.12,
+            0.34 if is_tinder_mode else 0.10,
+            0.08 if is_tinder_mode else 0.11,
+            0.0 if is_tinder_mode else 0.01,
+        )
+    return (
+        0.46 if is_tinder_mode else 0.34,
+        0.35 if is_tinder_mode else 0.22,
+        0.17 if is_tinder_mode else 0.15,
+        0.18 if is_tinder_mode else 0.16,
+        0.26 if is_tinder_mode else 0.08,
+        0.34 if is_tinder_mode else 0.06,
+        0.20 if is_tinder_mode else 0.03,
+        0.03 if is_tinder_mode else 0.09,
+        0.0 if is_tinder_mode else (0.02 if interaction_count >= 8 else 0.04),
+    )
+
+
+def get_cached_now_playing_ids() -> set[int]:
+    return {int(movie["id"]) for movie in list(now_playing_cache.get("items") or [])}
+
+
+def compute_feed_hybrid_scores(
+    positions: Optional[np.ndarray],
+    *,
+    is_test_ai_experiment: bool,
+    is_tinder_mode: bool,
+    interaction_count: int,
+    genre_affinity_scores: np.ndarray,
+    keyword_affinity_scores: Any = 0.0,
+    positive_similarity_scores: Any = 0.0,
+    negative_similarity_scores: Any = 0.0,
+    social_scores: Any = 0.0,
+    has_positive_signal: bool = False,
+    cold_start_genre_tokens: Optional[set[str]] = None,
+) -> np.ndarray:
+    # Scores the catalog rows at `positions` (None: whole catalog). Signal arrays are already
+    # restricted to those rows; a missing signal stays 0.
+    rows = slice(None) if positions is None else positions
+    (
+        positive_similarity_weight,
+        negative_similarity_weight,
+        genre_affinity_weight,
+        keyword_affinity_weight,
+        audience_rating_weight,
+        audience_boost_weight,
+        audience_penalty_weight,
+        quality_weight,
+        social_weight,
+    ) = get_feed_hybrid_weights(is_test_ai_experiment, is_tinder_mode, interaction_count)
+    quality_scores = movies_df["quality_score"].to_numpy()[rows]
+    audience_rating_scores = movies_df["audience_rating_score"].to_numpy()[rows]
+    audience_rating_boost_scores = np.clip((audience_rating_scores - 0.62) / 0.11, 0.0, 1.0)
+    audience_rating_penalty_scores = np.clip((0.60 - audience_rating_scores) / 0.08, 0.0, 1.0)
+
+    hybrid_scores = (
+        (positive_similarity_scores * positive_similarity_weight)
+        - (negative_similarity_scores * negative_similarity_weight)
+        + (genre_affinity_scores * genre_affinity_weight)
+        + (keyword_affinity_scores * keyword_affinity_weight)
+        + (audience_rating_scores * audience_rating_weight)
+        + (audience_rating_boost_scores * audience_boost_weight)
+        - (audience_rating_penalty_scores * audience_penalty_weight)
+        + (quality_scores * quality_weight)
+        + (social_scores * social_weight)
+    )
+
+    if is_test_ai_experiment:
+        vote_average_values = movies_df["vote_average"].to_numpy(dtype=float)[rows]
+        vote_count_values = movies_df["vote_count"].to_numpy(dtype=float)
+        vote_confidence_scores = np.clip(
+            np.log1p(vote_count_values[rows]) / np.log1p(max(float(vote_count_values.max()), 1.0)),
+            0.0,
+            1.0,
+        )
+        public_excellence_scores = (
+            np.clip((vote_average_values - 6.8) / 1.25, 0.0, 1.0)
+            * vote_confidence_scores
+        )
+        public_weakness_scores = (
+            np.clip((6.15 - vote_average_values) / 1.05, 0.0, 1.0)
+            * (0.55 + (vote_confidence_scores * 0.45))
+        )
+        hybrid_scores = hybrid_scores + (
+            public_excellence_scores * (0.24 if is_tinder_mode else 0.12)
+        ) - (
+            public_weakness_scores * (0.36 if is_tinder_mode else 0.16)
+        )
+        if has_positive_signal:
+            hybrid_scores = hybrid_scores + (
+                positive_similarity_scores
+                * audience_rating_scores
+                * (0.12 if is_tinder_mode else 0.06)
+            )
+
+    if cold_start_genre_tokens:
+        genre_ids = [genre_token_index[token] for token in cold_start_genre_tokens if token in genre_token_index]
+        cold_start_overlap_scores = compute_token_overlap_scores(
+            genre_token_presence_matrix if positions is None else genre_token_presence_matrix[positions],
+            genre_ids,
+            len(cold_start_genre_tokens),
+        )
+        overlap_weight = 0.34 if is_test_ai_experiment else 0.24
+        quality_cold_weight = 0.12 if is_test_ai_experiment else 0.08
+        hybrid_scores = hybrid_scores + (
+            (cold_start_overlap_scores * overlap_weight)
+            + (quality_scores * quality_cold_weight)
+        )
+    return hybrid_scores
+
+
+def build_feed_movie_payload(
+    row,
+    *,
+    poster_urls_by_movie_id: dict[int, str],
+    now_playing_ids: set[int],
+    positive_indices: list[int],
+    positive_signal_weights: dict[int, float],
+    positive_similarity_scores: np.ndarray,
+    onboarding_genre_tokens: set[str],
+    genre_profile: set[str],
+    mode: str,
+    is_test_ai_experiment: bool,
+    seed_context: Optional[dict[str, object]] = None,
+) -> dict:
+    movie_id = int(row["id"])
+    payload = {
+        "id": movie_id,
+        "title": str(row["title"]),
+        "poster_url": poster_urls_by_movie_id.get(movie_id) or fetch_poster_from_tmdb(movie_id),
+        "rating": float(row["vote_average"]),
+        "is_now_playing": movie_id in now_playing_ids,
+        "recommendation_reason": build_recommendation_reason(
+            movie_id=movie_id,
+            positive_indices=positive_indices,
+            positive_signal_weights=positive_signal_weights,
+            positive_similarity_scores=positive_similarity_scores,
+            onboarding_genre_tokens=onboarding_genre_tokens,
+            genre_profile=genre_profile,
+            mode=mode,
+            seed_context=seed_context,
+            is_test_experiment=is_test_ai_experiment,
+        ),
+    }
+    if is_test_ai_experiment:
+        payload.update(
+            {
+                "recommendation_variant": TEST_AI_ALGORITHM_VARIANT,
+                "recommendation_seed_movie_id": seed_context.get("seed_movie_id") if seed_context else None,
+                "recommendation_seed_title": seed_context.get("seed_title") if seed_context else None,
+                "recommendation_similarity": seed_context.get("seed_similarity") if seed_context else None,
+            }
+        )
+    return payload
+
+
+@timed_stage("feed.cold_start_pool")
+def compute_cold_start_pool_feed(
+    *,
+    limit: int,
+    mode: str,
+    is_test_ai_experiment: bool,
+    interaction_count: int,
+    onboarding_genre_tokens: set[str],
+    blocked_ids: set[int],
+) -> list[dict]:
+    # Same hybrid score as compute_recommendation_feed with no personal signal, evaluated on the
+    # precomputed genre pools only: no catalog-wide vectors, no TMDB related expansion.
+    is_tinder_mode = mode == "tinder"
+    pool_positions = get_cold_start_pool_positions(onboarding_genre_tokens)
+    if blocked_ids:
+        pool_positions = pool_positions[
+            ~np.isin(movie_ids_array[pool_positions], np.fromiter(blocked_ids, dtype=np.int64, count=len(blocked_ids)))
+        ]
+    if len(pool_positions) == 0:
+        return []
+
+    onboarding_bias = 1.35 if is_test_ai_experiment else 0.95
+    genre_affinity_scores = compute_token_affinity_scores(
+        genre_token_matrix[pool_positions],
+        genre_token_counts[pool_positions],
+        genre_token_index,
+        {token: onboarding_bias for token in onboarding_genre_tokens},
+    )
+    pool_scores = compute_feed_hybrid_scores(
+        pool_positions,
+        is_test_ai_experiment=is_test_ai_experiment,
+        is_tinder_mode=is_tinder_mode,
+        interaction_count=interaction_count,
+        genre_affinity_scores=genre_affinity_scores,
+        cold_start_genre_tokens=onboarding_genre_tokens,
     )
-    conn.commit()
-    conn.close()
-    return {"status": "removed"}
-
 
-@app.get("/movies/user-rating/{movie_id}")
-def get_user_movie_rating(movie_id: int, current_user: dict = Depends(get_current_user)):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        f"SELECT rating FROM user_ratings WHERE user_id = {SQL_PARAM} AND movie_id = {SQL_PARAM}",
-        (current_user["id"], movie_id),
+    ranked_order = np.argsort(-pool_scores, kind="stable")
+    main_per_genre_cap = 2 if is_test_ai_experiment and is_tinder_mode else 3
+    selected_ids = pick_diverse_movie_ids(
+        movie_ids_array[pool_positions[ranked_order]].tolist(),
+        limit,
+        per_genre_cap=main_per_genre_cap,
     )
-    row = cursor.fetchone()
-    conn.close()
-    return {"rating": float(row[0]) if row else None}
+    if len(selected_ids) < limit:
+        quality_scores = movies_df["quality_score"].to_numpy()[pool_positions]
+        available_mask = ~np.isin(movie_ids_array[pool_positions], selected_ids)
+        filler_positions = select_top_positions(
+            pool_positions[available_mask],
+            quality_scores[available_mask],
+            limit - len(selected_ids),
+        )
+        selected_ids.extend(movie_ids_array[filler_positions].tolist())
 
-# --- 7. RECOMMANDATIONS ---
+    selected_ids = selected_ids[:limit]
+    poster_urls_by_movie_id = fetch_posters_from_tmdb(selected_ids)
+    now_playing_ids = get_cached_now_playing_ids()
+    return [
+        build_feed_movie_payload(
+            movies_df.iloc[position],
+            poster_urls_by_movie_id=poster_urls_by_movie_id,
+            now_playing_ids=now_playing_ids,
+            positive_indices=[],
+            positive_signal_weights={},
+            positive_similarity_scores=np.zeros(0),
+            onboarding_genre_tokens=onboarding_genre_tokens,
+            genre_profile=set(onboarding_genre_tokens),
+            mode=mode,
+            is_test_ai_experiment=is_test_ai_experiment,
+        )
+        for position in get_catalog_positions(selected_ids)
+    ]
+
+
+@timed_stage("feed.compute")
 def compute_recommendation_feed(
     current_user_id: int,
     limit: int = 10,
     exclude_ids: Optional[str] = None,
     mode: str = "core",
+    feed_context: Optional[dict[str, Any]] = None,
 ):
     normalized_mode = mode.strip().lower() if isinstance(mode, str) else "core"
     if normalized_mode == "core":
@@ -6097,103 +8398,22 @@ def compute_recommendation_feed(
     is_spotlight_mode = normalized_mode == "spotlight"
     is_explore_mode = normalized_mode == "explore"
 
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    watch_later_id = get_or_create_watch_later_id(cursor, current_user_id)
-    conn.commit()
-
-    preferences = get_user_preferences(cursor, current_user_id)
-
-    cursor.execute(
-        f"SELECT movie_id, rating FROM user_ratings WHERE user_id = {SQL_PARAM} ORDER BY added_at DESC",
-        (current_user_id,),
-    )
-    rating_rows = [(int(row[0]), float(row[1])) for row in cursor.fetchall()]
-    rated_ids = {movie_id for movie_id, _ in rating_rows}
-    disliked_ids = [movie_id for movie_id, rating in rating_rows if rating <= 2.5][:12]
-
-    cursor.execute(
-        f"SELECT movie_id FROM playlist_items WHERE playlist_id = {SQL_PARAM}",
-        (watch_later_id,),
-    )
-    watch_later_ids = {int(row[0]) for row in cursor.fetchall()}
-
-    cursor.execute(
-        """
-        SELECT movie_id, reaction_type, responded_at, shown_at
-        FROM recommendation_impressions
-        WHERE user_id = {param}
-          AND mode = 'tinder'
-        ORDER BY COALESCE(responded_at, shown_at) DESC
-        LIMIT 500
-        """.format(param=SQL_PARAM),
-        (current_user_id,),
-    )
-    latest_reaction_by_movie: dict[int, tuple[str, str, str]] = {}
-    for row in cursor.fetchall():
-        movie_id = int(row[0])
-        if movie_id in latest_reaction_by_movie:
-            continue
-        latest_reaction_by_movie[movie_id] = (
-            str(row[1] or ""),
-            str(row[2] or ""),
-            str(row[3] or ""),
+    if feed_context is None:
+        feed_context = load_recommendation_feed_context(
+            current_user_id,
+            include_collaborative=not is_tinder_mode,
         )
-    passed_ids = {
-        movie_id
-        for movie_id, (reaction_type, _, _) in latest_reaction_by_movie.items()
-        if reaction_type in PASS_REACTION_TYPES
-    }
-    pass_cooldown_cutoff = datetime.datetime.utcnow() - datetime.timedelta(
-        days=PASS_RECONSIDER_COOLDOWN_DAYS
-    )
-    def parse_reaction_datetime(raw_value: str):
-        if not raw_value:
-            return None
-        normalized_value = raw_value.strip().replace("Z", "+00:00")
-        if " " in normalized_value and "T" not in normalized_value:
-            normalized_value = normalized_value.replace(" ", "T", 1)
-        try:
-            parsed_value = datetime.datetime.fromisoformat(normalized_value)
-        except ValueError:
-            return None
-        if parsed_value.tzinfo is not None:
-            parsed_value = parsed_value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
-        return parsed_value
-
-    tinder_history_blocked_ids = set()
-    for movie_id, (reaction_type, responded_at, _shown_at) in latest_reaction_by_movie.items():
-        if reaction_type in PASS_REACTION_TYPES:
-            responded_at_datetime = parse_reaction_datetime(responded_at)
-            if responded_at_datetime is not None and responded_at_datetime < pass_cooldown_cutoff:
-                continue
-        tinder_history_blocked_ids.add(movie_id)
-
-    cursor.execute(
-        f"SELECT movie_id FROM playlist_items WHERE playlist_id = {SQL_PARAM} ORDER BY COALESCE(sort_index, 999999), added_at DESC LIMIT 12",
-        (watch_later_id,),
-    )
-    recent_watch_later_ids = [int(row[0]) for row in cursor.fetchall()]
-    is_test_ai_experiment = is_recommendation_ai_enabled_user(cursor, current_user_id)
-    test_feedback_profile = (
-        get_test_ai_feedback_profile(cursor, current_user_id)
-        if is_test_ai_experiment
-        else {
-            "genre_biases": {},
-            "keyword_biases": {},
-            "positive_count": 0,
-            "negative_count": 0,
-            "total_feedback_count": 0,
-        }
-    )
-
-    collaborative_scores = build_collaborative_candidate_scores(
-        cursor,
-        current_user_id,
-        rated_ids | watch_later_ids | tinder_history_blocked_ids,
-    ) if not is_tinder_mode else {}
-    conn.close()
+    is_test_ai_experiment = feed_context["is_test_ai_experiment"]
+    preferences = feed_context["preferences"]
+    rating_rows = feed_context["rating_rows"]
+    rated_ids = feed_context["rated_ids"]
+    disliked_ids = feed_context["disliked_ids"]
+    watch_later_ids = feed_context["watch_later_ids"]
+    passed_ids = feed_context["passed_ids"]
+    tinder_history_blocked_ids = feed_context["tinder_history_blocked_ids"]
+    recent_watch_later_ids = feed_context["recent_watch_later_ids"]
+    test_feedback_profile = feed_context["test_feedback_profile"]
+    collaborative_scores = feed_context["collaborative_scores"] if not is_tinder_mode else {}
 
     onboarding_movie_ids = preferences["favorite_movie_ids"]
     people_seed_movie_ids = preferences["people_seed_movie_ids"]
@@ -6215,8 +8435,6 @@ def compute_recommendation_feed(
     if movies_df.empty:
         return []
 
-    now_playing_ids = {int(movie["id"]) for movie in fetch_now_playing_movies(limit=60)}
-
     positive_signal_weights: dict[int, float] = {}
     negative_signal_weights: dict[int, float] = {}
 
@@ -6276,6 +8494,30 @@ def compute_recommendation_feed(
             people_seed_weight,
         )
 
+    # Pure genre onboarding: the ranking only depends on the onboarding genres and catalog
+    # quality, so it is served from the precomputed pools. Onboarding movie picks count as
+    # positive signal and deliberately keep the full pass (similarity and related expansion).
+    if (
+        cold_start_mode
+        and not is_explore_mode
+        and not positive_signal_weights
+        and not negative_signal_weights
+        and not disliked_ids
+        and not collaborative_scores
+        and not passed_ids
+        and not test_feedback_profile.get("genre_biases")
+        and not test_feedback_profile.get("keyword_biases")
+    ):
+        return compute_cold_start_pool_feed(
+            limit=limit,
+            mode="tinder" if is_tinder_mode else "spotlight",
+            is_test_ai_experiment=is_test_ai_experiment,
+            interaction_count=interaction_count,
+            onboarding_genre_tokens=onboarding_genre_tokens,
+            blocked_ids=blocked_ids,
+        )
+
+    now_playing_ids = {int(movie["id"]) for movie in fetch_now_playing_movies(limit=60)}
     positive_signal_ids = [
         movie_id
         for movie_id, _ in sorted(
@@ -6284,7 +8526,6 @@ def compute_recommendation_feed(
             reverse=True,
         )
     ][:18]
-    candidate_scores: dict[int, float] = {}
     genre_profile: set[str] = set(onboarding_genre_tokens)
     genre_affinity_map: dict[str, float] = defaultdict(float)
     keyword_affinity_map: dict[str, float] = defaultdict(float)
@@ -6298,29 +8539,27 @@ def compute_recommendation_feed(
         movie_index = movie_index_by_id.get(int(movie_id))
         if movie_index is None:
             continue
-        row = movies_df.iloc[movie_index]
         positive_indices.append(movie_index)
         positive_vector_weights.append(float(weight))
-        for token in row["genre_tokens"]:
+        for token in get_movie_genre_tokens(movie_index):
             genre_profile.add(token)
             genre_affinity_map[token] += float(weight) * 1.15
         keyword_limit = 16 if is_test_ai_experiment else 10
         keyword_weight = 1.10 if is_test_ai_experiment else 0.85
-        for token in row["keyword_tokens"][:keyword_limit]:
+        for token in get_movie_keyword_tokens(movie_index, keyword_limit):
             keyword_affinity_map[token] += float(weight) * keyword_weight
 
     for movie_id, weight in negative_signal_weights.items():
         movie_index = movie_index_by_id.get(int(movie_id))
         if movie_index is None:
             continue
-        row = movies_df.iloc[movie_index]
         negative_indices.append(movie_index)
         negative_vector_weights.append(abs(float(weight)))
-        for token in row["genre_tokens"]:
+        for token in get_movie_genre_tokens(movie_index):
             genre_affinity_map[token] += float(weight) * 0.95
         keyword_limit = 14 if is_test_ai_experiment else 10
         keyword_weight = 0.92 if is_test_ai_experiment else 0.75
-        for token in row["keyword_tokens"][:keyword_limit]:
+        for token in get_movie_keyword_tokens(movie_index, keyword_limit):
             keyword_affinity_map[token] += float(weight) * keyword_weight
 
     if is_test_ai_experiment:
@@ -6341,7 +8580,7 @@ def compute_recommendation_feed(
 
     if vectors is not None and positive_indices:
         try:
-            positive_sim_matrix = cosine_similarity(vectors, vectors[positive_indices])
+            positive_sim_matrix = get_feed_similarity_matrix(feed_context, positive_indices)
             positive_max_share = 0.35 if is_test_ai_experiment else 0.45
             positive_similarity_scores = (
                 (np.max(positive_sim_matrix, axis=1) * positive_max_share)
@@ -6359,7 +8598,7 @@ def compute_recommendation_feed(
 
     if vectors is not None and negative_indices:
         try:
-            negative_sim_matrix = cosine_similarity(vectors, vectors[negative_indices])
+            negative_sim_matrix = get_feed_similarity_matrix(feed_context, negative_indices)
             negative_max_share = 0.58 if is_test_ai_experiment else 0.45
             negative_similarity_scores = (
                 (np.max(negative_sim_matrix, axis=1) * negative_max_share)
@@ -6375,127 +8614,85 @@ def compute_recommendation_feed(
         except Exception as e:
             print(f"Erreur IA (profil negatif): {e}")
 
-    def compute_token_affinity_scores(column_name: str, affinity_map: dict[str, float]) -> np.ndarray:
-        if not affinity_map:
-            return np.zeros(len(movies_df))
-
-        raw_scores = []
-        for tokens in movies_df[column_name]:
-            if not tokens:
-                raw_scores.append(0.0)
-                continue
-            token_score = sum(affinity_map.get(token, 0.0) for token in tokens) / max(len(tokens), 1)
-            raw_scores.append(squash_affinity(token_score))
-        return np.array(raw_scores)
-
-    genre_affinity_scores = compute_token_affinity_scores("genre_tokens", genre_affinity_map)
-    keyword_affinity_scores = compute_token_affinity_scores("keyword_tokens", keyword_affinity_map)
+    genre_affinity_scores = compute_token_affinity_scores(
+        genre_token_matrix,
+        genre_token_counts,
+        genre_token_index,
+        genre_affinity_map,
+    )
+    keyword_affinity_scores = compute_token_affinity_scores(
+        keyword_token_matrix,
+        keyword_token_counts,
+        keyword_token_index,
+        keyword_affinity_map,
+    )
     quality_scores = movies_df["quality_score"].to_numpy()
     audience_rating_scores = movies_df["audience_rating_score"].to_numpy()
-    audience_rating_boost_scores = np.clip((audience_rating_scores - 0.62) / 0.11, 0.0, 1.0)
-    audience_rating_penalty_scores = np.clip((0.60 - audience_rating_scores) / 0.08, 0.0, 1.0)
-
-    social_scores = np.array(
-        [
-            min(
-                1.0,
-                np.tanh(
-                    collaborative_scores.get(int(movie_id), 0.0) * 0.22
-                ),
-            )
-            for movie_id in movie_ids_array
-        ]
-    )
 
-    if is_test_ai_experiment:
-        positive_similarity_weight = 0.56 if is_tinder_mode else 0.42
-        negative_similarity_weight = 0.44 if is_tinder_mode else 0.30
-        genre_affinity_weight = 0.14 if is_tinder_mode else 0.14
-        keyword_affinity_weight = 0.26 if is_tinder_mode else 0.20
-        audience_rating_weight = 0.35 if is_tinder_mode else 0.13
-        audience_boost_weight = 0.48 if is_tinder_mode else 0.12
-        audience_penalty_weight = 0.34 if is_tinder_mode else 0.10
-        quality_weight = 0.08 if is_tinder_mode else 0.11
-        social_weight = 0.0 if is_tinder_mode else 0.01
-    else:
-        positive_similarity_weight = 0.46 if is_tinder_mode else 0.34
-        negative_similarity_weight = 0.35 if is_tinder_mode else 0.22
-        genre_affinity_weight = 0.17 if is_tinder_mode else 0.15
-        keyword_affinity_weight = 0.18 if is_tinder_mode else 0.16
-        audience_rating_weight = 0.26 if is_tinder_mode else 0.08
-        audience_boost_weight = 0.34 if is_tinder_mode else 0.06
-        audience_penalty_weight = 0.20 if is_tinder_mode else 0.03
-        quality_weight = 0.03 if is_tinder_mode else 0.09
-        social_weight = 0.0 if is_tinder_mode else (0.02 if interaction_count >= 8 else 0.04)
+    collaborative_score_vector = np.zeros(len(movies_df))
+    collaborative_catalog_entries = [
+        (movie_index_by_id[int(movie_id)], float(score))
+        for movie_id, score in collaborative_scores.items()
+        if int(movie_id) in movie_index_by_id
+    ]
+    if collaborative_catalog_entries:
+        collaborative_indices, collaborative_values = zip(*collaborative_catalog_entries)
+        collaborative_score_vector[list(collaborative_indices)] = collaborative_values
+    social_scores = np.minimum(np.tanh(collaborative_score_vector * 0.22), 1.0)
 
-    hybrid_scores = (
-        (positive_similarity_scores * positive_similarity_weight)
-        - (negative_similarity_scores * negative_similarity_weight)
-        + (genre_affinity_scores * genre_affinity_weight)
-        + (keyword_affinity_scores * keyword_affinity_weight)
-        + (audience_rating_scores * audience_rating_weight)
-        + (audience_rating_boost_scores * audience_boost_weight)
-        - (audience_rating_penalty_scores * audience_penalty_weight)
-        + (quality_scores * quality_weight)
-        + (social_scores * social_weight)
+    hybrid_scores = compute_feed_hybrid_scores(
+        None,
+        is_test_ai_experiment=is_test_ai_experiment,
+        is_tinder_mode=is_tinder_mode,
+        interaction_count=interaction_count,
+        genre_affinity_scores=genre_affinity_scores,
+        keyword_affinity_scores=keyword_affinity_scores,
+        positive_similarity_scores=positive_similarity_scores,
+        negative_similarity_scores=negative_similarity_scores,
+        social_scores=social_scores,
+        has_positive_signal=bool(positive_signal_ids),
+        cold_start_genre_tokens=onboarding_genre_tokens if cold_start_mode else None,
     )
 
-    if is_test_ai_experiment:
-        vote_average_values = movies_df["vote_average"].to_numpy(dtype=float)
-        vote_count_values = movies_df["vote_count"].to_numpy(dtype=float)
-        vote_confidence_scores = np.clip(
-            np.log1p(vote_count_values) / np.log1p(max(float(vote_count_values.max()), 1.0)),
-            0.0,
-            1.0,
-        )
-        public_excellence_scores = (
-            np.clip((vote_average_values - 6.8) / 1.25, 0.0, 1.0)
-            * vote_confidence_scores
-        )
-        public_weakness_scores = (
-            np.clip((6.15 - vote_average_values) / 1.05, 0.0, 1.0)
-            * (0.55 + (vote_confidence_scores * 0.45))
-        )
-        hybrid_scores = hybrid_scores + (
-            public_excellence_scores * (0.24 if is_tinder_mode else 0.12)
-        ) - (
-            public_weakness_scores * (0.36 if is_tinder_mode else 0.16)
-        )
-        if positive_signal_ids:
-            hybrid_scores = hybrid_scores + (
-                positive_similarity_scores
-                * audience_rating_scores
-                * (0.12 if is_tinder_mode else 0.06)
-            )
-
-    if cold_start_mode and onboarding_genre_tokens:
-        cold_start_overlap_scores = np.array(
-            [
-                len(set(tokens) & onboarding_genre_tokens) / max(len(onboarding_genre_tokens), 1)
-                for tokens in movies_df["genre_tokens"]
-            ]
-        )
-        overlap_weight = 0.34 if is_test_ai_experiment else 0.24
-        quality_cold_weight = 0.12 if is_test_ai_experiment else 0.08
-        hybrid_scores = hybrid_scores + (
-            (cold_start_overlap_scores * overlap_weight)
-            + (quality_scores * quality_cold_weight)
-        )
-
     if passed_ids:
         passed_penalty = 0.14 if is_tinder_mode else 0.07
         passed_index_penalties = movies_df["id"].isin(passed_ids).to_numpy(dtype=float)
         hybrid_scores = hybrid_scores - (passed_index_penalties * passed_penalty)
 
-    for idx, movie_id in enumerate(movie_ids_array):
-        movie_id = int(movie_id)
-        if movie_id in blocked_ids:
-            continue
-        candidate_scores[movie_id] = float(hybrid_scores[idx])
+    # Catalog candidates live in a dense score vector; only TMDB-related titles
+    # missing from the catalog go through the extra dict.
+    candidate_mask = ~movies_df["id"].isin(blocked_ids).to_numpy()
+    # Low-signal users that only rated titles at a neutral weight: same pool restriction,
+    # but the related-title penalties still need the full pass.
+    if (
+        cold_start_mode
+        and not is_explore_mode
+        and not positive_signal_weights
+        and not negative_signal_weights
+        and not collaborative_scores
+        and not passed_ids
+        and not test_feedback_profile.get("genre_biases")
+        and not test_feedback_profile.get("keyword_biases")
+    ):
+        cold_start_pool_mask = np.zeros(len(movies_df), dtype=bool)
+        cold_start_pool_mask[get_cold_start_pool_positions(onboarding_genre_tokens)] = True
+        candidate_mask &= cold_start_pool_mask
+    candidate_score_vector = np.array(hybrid_scores, dtype=float)
+    extra_candidate_scores: dict[int, float] = {}
+
+    def add_candidate_score(movie_id: int, score: float) -> None:
+        movie_index = movie_index_by_id.get(int(movie_id))
+        if movie_index is None:
+            extra_candidate_scores[movie_id] = extra_candidate_scores.get(movie_id, 0.0) + score
+        else:
+            candidate_score_vector[movie_index] += score
 
     seed_related_limit = 7 if is_test_ai_experiment else 5
+    related_ids_by_seed = get_tmdb_related_movie_ids_batch(
+        positive_signal_ids[:seed_related_limit] + list(disliked_ids[:4])
+    )
     for seed_rank, seed_id in enumerate(positive_signal_ids[:seed_related_limit]):
-        related_ids = get_tmdb_related_movie_ids(seed_id)
+        related_ids = related_ids_by_seed[int(seed_id)]
         seed_strength = positive_signal_weights.get(seed_id, 1.0)
         for rank, related_id in enumerate(related_ids):
             if related_id in blocked_ids:
@@ -6503,8 +8700,7 @@ def compute_recommendation_feed(
             related_index = movie_index_by_id.get(int(related_id))
             related_quality_bonus = 0.0
             if is_test_ai_experiment and related_index is not None:
-                related_row = movies_df.iloc[related_index]
-                related_audience_score = float(related_row.get("audience_rating_score") or 0.0)
+                related_audience_score = float(audience_rating_scores[related_index])
                 if related_audience_score < 0.54:
                     continue
                 related_quality_bonus = min(max((related_audience_score - 0.62) * 2.2, 0.0), 0.35)
@@ -6513,31 +8709,61 @@ def compute_recommendation_feed(
             else:
                 base_seed_score = (2.90 if is_tinder_mode else 2.95) + min(seed_strength * (0.28 if is_tinder_mode else 0.42), 0.92 if is_tinder_mode else 1.25)
             score = base_seed_score - (rank * 0.08) - (seed_rank * 0.18)
-            candidate_scores[related_id] = candidate_scores.get(related_id, 0.0) + max(score + related_quality_bonus, 0.2)
+            add_candidate_score(related_id, max(score + related_quality_bonus, 0.2))
 
     for seed_rank, seed_id in enumerate(disliked_ids[:4]):
-        related_ids = get_tmdb_related_movie_ids(seed_id)
+        related_ids = related_ids_by_seed[int(seed_id)]
         seed_penalty_strength = abs(negative_signal_weights.get(seed_id, -1.0))
         for rank, related_id in enumerate(related_ids):
             if related_id in blocked_ids:
                 continue
             penalty = (1.35 if is_tinder_mode else 1.15) + min(seed_penalty_strength * 0.20, 0.45)
             penalty = penalty - (rank * 0.05) - (seed_rank * 0.12)
-            candidate_scores[related_id] = candidate_scores.get(related_id, 0.0) - max(penalty, 0.10)
+            add_candidate_score(related_id, -max(penalty, 0.10))
 
+    collaborative_cap = 0.85 if is_spotlight_mode else 0.35
+    candidate_score_vector = candidate_score_vector + np.where(
+        candidate_mask,
+        np.minimum(collaborative_score_vector, collaborative_cap),
+        0.0,
+    )
     for movie_id, score in collaborative_scores.items():
-        if movie_id in blocked_ids:
+        if movie_id in blocked_ids or int(movie_id) in movie_index_by_id:
             continue
-        candidate_scores[movie_id] = candidate_scores.get(movie_id, 0.0) + min(score, 0.85 if is_spotlight_mode else 0.35)
+        add_candidate_score(movie_id, min(score, collaborative_cap))
 
-    ranked_candidate_ids = [
-        movie_id
-        for movie_id, _ in sorted(candidate_scores.items(), key=lambda item: item[1], reverse=True)
-        if movie_id not in blocked_ids
-    ]
-    seed_context_by_movie_id: dict[int, dict[str, object]] = {}
+    candidate_indices = np.flatnonzero(candidate_mask)
+    ranked_pool_ids = np.concatenate(
+        [
+            movie_ids_array[candidate_indices],
+            np.array(list(extra_candidate_scores.keys()), dtype=movie_ids_array.dtype),
+        ]
+    )
+    ranked_pool_scores = np.concatenate(
+        [
+            candidate_score_vector[candidate_indices],
+            np.array(list(extra_candidate_scores.values()), dtype=float),
+        ]
+    )
+    ranked_candidate_ids = ranked_pool_ids[np.argsort(-ranked_pool_scores, kind="stable")].tolist()
+    seed_context_positions = np.full(len(movies_df), -1, dtype=np.int64)
+    seed_context_similarities = np.zeros(len(movies_df))
+    seed_context_cluster_scores = np.zeros(len(movies_df))
+    seed_context_seeds: list[tuple[int, str]] = []
     poster_urls_by_movie_id: dict[int, str] = {}
 
+    def get_seed_context(movie_id: int) -> dict[str, object]:
+        movie_index = movie_index_by_id.get(int(movie_id))
+        if movie_index is None or seed_context_positions[movie_index] < 0:
+            return {}
+        seed_movie_id, seed_title = seed_context_seeds[int(seed_context_positions[movie_index])]
+        return {
+            "seed_movie_id": seed_movie_id,
+            "seed_title": seed_title,
+            "seed_similarity": round(float(seed_context_similarities[movie_index]), 4),
+            "cluster_score": float(seed_context_cluster_scores[movie_index]),
+        }
+
     def build_seed_cluster_ranked_ids(seed_ids: list[int], max_seed_count: int = 8) -> list[int]:
         if not is_test_ai_experiment or vectors is None or not seed_ids:
             return []
@@ -6548,64 +8774,57 @@ def compute_recommendation_feed(
             if seed_index is None:
                 continue
 
-            seed_row = movies_df.iloc[seed_index]
-            seed_title = str(seed_row.get("title") or "")
-            seed_genres = set(seed_row.get("genre_tokens") or [])
-            seed_keywords = set((seed_row.get("keyword_tokens") or [])[:18])
+            seed_title = str(movies_df.iloc[seed_index].get("title") or "")
+            seed_genre_ids = np.unique(genre_token_ids[genre_token_indptr[seed_index]:genre_token_indptr[seed_index + 1]])
+            seed_keyword_start = int(keyword_token_indptr[seed_index])
+            seed_keyword_stop = min(int(keyword_token_indptr[seed_index + 1]), seed_keyword_start + SEED_CLUSTER_KEYWORD_LIMIT)
+            seed_keyword_ids = np.unique(keyword_token_ids[seed_keyword_start:seed_keyword_stop])
             try:
-                seed_similarity_scores = cosine_similarity(
-                    vectors,
-                    vectors[seed_index].reshape(1, -1),
-                ).ravel()
+                seed_similarity_scores = get_feed_similarity_matrix(feed_context, [seed_index]).ravel()
             except Exception:
                 continue
 
-            lane_scores: list[tuple[int, float]] = []
             seed_weight = float(positive_signal_weights.get(int(seed_id), 1.0))
-            for movie_id, base_score in candidate_scores.items():
-                movie_id = int(movie_id)
-                if movie_id in blocked_ids:
-                    continue
-                movie_index = movie_index_by_id.get(movie_id)
-                if movie_index is None:
-                    continue
-
-                row = movies_df.iloc[movie_index]
-                audience_score = float(row.get("audience_rating_score") or 0.0)
-                if audience_score < 0.53:
-                    continue
-
-                movie_genres = set(row.get("genre_tokens") or [])
-                movie_keywords = set((row.get("keyword_tokens") or [])[:18])
-                genre_overlap = len(movie_genres & seed_genres) / max(len(seed_genres), 1)
-                keyword_overlap = len(movie_keywords & seed_keywords) / max(len(seed_keywords), 1)
-                seed_similarity = float(seed_similarity_scores[movie_index])
-
-                if seed_similarity < 0.11 and keyword_overlap < 0.08 and genre_overlap < 0.34:
-                    continue
-
-                cluster_score = (
-                    (seed_similarity * 1.55)
-                    + (keyword_overlap * 0.58)
-                    + (genre_overlap * 0.32)
-                    + (audience_score * 0.44)
-                    + (float(row.get("quality_score") or 0.0) * 0.28)
-                    + (float(base_score) * 0.18)
-                    + min(seed_weight * 0.07, 0.24)
-                    - (seed_rank * 0.035)
+            genre_overlap_scores = compute_token_overlap_scores(
+                genre_token_presence_matrix,
+                seed_genre_ids,
+                max(len(seed_genre_ids), 1),
+            )
+            keyword_overlap_scores = compute_token_overlap_scores(
+                keyword_lead_token_presence_matrix,
+                seed_keyword_ids,
+                max(len(seed_keyword_ids), 1),
+            )
+            lane_mask = (
+                candidate_mask
+                & ~(audience_rating_scores < 0.53)
+                & ~(
+                    (seed_similarity_scores < 0.11)
+                    & (keyword_overlap_scores < 0.08)
+                    & (genre_overlap_scores < 0.34)
                 )
-                current_context = seed_context_by_movie_id.get(movie_id)
-                if not current_context or cluster_score > float(current_context.get("cluster_score") or 0.0):
-                    seed_context_by_movie_id[movie_id] = {
-                        "seed_movie_id": int(seed_id),
-                        "seed_title": seed_title,
-                        "seed_similarity": round(seed_similarity, 4),
-                        "cluster_score": float(cluster_score),
-                    }
-                lane_scores.append((movie_id, cluster_score))
+            )
+            cluster_scores = (
+                (seed_similarity_scores * 1.55)
+                + (keyword_overlap_scores * 0.58)
+                + (genre_overlap_scores * 0.32)
+                + (audience_rating_scores * 0.44)
+                + (quality_scores * 0.28)
+                + (candidate_score_vector * 0.18)
+                + min(seed_weight * 0.07, 0.24)
+                - (seed_rank * 0.035)
+            )
+            context_update_mask = lane_mask & (
+                (seed_context_positions < 0) | (cluster_scores > seed_context_cluster_scores)
+            )
+            seed_context_positions[context_update_mask] = len(seed_context_seeds)
+            seed_context_similarities[context_update_mask] = seed_similarity_scores[context_update_mask]
+            seed_context_cluster_scores[context_update_mask] = cluster_scores[context_update_mask]
+            seed_context_seeds.append((int(seed_id), seed_title))
 
-            lane_scores.sort(key=lambda item: item[1], reverse=True)
-            seed_rankings.append([movie_id for movie_id, _ in lane_scores[:80]])
+            lane_indices = np.flatnonzero(lane_mask)
+            lane_order = np.argsort(-cluster_scores[lane_indices], kind="stable")[:80]
+            seed_rankings.append(movie_ids_array[lane_indices[lane_order]].tolist())
 
         clustered_ids: list[int] = []
         seen_cluster_ids: set[int] = set()
@@ -6633,80 +8852,48 @@ def compute_recommendation_feed(
             ]
 
     def build_recommendation_payload(row, reason_mode: str) -> dict:
-        movie_id = int(row["id"])
-        seed_context = seed_context_by_movie_id.get(movie_id, {})
-        payload = {
-            "id": movie_id,
-            "title": str(row["title"]),
-            "poster_url": poster_urls_by_movie_id.get(movie_id) or fetch_poster_from_tmdb(movie_id),
-            "rating": float(row["vote_average"]),
-            "is_now_playing": movie_id in now_playing_ids,
-            "recommendation_reason": build_recommendation_reason(
-                movie_id=movie_id,
-                positive_indices=positive_indices,
-                positive_signal_weights=positive_signal_weights,
-                positive_similarity_scores=positive_similarity_scores,
-                onboarding_genre_tokens=onboarding_genre_tokens,
-                genre_profile=genre_profile,
-                mode=reason_mode,
-                seed_context=seed_context,
-                is_test_experiment=is_test_ai_experiment,
-            ),
-        }
-        if is_test_ai_experiment:
-            payload.update(
-                {
-                    "recommendation_variant": TEST_AI_ALGORITHM_VARIANT,
-                    "recommendation_seed_movie_id": seed_context.get("seed_movie_id") if seed_context else None,
-                    "recommendation_seed_title": seed_context.get("seed_title") if seed_context else None,
-                    "recommendation_similarity": seed_context.get("seed_similarity") if seed_context else None,
-                }
-            )
-        return payload
+        return build_feed_movie_payload(
+            row,
+            poster_urls_by_movie_id=poster_urls_by_movie_id,
+            now_playing_ids=now_playing_ids,
+            positive_indices=positive_indices,
+            positive_signal_weights=positive_signal_weights,
+            positive_similarity_scores=positive_similarity_scores,
+            onboarding_genre_tokens=onboarding_genre_tokens,
+            genre_profile=genre_profile,
+            mode=reason_mode,
+            is_test_ai_experiment=is_test_ai_experiment,
+            seed_context=get_seed_context(int(row["id"])),
+        )
 
     if is_explore_mode:
-        exploration_pool = movies_df[(~movies_df["id"].isin(blocked_ids))].copy()
-        if exploration_pool.empty:
+        exploration_positions = np.flatnonzero(candidate_mask)
+        if len(exploration_positions) == 0:
             return []
 
-        ranked_bonus = {
-            movie_id: max(0.0, 1.0 - (rank / 120.0))
-            for rank, movie_id in enumerate(ranked_candidate_ids[:120])
-        }
-        genre_distance_scores = np.array(
-            [
-                1.0 - (len(set(tokens) & genre_profile) / max(len(genre_profile), 1))
-                if genre_profile
-                else 1.0
-                for tokens in exploration_pool["genre_tokens"]
-            ]
+        ranked_bonus_scores = np.zeros(len(movies_df))
+        for rank, movie_id in enumerate(ranked_candidate_ids[:120]):
+            movie_index = movie_index_by_id.get(int(movie_id))
+            if movie_index is not None:
+                ranked_bonus_scores[movie_index] = max(0.0, 1.0 - (rank / 120.0))
+        genre_distance_scores = 1.0 - compute_genre_overlap_scores(genre_profile)
+        exploration_scores = (
+            (ranked_bonus_scores * 0.32)
+            + (genre_distance_scores * 0.26)
+            + (quality_scores * 0.24)
+            + (collaborative_score_vector * 0.03)
+            + (positive_similarity_scores * (0.08 if positive_signal_ids else 0.0))
         )
-        exploration_pool["exploration_score"] = [
-            (ranked_bonus.get(int(row["id"]), 0.0) * 0.32)
-            + (genre_distance_scores[idx] * 0.26)
-            + (float(row["quality_score"]) * 0.24)
-            + (collaborative_scores.get(int(row["id"]), 0.0) * 0.03)
-            + (
-                positive_similarity_scores[movie_index_by_id[int(row["id"])]]
-                * (0.08 if positive_signal_ids else 0.0)
-            )
-            for idx, (_, row) in enumerate(exploration_pool.iterrows())
-        ]
-        exploration_pool = exploration_pool.sort_values("exploration_score", ascending=False)
-        shortlisted_ids = [
-            int(row["id"])
-            for _, row in exploration_pool.head(max(limit * 8, 40)).iterrows()
-        ]
-        selected_ids = pick_diverse_movie_ids(shortlisted_ids, limit, per_genre_cap=2)
-        selected_rows = movies_df[movies_df["id"].isin(selected_ids)].copy()
-        selected_rows["selection_rank"] = selected_rows["id"].apply(
-            lambda movie_id: selected_ids.index(int(movie_id))
+        shortlisted_positions = select_top_positions(
+            exploration_positions,
+            exploration_scores[exploration_positions],
+            max(limit * 8, 40),
         )
-        selected_rows = selected_rows.sort_values("selection_rank")
+        selected_ids = pick_diverse_movie_ids(movie_ids_array[shortlisted_positions].tolist(), limit, per_genre_cap=2)
         poster_urls_by_movie_id.update(fetch_posters_from_tmdb(selected_ids[:limit]))
         return [
-            build_recommendation_payload(row, "explore")
-            for _, row in selected_rows.iterrows()
+            build_recommendation_payload(movies_df.iloc[position], "explore")
+            for position in get_catalog_positions(selected_ids)
         ]
 
     if is_test_ai_experiment:
@@ -6719,79 +8906,98 @@ def compute_recommendation_feed(
     main_slots = max(limit - exploration_slots, 0)
     main_per_genre_cap = 2 if is_test_ai_experiment and is_tinder_mode else 3
     selected_ids = pick_diverse_movie_ids(ranked_candidate_ids, main_slots, per_genre_cap=main_per_genre_cap)
-    used_ids = blocked_ids | set(selected_ids)
+    available_mask = candidate_mask.copy()
+    available_mask[get_catalog_positions(selected_ids)] = False
 
     if len(selected_ids) < main_slots:
-        filler_pool = movies_df[(~movies_df["id"].isin(used_ids))]
-        filler_pool = filler_pool.sort_values("quality_score", ascending=False)
-        selected_ids.extend([int(row["id"]) for _, row in filler_pool.head(main_slots - len(selected_ids)).iterrows()])
-        used_ids = blocked_ids | set(selected_ids)
+        filler_positions = select_top_positions(
+            np.flatnonzero(available_mask),
+            quality_scores[available_mask],
+            main_slots - len(selected_ids),
+        )
+        selected_ids.extend(movie_ids_array[filler_positions].tolist())
+        available_mask[filler_positions] = False
 
     if exploration_slots > 0:
-        exploration_pool = movies_df[(~movies_df["id"].isin(used_ids))].copy()
-        if not exploration_pool.empty:
-            max_popularity = max(float(exploration_pool["popularity"].max()), 1.0)
-            genre_distance_scores = np.array(
-                [
-                    1.0 - (len(set(tokens) & genre_profile) / max(len(genre_profile), 1))
-                    if genre_profile
-                    else 1.0
-                    for tokens in exploration_pool["genre_tokens"]
-                ]
-            )
+        exploration_positions = np.flatnonzero(available_mask)
+        if len(exploration_positions) > 0:
+            popularity_values = movies_df["popularity"].to_numpy(dtype=float)[exploration_positions]
+            max_popularity = max(float(popularity_values.max()), 1.0)
+            genre_distance_scores = 1.0 - compute_genre_overlap_scores(genre_profile)[exploration_positions]
             if is_test_ai_experiment:
-                exploration_similarity_scores = np.array(
-                    [
-                        positive_similarity_scores[movie_index_by_id[int(movie_id)]]
-                        if int(movie_id) in movie_index_by_id
-                        else 0.0
-                        for movie_id in exploration_pool["id"]
-                    ]
-                )
-                exploration_pool["exploration_score"] = (
-                    (exploration_pool["audience_rating_score"] * 0.36)
-                    + (exploration_pool["quality_score"] * 0.24)
+                exploration_scores = (
+                    (audience_rating_scores[exploration_positions] * 0.36)
+                    + (quality_scores[exploration_positions] * 0.24)
                     + (genre_distance_scores * 0.25)
-                    + (exploration_similarity_scores * 0.12)
-                    + ((exploration_pool["popularity"] / max_popularity) * 0.03)
+                    + (positive_similarity_scores[exploration_positions] * 0.12)
+                    + ((popularity_values / max_popularity) * 0.03)
                 )
-                exploration_shortlist = exploration_pool.sort_values("exploration_score", ascending=False).head(max(exploration_slots * 18, 36))
-                selected_ids.extend([int(row["id"]) for _, row in exploration_shortlist.head(exploration_slots).iterrows()])
+                exploration_picks = select_top_positions(exploration_positions, exploration_scores, exploration_slots)
             else:
-                exploration_pool["exploration_score"] = (
-                    (exploration_pool["vote_average"] / 10.0) * 0.55
-                    + (exploration_pool["popularity"] / max_popularity) * 0.15
+                vote_average_values = movies_df["vote_average"].to_numpy(dtype=float)[exploration_positions]
+                exploration_scores = (
+                    (vote_average_values / 10.0) * 0.55
+                    + (popularity_values / max_popularity) * 0.15
                     + (genre_distance_scores * 0.30)
                 )
-                exploration_shortlist = exploration_pool.sort_values("exploration_score", ascending=False).head(max(exploration_slots * 20, 40))
-                selected_ids.extend(
-                    [
-                        int(row["id"])
-                        for _, row in exploration_shortlist.sample(
-                            n=min(exploration_slots, len(exploration_shortlist))
-                        ).iterrows()
-                    ]
+                exploration_shortlist = select_top_positions(
+                    exploration_positions,
+                    exploration_scores,
+                    max(exploration_slots * 20, 40),
                 )
-            used_ids = blocked_ids | set(selected_ids)
+                # Same draw as DataFrame.sample(n) on the shortlist, so a seeded feed is unchanged.
+                exploration_picks = exploration_shortlist[
+                    np.random.choice(
+                        len(exploration_shortlist),
+                        size=min(exploration_slots, len(exploration_shortlist)),
+                        replace=False,
+                    )
+                ]
+            selected_ids.extend(movie_ids_array[exploration_picks].tolist())
+            available_mask[exploration_picks] = False
 
     if len(selected_ids) < limit:
-        fallback_pool = movies_df[(~movies_df["id"].isin(used_ids))]
-        fallback_pool = fallback_pool.sort_values("quality_score", ascending=False)
-        selected_ids.extend([int(row["id"]) for _, row in fallback_pool.head(limit - len(selected_ids)).iterrows()])
+        fallback_positions = select_top_positions(
+            np.flatnonzero(available_mask),
+            quality_scores[available_mask],
+            limit - len(selected_ids),
+        )
+        selected_ids.extend(movie_ids_array[fallback_positions].tolist())
 
     selected_ids = [movie_id for movie_id in selected_ids if movie_id not in blocked_ids]
-    selected_rows = movies_df[movies_df["id"].isin(selected_ids)].copy()
-    selected_rows["selection_rank"] = selected_rows["id"].apply(
-        lambda movie_id: selected_ids.index(int(movie_id))
-    )
-    selected_rows = selected_rows.sort_values("selection_rank")
     poster_urls_by_movie_id.update(fetch_posters_from_tmdb(selected_ids[:limit]))
 
     return [
-        build_recommendation_payload(row, "tinder" if is_tinder_mode else "spotlight")
-        for _, row in selected_rows.head(limit).iterrows()
+        build_recommendation_payload(movies_df.iloc[position], "tinder" if is_tinder_mode else "spotlight")
+        for position in get_catalog_positions(selected_ids)[:limit]
     ]
 
+def compute_recommendation_surfaces(
+    current_user_id: int,
+    surfaces: list[tuple[str, int]],
+    exclude_ids: Optional[set[int]] = None,
+) -> list[list[dict]]:
+    # One user context and one set of similarity columns shared by every surface;
+    # each surface excludes the titles already placed on the previous ones.
+    feed_context = load_recommendation_feed_context(
+        current_user_id,
+        include_collaborative=any(str(mode).strip().lower() != "tinder" for mode, _ in surfaces),
+    )
+    excluded_ids = set(exclude_ids or ())
+    surface_results: list[list[dict]] = []
+    for mode, limit in surfaces:
+        surface_items = compute_recommendation_feed(
+            current_user_id=current_user_id,
+            limit=limit,
+            exclude_ids=",".join(str(movie_id) for movie_id in excluded_ids),
+            mode=mode,
+            feed_context=feed_context,
+        )
+        excluded_ids |= {movie["id"] for movie in surface_items}
+        surface_results.append(surface_items)
+    return surface_results
+
+
 @app.get("/movies/feed")
 def get_movie_feed(
     limit: int = 10,
@@ -7069,6 +9275,7 @@ def get_test_ai_metrics(current_user: dict = Depends(get_current_user)):
     }
 
 
+@timed_stage("feed.now_playing")
 def fetch_now_playing_movies(limit: int = 18) -> list[dict]:
     cached_items = now_playing_cache.get("items", [])
     cached_expiration = float(now_playing_cache.get("expires_at") or 0.0)
@@ -7079,7 +9286,7 @@ def fetch_now_playing_movies(limit: int = 18) -> list[dict]:
     recent_cutoff = today - datetime.timedelta(days=120)
 
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://api.themoviedb.org/3/movie/now_playing",
             params={
                 "api_key": TMDB_API_KEY,
@@ -7167,27 +9374,11 @@ def movie_news_highlights(current_user: dict = Depends(get_current_user)):
 
     popular_now = fetch_now_playing_movies(limit=18)
     popular_ids = {movie["id"] for movie in popular_now}
-    tinder_preview = compute_recommendation_feed(
-        current_user_id=current_user["id"],
-        limit=24,
-        exclude_ids=",".join(str(movie_id) for movie_id in popular_ids),
-        mode="tinder",
-    )
-    tinder_preview_ids = {movie["id"] for movie in tinder_preview}
-
-    tailored = compute_recommendation_feed(
-        current_user_id=current_user["id"],
-        limit=18,
-        exclude_ids=",".join(str(movie_id) for movie_id in (popular_ids | tinder_preview_ids)),
-        mode="spotlight",
-    )
-    tailored_ids = {movie["id"] for movie in tailored}
-
-    discovery = compute_recommendation_feed(
-        current_user_id=current_user["id"],
-        limit=18,
-        exclude_ids=",".join(str(movie_id) for movie_id in (popular_ids | tinder_preview_ids | tailored_ids)),
-        mode="explore",
+    # The tinder preview is only computed to keep its titles out of the two visible rows.
+    _tinder_preview, tailored, discovery = compute_recommendation_surfaces(
+        current_user["id"],
+        [("tinder", 24), ("spotlight", 18), ("explore", 18)],
+        exclude_ids=popular_ids,
     )
 
     friend_rated = fetch_friend_rated_movies(current_user["id"], limit=18)
@@ -7248,6 +9439,7 @@ def build_group_recommendation_reason(
     return f"Meilleur equilibre trouve: {round(average_probability * 100)}% en moyenne.{seen_suffix}"
 
 
+@timed_stage("group.compute")
 def build_group_recommendations(
     *,
     current_user_id: int,
@@ -7303,7 +9495,7 @@ def build_group_recommendations(
         preferences = get_user_preferences(cursor, user_id)
         watch_later_id = get_or_create_watch_later_id(cursor, user_id)
         cursor.execute(
-            f"SELECT movie_id, rating FROM user_ratings WHERE user_id = {SQL_PARAM} ORDER BY added_at DESC",
+            f"SELECT movie_id, rating FROM user_ratings WHERE user_id = {SQL_PARAM} ORDER BY added_at DESC, movie_id ASC",
             (user_id,),
         )
         rating_rows = [(int(row[0]), float(row[1])) for row in cursor.fetchall()]
@@ -7387,7 +9579,7 @@ def build_group_recommendations(
         similarity_scores = np.zeros(len(movies_df))
         if positive_indices:
             try:
-                similarity_matrix = cosine_similarity(vectors, vectors[positive_indices])
+                similarity_matrix = build_signal_similarity_matrix(positive_indices)
                 similarity_scores = np.average(
                     similarity_matrix,
                     axis=1,
@@ -7399,7 +9591,7 @@ def build_group_recommendations(
         negative_similarity_scores = np.zeros(len(movies_df))
         if negative_indices:
             try:
-                negative_similarity_matrix = cosine_similarity(vectors, vectors[negative_indices])
+                negative_similarity_matrix = build_signal_similarity_matrix(negative_indices)
                 negative_similarity_scores = np.average(
                     negative_similarity_matrix,
                     axis=1,
@@ -7408,15 +9600,7 @@ def build_group_recommendations(
             except Exception:
                 negative_similarity_scores = np.zeros(len(movies_df))
 
-        genre_scores = np.zeros(len(movies_df))
-        if genre_tokens:
-            genre_scores = np.array(
-                [
-                    len(set(tokens) & genre_tokens) / max(len(genre_tokens), 1)
-                    if tokens else 0.0
-                    for tokens in movies_df["genre_tokens"]
-                ]
-            )
+        genre_scores = compute_genre_overlap_scores(genre_tokens)
 
         group_profiles.append(
             {
@@ -7516,12 +9700,7 @@ def build_group_recommendations(
     if not selected_ids:
         selected_ids = ranked_ids[:limit]
     poster_urls_by_movie_id = fetch_posters_from_tmdb(selected_ids[:limit])
-
-    selected_rows = movies_df[movies_df["id"].isin(selected_ids)].copy()
-    selected_rows["selection_rank"] = selected_rows["id"].apply(
-        lambda movie_id: selected_ids.index(int(movie_id))
-    )
-    selected_rows = selected_rows.sort_values("selection_rank")
+    selected_rows = [movies_df.iloc[position] for position in get_catalog_positions(selected_ids)[:limit]]
 
     return [
         {
@@ -7543,7 +9722,7 @@ def build_group_recommendations(
                 seen_count=len(rated_by_movie_id.get(int(row["id"]), [])),
             ),
         }
-        for _, row in selected_rows.head(limit).iterrows()
+        for row in selected_rows
     ]
 
 
@@ -8012,11 +10191,12 @@ def create_review(review: ReviewCreate, current_user: dict = Depends(get_current
     )
     cursor.execute(
         """
-        INSERT INTO user_ratings (user_id, movie_id, rating, title, poster_url)
-        VALUES ({param}, {param}, {param}, {param}, {param})
+        INSERT INTO user_ratings (user_id, movie_id, rating, title, title_key, poster_url)
+        VALUES ({param}, {param}, {param}, {param}, {param}, {param})
         ON CONFLICT(user_id, movie_id) DO UPDATE SET
             rating = EXCLUDED.rating,
             title = EXCLUDED.title,
+            title_key = EXCLUDED.title_key,
             poster_url = EXCLUDED.poster_url,
             added_at = CURRENT_TIMESTAMP
         """.format(param=SQL_PARAM),
@@ -8025,6 +10205,7 @@ def create_review(review: ReviewCreate, current_user: dict = Depends(get_current
             review.movie_id,
             review_rating,
             review_title,
+            build_title_key(review_title),
             poster_url,
         ),
     )
@@ -8044,6 +10225,8 @@ def create_review(review: ReviewCreate, current_user: dict = Depends(get_current
             review_id=review_id,
         )
     conn.commit()
+    invalidate_collaborative_neighbors(cursor, current_user["id"], review.movie_id)
+    record_taste_state_rating(current_user["id"], review.movie_id, review_rating)
     enqueue_push_notifications(
         follower_ids,
         title="Nouvelle critique",
@@ -8107,11 +10290,12 @@ def update_review(
     )
     cursor.execute(
         """
-        INSERT INTO user_ratings (user_id, movie_id, rating, title, poster_url)
-        VALUES ({param}, {param}, {param}, {param}, {param})
+        INSERT INTO user_ratings (user_id, movie_id, rating, title, title_key, poster_url)
+        VALUES ({param}, {param}, {param}, {param}, {param}, {param})
         ON CONFLICT(user_id, movie_id) DO UPDATE SET
             rating = EXCLUDED.rating,
             title = EXCLUDED.title,
+            title_key = EXCLUDED.title_key,
             poster_url = EXCLUDED.poster_url,
             added_at = CURRENT_TIMESTAMP
         """.format(param=SQL_PARAM),
@@ -8120,10 +10304,13 @@ def update_review(
             review_row["movie_id"],
             review_rating,
             review_row["title"],
+            build_title_key(review_row["title"]),
             review_row["poster_url"],
         ),
     )
     conn.commit()
+    invalidate_collaborative_neighbors(cursor, current_user["id"], review_row["movie_id"])
+    record_taste_state_rating(current_user["id"], review_row["movie_id"], review_rating)
 
     updated_reviews = fetch_serialized_reviews(
         cursor,
@@ -8786,7 +10973,7 @@ async def realtime_websocket(websocket: WebSocket, token: str = Query(...)):
 @app.get("/search")
 def search(query: str):
     url = f"https://api.themoviedb.org/3/search/movie?api_key={TMDB_API_KEY}&language=fr-FR&query={query}"
-    res = requests.get(url).json().get('results', [])[:10]
+    res = upstream_get(url).json().get('results', [])[:10]
     return [{"id": m['id'], "title": m['title'], "poster_url": "https://image.tmdb.org/t/p/w500"+m['poster_path'] if m.get('poster_path') else "", "rating": m['vote_average']} for m in res]
 
 
@@ -9027,7 +11214,7 @@ def privacy_page():
 @app.get("/movies/news")
 def news():
     url = f"https://api.themoviedb.org/3/movie/now_playing?api_key={TMDB_API_KEY}&language=fr-FR&page=1"
-    res = requests.get(url).json().get('results', [])[:10]
+    res = upstream_get(url).json().get('results', [])[:10]
     return [{"id": m['id'], "title": m['title'], "poster_url": "https://image.tmdb.org/t/p/w500"+m.get('poster_path', ""), "rating": m['vote_average'], "overview": m['overview']} for m in res]
 
 @app.post("/movies/dislike/{movie_id}")
@@ -9050,6 +11237,7 @@ def dislike_movie(movie_id: int, current_user: dict = Depends(get_current_user))
     )
     conn.commit()
     conn.close()
+    invalidate_recommendation_taste_state(current_user["id"], "impressions", "feedback_profile")
     return {"status": "passed"}
 
 
@@ -9065,6 +11253,7 @@ def undo_dislike_movie(movie_id: int, current_user: dict = Depends(get_current_u
     )
     conn.commit()
     conn.close()
+    invalidate_recommendation_taste_state(current_user["id"], "impressions", "feedback_profile")
     return {"status": "removed"}
 
 
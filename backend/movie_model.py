@@ -0,0 +1,469 @@
+"""Content model shared by the API and the offline build scripts.
+
+`prepare_movies_catalog` and `build_feature_matrix` are the single source of
+truth for how `movies.pkl` becomes the recommendation model. The build step
+(`build_movie_model.py`) writes the result as a versioned artifact directory
+of `.npy` files that API workers memory-map read-only, so every uvicorn
+worker shares the same pages instead of re-parsing and refitting.
+"""
+
+from __future__ import annotations
+
+import ast
+import datetime
+import hashlib
+import json
+import logging
+import os
+import pickle
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+
+logger = logging.getLogger("qulte-api")
+
+MOVIE_MODEL_FORMAT_VERSION = 1
+MOVIE_MODEL_CURRENT_LINK = "current"
+MOVIE_MODEL_MANIFEST_FILENAME = "manifest.json"
+MOVIE_MODEL_CATALOG_FILENAME = "catalog.pkl"
+NEIGHBOR_INDEX_FILENAME = "movie_neighbors_index.npy"
+NEIGHBOR_SCORES_FILENAME = "movie_neighbors_scores.npy"
+NEIGHBOR_IDS_FILENAME = "movie_neighbors_ids.npy"
+MOVIE_MODEL_ARRAY_FILENAMES = {
+    "movie_ids": "movie_ids.npy",
+    "quality_score": "quality_score.npy",
+    "audience_rating_score": "audience_rating_score.npy",
+    "genre_token_indptr": "genre_token_indptr.npy",
+    "genre_token_ids": "genre_token_ids.npy",
+    "keyword_token_indptr": "keyword_token_indptr.npy",
+    "keyword_token_ids": "keyword_token_ids.npy",
+    "features_data": "features_data.npy",
+    "features_indices": "features_indices.npy",
+    "features_indptr": "features_indptr.npy",
+}
+# Older artifacts predate these arrays: the API rebuilds the pools at startup and
+# fetches related ids live when they are missing.
+MOVIE_MODEL_OPTIONAL_ARRAY_FILENAMES = {
+    "cold_start_pool_indptr": "cold_start_pool_indptr.npy",
+    "cold_start_pool_positions": "cold_start_pool_positions.npy",
+    "related_movie_indptr": "related_movie_indptr.npy",
+    "related_movie_ids": "related_movie_ids.npy",
+}
+COLD_START_POOL_SIZE = 300
+TMDB_POSTER_BASE_URL = "https://image.tmdb.org/t/p/w500"
+# Columns rebuilt from the .npy arrays or only needed to fit the vectorizer.
+# Token lists live in the memory-mapped *_token_ids/*_token_indptr arrays instead of per-worker pickled lists.
+CATALOG_EXCLUDED_COLUMNS = ("soup", "id", "quality_score", "audience_rating_score", "genre_tokens", "keyword_tokens")
+
+
+def extract_json_names(value) -> list[str]:
+    if not isinstance(value, str) or not value:
+        return []
+
+    try:
+        items = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+
+    names: list[str] = []
+    for item in items:
+        name = item.get("name") if isinstance(item, dict) else None
+        if not name:
+            continue
+        names.append(str(name).replace(" ", "").lower())
+    return names
+
+
+def extract_json_ids(value) -> list[int]:
+    if not isinstance(value, str) or not value:
+        return []
+
+    try:
+        items = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return []
+
+    parsed_ids: list[int] = []
+    for item in items:
+        item_id = item.get("id") if isinstance(item, dict) else None
+        if isinstance(item_id, int):
+            parsed_ids.append(item_id)
+    return parsed_ids
+
+
+def extract_primary_genre_name(value) -> str:
+    if not isinstance(value, str) or not value:
+        return "Autres"
+
+    try:
+        items = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return "Autres"
+
+    for item in items:
+        genre_name = item.get("name") if isinstance(item, dict) else None
+        if genre_name:
+            return str(genre_name)
+
+    return "Autres"
+
+
+def prepare_movies_catalog(movies_df: pd.DataFrame) -> pd.DataFrame:
+    movies_df["vote_average"] = pd.to_numeric(movies_df["vote_average"], errors="coerce").fillna(5.0)
+    movies_df["popularity"] = pd.to_numeric(movies_df.get("popularity", 0), errors="coerce").fillna(0.0)
+    movies_df["vote_count"] = pd.to_numeric(movies_df.get("vote_count", 0), errors="coerce").fillna(0.0)
+    movies_df["genre_tokens"] = (
+        movies_df["genres"].apply(extract_json_names)
+        if "genres" in movies_df.columns
+        else [[] for _ in range(len(movies_df))]
+    )
+    movies_df["genre_ids"] = (
+        movies_df["genres"].apply(extract_json_ids)
+        if "genres" in movies_df.columns
+        else [[] for _ in range(len(movies_df))]
+    )
+    movies_df["keyword_tokens"] = (
+        movies_df["keywords"].apply(extract_json_names)
+        if "keywords" in movies_df.columns
+        else [[] for _ in range(len(movies_df))]
+    )
+    movies_df["primary_genre"] = (
+        movies_df["genres"].apply(extract_primary_genre_name)
+        if "genres" in movies_df.columns
+        else ["Autres" for _ in range(len(movies_df))]
+    )
+    movies_df["poster_path"] = (
+        movies_df["poster_path"].fillna("").astype(str).str.strip()
+        if "poster_path" in movies_df.columns
+        else ["" for _ in range(len(movies_df))]
+    )
+    max_popularity = max(float(movies_df["popularity"].max()), 1.0)
+    max_vote_count = max(float(movies_df["vote_count"].max()), 1.0)
+    global_vote_average = float(movies_df["vote_average"].mean() or 6.2)
+    rating_confidence_threshold = max(
+        60.0,
+        float(movies_df["vote_count"].quantile(0.60) or 0.0),
+    )
+    movies_df["audience_rating_score"] = (
+        (
+            (movies_df["vote_count"] / (movies_df["vote_count"] + rating_confidence_threshold))
+            * (movies_df["vote_average"] / 10.0)
+        )
+        + (
+            (rating_confidence_threshold / (movies_df["vote_count"] + rating_confidence_threshold))
+            * (global_vote_average / 10.0)
+        )
+    )
+    movies_df["quality_score"] = (
+        (movies_df["audience_rating_score"] * 0.68)
+        + ((np.log1p(movies_df["popularity"]) / np.log1p(max_popularity)) * 0.12)
+        + ((np.log1p(movies_df["vote_count"]) / np.log1p(max_vote_count)) * 0.20)
+    )
+    return movies_df
+
+
+def build_local_movie_index(movies_df: pd.DataFrame) -> dict[int, str]:
+    # id -> poster URL served without calling TMDB; titles and ratings keep coming
+    # from the fr-FR TMDB payloads.
+    if movies_df.empty or "poster_path" not in movies_df.columns:
+        return {}
+
+    return {
+        movie_id: f"{TMDB_POSTER_BASE_URL}{poster_path}"
+        for movie_id, poster_path in zip(
+            movies_df["id"].astype(int).tolist(),
+            movies_df["poster_path"].fillna("").astype(str).str.strip().tolist(),
+        )
+        if poster_path.startswith("/")
+    }
+
+
+def build_feature_matrix(movies_df: pd.DataFrame) -> sparse.csr_matrix:
+    cv = CountVectorizer(max_features=5000, stop_words="english")
+    # Row-normalized sparse float32 matrix: cosine similarity becomes a plain sparse dot product.
+    return normalize(
+        cv.fit_transform(movies_df["soup"]).astype(np.float32),
+        norm="l2",
+        axis=1,
+        copy=False,
+    ).tocsr()
+
+
+def compute_top_k_neighbors(features, top_k: int, block_size: int = 512) -> tuple[np.ndarray, np.ndarray]:
+    movie_count = features.shape[0]
+    top_k = max(1, min(int(top_k), movie_count))
+    neighbor_indices = np.empty((movie_count, top_k), dtype=np.int32)
+    neighbor_scores = np.empty((movie_count, top_k), dtype=np.float32)
+    features_t = features.T.tocsc()
+
+    for start in range(0, movie_count, max(1, block_size)):
+        stop = min(start + block_size, movie_count)
+        block_scores = (features[start:stop] @ features_t).toarray()
+        if top_k < movie_count:
+            candidate_indices = np.argpartition(-block_scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            candidate_indices = np.tile(np.arange(movie_count), (stop - start, 1))
+        candidate_scores = np.take_along_axis(block_scores, candidate_indices, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        neighbor_indices[start:stop] = np.take_along_axis(candidate_indices, order, axis=1)
+        neighbor_scores[start:stop] = np.take_along_axis(candidate_scores, order, axis=1)
+
+    return neighbor_indices, neighbor_scores
+
+
+def encode_token_lists(token_lists) -> tuple[np.ndarray, np.ndarray, list[str]]:
+    vocabulary_index: dict[str, int] = {}
+    indptr = np.zeros(len(token_lists) + 1, dtype=np.int64)
+    token_ids: list[int] = []
+    for row_index, tokens in enumerate(token_lists):
+        for token in tokens or []:
+            token_ids.append(vocabulary_index.setdefault(str(token), len(vocabulary_index)))
+        indptr[row_index + 1] = len(token_ids)
+    return indptr, np.asarray(token_ids, dtype=np.int32), list(vocabulary_index)
+
+
+def build_token_matrix(indptr, token_ids, vocabulary_size: int) -> sparse.csr_matrix:
+    # Movie x token counts; repeated tokens on one movie keep their multiplicity.
+    token_ids = np.asarray(token_ids)
+    return sparse.csr_matrix(
+        (np.ones(len(token_ids), dtype=np.float64), token_ids, np.asarray(indptr)),
+        shape=(len(indptr) - 1, int(vocabulary_size)),
+    )
+
+
+def truncate_token_rows(indptr, token_ids, max_tokens: int) -> tuple[np.ndarray, np.ndarray]:
+    indptr = np.asarray(indptr, dtype=np.int64)
+    token_counts = np.diff(indptr)
+    token_positions = np.arange(int(indptr[-1]), dtype=np.int64) - np.repeat(indptr[:-1], token_counts)
+    truncated_indptr = np.zeros_like(indptr)
+    np.cumsum(np.minimum(token_counts, max_tokens), out=truncated_indptr[1:])
+    return truncated_indptr, np.asarray(token_ids)[token_positions < max_tokens]
+
+
+def build_token_presence_matrix(token_matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    presence_matrix = token_matrix.copy()
+    presence_matrix.sum_duplicates()
+    presence_matrix.data[:] = 1.0
+    return presence_matrix
+
+
+def build_cold_start_pools(
+    genre_indptr,
+    genre_token_ids,
+    vocabulary_size: int,
+    quality_scores,
+    pool_size: int = COLD_START_POOL_SIZE,
+) -> tuple[np.ndarray, np.ndarray]:
+    # One quality-ranked pool per genre token, plus a catalog-wide pool in the last slot.
+    presence_matrix = build_token_presence_matrix(
+        build_token_matrix(genre_indptr, genre_token_ids, vocabulary_size)
+    ).tocsc()
+    presence_matrix.sort_indices()
+    quality_scores = np.asarray(quality_scores, dtype=float)
+    pool_size = max(1, int(pool_size))
+    pools: list[np.ndarray] = []
+    for token_id in range(int(vocabulary_size)):
+        members = presence_matrix.indices[presence_matrix.indptr[token_id]:presence_matrix.indptr[token_id + 1]]
+        pools.append(members[np.argsort(-quality_scores[members], kind="stable")][:pool_size])
+    pools.append(np.argsort(-quality_scores, kind="stable")[:pool_size])
+
+    pool_indptr = np.zeros(len(pools) + 1, dtype=np.int64)
+    np.cumsum([len(pool) for pool in pools], out=pool_indptr[1:])
+    return pool_indptr, np.concatenate(pools).astype(np.int32, copy=False)
+
+
+def save_array_atomically(path: str, values: np.ndarray) -> None:
+    temporary_path = f"{path[:-len('.npy')]}.tmp.npy"
+    np.save(temporary_path, values)
+    os.replace(temporary_path, path)
+
+
+def save_neighbor_index(
+    output_dir: str,
+    movie_ids: np.ndarray,
+    neighbor_indices: np.ndarray,
+    neighbor_scores: np.ndarray,
+) -> None:
+    # The ids file is written last: loaders only trust the index when it matches the catalog.
+    save_array_atomically(os.path.join(output_dir, NEIGHBOR_INDEX_FILENAME), neighbor_indices)
+    save_array_atomically(os.path.join(output_dir, NEIGHBOR_SCORES_FILENAME), neighbor_scores)
+    save_array_atomically(os.path.join(output_dir, NEIGHBOR_IDS_FILENAME), movie_ids)
+
+
+def load_neighbor_index(
+    index_dir: str,
+    catalog_movie_ids: np.ndarray,
+) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    ids_path = os.path.join(index_dir, NEIGHBOR_IDS_FILENAME)
+    index_path = os.path.join(index_dir, NEIGHBOR_INDEX_FILENAME)
+    scores_path = os.path.join(index_dir, NEIGHBOR_SCORES_FILENAME)
+    if not all(os.path.exists(path) for path in (ids_path, index_path, scores_path)):
+        return None, None
+
+    try:
+        neighbor_ids = np.load(ids_path, mmap_mode="r")
+        neighbor_indices = np.load(index_path, mmap_mode="r")
+        neighbor_scores = np.load(scores_path, mmap_mode="r")
+    except Exception:
+        logger.exception("Index voisins films illisible dans %s.", index_dir)
+        return None, None
+
+    if (
+        not np.array_equal(np.asarray(neighbor_ids), catalog_movie_ids)
+        or neighbor_indices.shape != neighbor_scores.shape
+        or neighbor_indices.shape[0] != len(catalog_movie_ids)
+    ):
+        logger.warning("Index voisins films desaligne avec le catalogue dans %s.", index_dir)
+        return None, None
+
+    return neighbor_indices, neighbor_scores
+
+
+def compute_file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as source_file:
+        for chunk in iter(lambda: source_file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_movie_model_artifact(
+    models_root: str,
+    movies_df: pd.DataFrame,
+    features: sparse.csr_matrix,
+    *,
+    source_path: str,
+    neighbor_top_k: int = 0,
+    cold_start_pool_size: int = COLD_START_POOL_SIZE,
+    related_movie_index: Optional[tuple[np.ndarray, np.ndarray]] = None,
+) -> str:
+    source_digest = compute_file_digest(source_path)
+    version = f"{datetime.datetime.utcnow():%Y%m%d%H%M%S}-{source_digest[:10]}"
+    version_dir = os.path.join(models_root, version)
+    os.makedirs(version_dir, exist_ok=False)
+
+    movie_ids = movies_df["id"].astype(int).to_numpy(dtype=np.int64)
+    genre_indptr, genre_token_ids, genre_vocabulary = encode_token_lists(movies_df["genre_tokens"])
+    keyword_indptr, keyword_token_ids, keyword_vocabulary = encode_token_lists(movies_df["keyword_tokens"])
+    quality_scores = movies_df["quality_score"].to_numpy(dtype=np.float64)
+    cold_start_pool_indptr, cold_start_pool_positions = build_cold_start_pools(
+        genre_indptr,
+        genre_token_ids,
+        len(genre_vocabulary),
+        quality_scores,
+        cold_start_pool_size,
+    )
+    arrays = {
+        "movie_ids": movie_ids,
+        "quality_score": quality_scores,
+        "audience_rating_score": movies_df["audience_rating_score"].to_numpy(dtype=np.float64),
+        "genre_token_indptr": genre_indptr,
+        "genre_token_ids": genre_token_ids,
+        "keyword_token_indptr": keyword_indptr,
+        "keyword_token_ids": keyword_token_ids,
+        "features_data": features.data.astype(np.float32, copy=False),
+        # Keep scipy's native index dtype so loading does not trigger an upcast copy.
+        "features_indices": features.indices,
+        "features_indptr": features.indptr,
+        "cold_start_pool_indptr": cold_start_pool_indptr,
+        "cold_start_pool_positions": cold_start_pool_positions,
+    }
+    if related_movie_index is not None:
+        # TMDB recommendations/similar ids per catalog row, fetched by the build script.
+        arrays["related_movie_indptr"], arrays["related_movie_ids"] = related_movie_index
+    for key, filename in {**MOVIE_MODEL_ARRAY_FILENAMES, **MOVIE_MODEL_OPTIONAL_ARRAY_FILENAMES}.items():
+        if key in arrays:
+            np.save(os.path.join(version_dir, filename), arrays[key])
+
+    catalog_df = movies_df.drop(
+        columns=[column for column in CATALOG_EXCLUDED_COLUMNS if column in movies_df.columns]
+    ).reset_index(drop=True)
+    with open(os.path.join(version_dir, MOVIE_MODEL_CATALOG_FILENAME), "wb") as catalog_file:
+        pickle.dump(catalog_df, catalog_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    if neighbor_top_k > 0:
+        neighbor_indices, neighbor_scores = compute_top_k_neighbors(features, neighbor_top_k)
+        save_neighbor_index(version_dir, movie_ids, neighbor_indices, neighbor_scores)
+
+    manifest = {
+        "format_version": MOVIE_MODEL_FORMAT_VERSION,
+        "version": version,
+        "created_at": datetime.datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "source_sha256": source_digest,
+        "movie_count": int(len(movie_ids)),
+        "feature_shape": [int(features.shape[0]), int(features.shape[1])],
+        "genre_vocabulary": genre_vocabulary,
+        "keyword_vocabulary": keyword_vocabulary,
+        "neighbor_top_k": int(neighbor_top_k) if neighbor_top_k > 0 else 0,
+        "cold_start_pool_size": max(1, int(cold_start_pool_size)),
+        "has_related_movie_index": related_movie_index is not None,
+    }
+    # The manifest is written last so a half-written version is never loadable.
+    with open(os.path.join(version_dir, MOVIE_MODEL_MANIFEST_FILENAME), "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file)
+    return version_dir
+
+
+def activate_movie_model_version(models_root: str, version_dir: str) -> None:
+    current_link = os.path.join(models_root, MOVIE_MODEL_CURRENT_LINK)
+    temporary_link = f"{current_link}.tmp"
+    if os.path.lexists(temporary_link):
+        os.remove(temporary_link)
+    os.symlink(os.path.basename(os.path.normpath(version_dir)), temporary_link)
+    # rename(2) swaps the symlink atomically; workers pick the new version on their next start.
+    os.replace(temporary_link, current_link)
+
+
+def load_movie_model_artifact(models_root: str) -> Optional[dict[str, Any]]:
+    model_dir = os.path.join(models_root, MOVIE_MODEL_CURRENT_LINK)
+    manifest_path = os.path.join(model_dir, MOVIE_MODEL_MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return None
+
+    model_dir = os.path.realpath(model_dir)
+    with open(os.path.join(model_dir, MOVIE_MODEL_MANIFEST_FILENAME), "r", encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    if int(manifest.get("format_version") or 0) != MOVIE_MODEL_FORMAT_VERSION:
+        raise RuntimeError(f"Format d'artefact modele non supporte: {manifest.get('format_version')}")
+
+    arrays = {
+        key: np.load(os.path.join(model_dir, filename), mmap_mode="r")
+        for key, filename in MOVIE_MODEL_ARRAY_FILENAMES.items()
+    }
+    for key, filename in MOVIE_MODEL_OPTIONAL_ARRAY_FILENAMES.items():
+        optional_path = os.path.join(model_dir, filename)
+        if os.path.exists(optional_path):
+            arrays[key] = np.load(optional_path, mmap_mode="r")
+    with open(os.path.join(model_dir, MOVIE_MODEL_CATALOG_FILENAME), "rb") as catalog_file:
+        catalog_df = pickle.load(catalog_file)
+    # Artifacts built before the token lists were dropped from the catalog still carry them.
+    catalog_df = catalog_df.drop(columns=["genre_tokens", "keyword_tokens"], errors="ignore")
+
+    movie_ids = np.asarray(arrays["movie_ids"])
+    if len(catalog_df) != len(movie_ids) or int(manifest.get("movie_count") or 0) != len(movie_ids):
+        raise RuntimeError(f"Artefact modele incoherent: {model_dir}")
+
+    catalog_df["id"] = movie_ids
+    catalog_df["audience_rating_score"] = np.asarray(arrays["audience_rating_score"])
+    catalog_df["quality_score"] = np.asarray(arrays["quality_score"])
+    feature_rows, feature_columns = manifest["feature_shape"]
+    vectors = sparse.csr_matrix(
+        (arrays["features_data"], arrays["features_indices"], arrays["features_indptr"]),
+        shape=(int(feature_rows), int(feature_columns)),
+        copy=False,
+    )
+    neighbor_indices, neighbor_scores = load_neighbor_index(model_dir, movie_ids)
+    return {
+        "manifest": manifest,
+        "model_dir": model_dir,
+        "catalog": catalog_df,
+        "vectors": vectors,
+        "arrays": arrays,
+        "neighbor_indices": neighbor_indices,
+        "neighbor_scores": neighbor_scores,
+    }
@@ -31,13 +31,15 @@ CREATE TABLE IF NOT EXISTS user_ratings (
     title TEXT,
     poster_url TEXT,
     added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    primary_genre TEXT,
     PRIMARY KEY (user_id, movie_id)
 );
 
 CREATE TABLE IF NOT EXISTS playlists (
     id INTEGER PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
     user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
-    name TEXT
+    name TEXT,
+    item_count INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE INDEX IF NOT EXISTS idx_playlists_user_id ON playlists(user_id);
@@ -0,0 +1,187 @@
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_DIR = tempfile.mkdtemp(prefix="qulte-feed-ranking-")
+GENRES = [
+    (28, "Action"),
+    (12, "Adventure"),
+    (16, "Animation"),
+    (35, "Comedy"),
+    (80, "Crime"),
+    (18, "Drama"),
+    (14, "Fantasy"),
+    (27, "Horror"),
+    (10749, "Romance"),
+    (878, "Science Fiction"),
+]
+KEYWORDS = [
+    "love", "war", "space", "robot", "heist", "family", "murder", "friendship",
+    "alien", "magic", "dragon", "detective", "revenge", "school", "zombie", "ocean",
+]
+
+
+def write_seeded_catalog(path: str, movie_count: int = 240) -> None:
+    rng = random.Random(7)
+    rows = []
+    for index in range(movie_count):
+        genres = rng.sample(GENRES, rng.randint(1, 3))
+        keywords = rng.sample(KEYWORDS, rng.randint(1, 6))
+        rows.append(
+            {
+                "id": 1000 + index,
+                "title": f"Movie {index}",
+                "genres": str([{"id": genre_id, "name": name} for genre_id, name in genres]),
+                "keywords": str([{"id": keyword_id, "name": word} for keyword_id, word in enumerate(keywords)]),
+                # Coarse ratings and vote counts so exact score ties actually happen.
+                "vote_average": rng.choice([5.5, 6.5, 7.0, 7.5, 8.0]),
+                "popularity": float(rng.randint(1, 40)),
+                "vote_count": rng.choice([50, 400, 2000]),
+                "poster_path": f"/poster-{index}.jpg",
+                "release_date": f"{rng.randint(1980, 2015)}-01-01",
+            }
+        )
+    movies_df = pd.DataFrame(rows)
+    movies_df["soup"] = (movies_df["genres"] + " " + movies_df["keywords"]).str.lower()
+    movies_df.to_pickle(path)
+
+
+write_seeded_catalog(os.path.join(FIXTURE_DIR, "movies.pkl"))
+for variable in ("DATABASE_URL", "POSTGRES_URL", "REDIS_URL"):
+    os.environ.pop(variable, None)
+os.environ.update(
+    {
+        "SQLITE_PATH": os.path.join(FIXTURE_DIR, "feed.db"),
+        "MOVIES_PKL_PATH": os.path.join(FIXTURE_DIR, "movies.pkl"),
+        "MOVIE_MODEL_DIR": os.path.join(FIXTURE_DIR, "no-model"),
+        "MOVIE_NEIGHBORS_DIR": FIXTURE_DIR,
+        "RELIURE_BACKEND_MAIN": os.path.join(FIXTURE_DIR, "no-reliure.py"),
+    }
+)
+sys.path.insert(0, BACKEND_DIR)
+
+import main  # noqa: E402
+
+
+# Pinned from the pandas ranking (baseline) on the seeded catalog above; ties in
+# vote_average/vote_count are frequent on purpose.
+SPOTLIGHT_FEED_IDS = [1019, 1221, 1116, 1091, 1128, 1135, 1187, 1126, 1211, 1079, 1034, 1072]
+SPOTLIGHT_SEED_12_FEED_IDS = [1019, 1221, 1116, 1091, 1128, 1135, 1187, 1126, 1211, 1079, 1074, 1063]
+TINDER_FEED_IDS = [1019, 1116, 1135, 1221, 1091, 1128, 1211, 1107, 1079, 1126, 1187, 1022]
+EXPLORE_FEED_IDS = [1211, 1229, 1091, 1116, 1128, 1132, 1019, 1221, 1138, 1195, 1075, 1034]
+TEST_AI_SPOTLIGHT_FEED_IDS = [1184, 1192, 1101, 1049, 1196, 1058, 1141, 1105, 1009, 1176, 1031, 1132]
+
+
+def dataframe_top_positions(positions: np.ndarray, scores: np.ndarray, limit: int) -> list[int]:
+    frame = pd.DataFrame({"score": scores}, index=positions)
+    return frame.sort_values("score", ascending=False).head(limit).index.tolist()
+
+
+class SelectTopPositionsTest(unittest.TestCase):
+    def test_matches_dataframe_sort_on_small_ties(self):
+        positions = np.array([10, 11, 12, 13, 14, 15])
+        scores = np.array([0.5, 0.9, 0.5, 0.9, 0.1, 0.5])
+
+        for limit in (2, 4, 6):
+            self.assertEqual(
+                main.select_top_positions(positions, scores, limit).tolist(),
+                dataframe_top_positions(positions, scores, limit),
+            )
+
+    def test_matches_dataframe_sort_on_large_tie_groups(self):
+        rng = np.random.default_rng(5)
+        for size in (64, 257, 4800):
+            positions = np.sort(rng.choice(size * 2, size, replace=False))
+            scores = rng.choice([0.3, 0.55, 0.8], size)
+            for limit in (1, 40, size):
+                self.assertEqual(
+                    main.select_top_positions(positions, scores, limit).tolist(),
+                    dataframe_top_positions(positions, scores, limit),
+                )
+
+    def test_limit_above_pool_size_returns_full_order(self):
+        positions = np.array([3, 1, 2])
+        scores = np.array([0.2, 0.2, 0.7])
+
+        self.assertEqual(
+            main.select_top_positions(positions, scores, 10).tolist(),
+            dataframe_top_positions(positions, scores, 10),
+        )
+        self.assertEqual(main.select_top_positions(positions, scores, 0).tolist(), [])
+
+
+class RecommendationFeedOrderingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        conn = main.get_db_connection()
+        cursor = conn.cursor()
+        cls.user_id = main.execute_insert_and_get_id(
+            cursor,
+            f"INSERT INTO users (username, password_hash) VALUES ({main.SQL_PARAM}, {main.SQL_PARAM})",
+            ("ranking", "x"),
+        )
+        conn.commit()
+        conn.close()
+
+        rng = random.Random(3)
+        current_user = {"id": cls.user_id, "username": "ranking"}
+        for movie_id in rng.sample(main.movie_ids_array.tolist(), 14):
+            main.rate_movie(movie_id, rng.choice([1.0, 2.0, 4.0, 4.5, 5.0]), current_user=current_user)
+
+    def setUp(self):
+        # The feed must not depend on TMDB: no related titles, no now-playing, catalog posters only.
+        patches = [
+            mock.patch.object(main, "fetch_now_playing_movies", lambda limit=18: []),
+            mock.patch.object(
+                main,
+                "get_tmdb_related_movie_ids_batch",
+                lambda movie_ids: {int(movie_id): () for movie_id in movie_ids},
+            ),
+            mock.patch.object(main, "fetch_posters_from_tmdb", lambda movie_ids: {int(movie_id): "" for movie_id in movie_ids}),
+            mock.patch.object(main, "GLOBAL_RECOMMENDATION_AI_ENABLED", main.GLOBAL_RECOMMENDATION_AI_ENABLED),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def compute_feed_ids(self, mode: str, *, seed: int, limit: int = 12) -> list[int]:
+        np.random.seed(seed)
+        feed = main.compute_recommendation_feed(self.user_id, limit=limit, mode=mode)
+        return [movie["id"] for movie in feed]
+
+    def test_spotlight_order_with_seeded_exploration_draw(self):
+        main.GLOBAL_RECOMMENDATION_AI_ENABLED = False
+
+        feed_ids = self.compute_feed_ids("spotlight", seed=11)
+
+        self.assertEqual(feed_ids, SPOTLIGHT_FEED_IDS)
+        self.assertEqual(self.compute_feed_ids("spotlight", seed=11), feed_ids)
+        # The last slots come from the random exploration draw over the shortlist.
+        self.assertEqual(self.compute_feed_ids("spotlight", seed=12), SPOTLIGHT_SEED_12_FEED_IDS)
+
+    def test_tinder_order(self):
+        main.GLOBAL_RECOMMENDATION_AI_ENABLED = False
+
+        self.assertEqual(self.compute_feed_ids("tinder", seed=11), TINDER_FEED_IDS)
+
+    def test_explore_order(self):
+        main.GLOBAL_RECOMMENDATION_AI_ENABLED = False
+
+        self.assertEqual(self.compute_feed_ids("explore", seed=11), EXPLORE_FEED_IDS)
+
+    def test_test_ai_spotlight_order(self):
+        main.GLOBAL_RECOMMENDATION_AI_ENABLED = True
+
+        self.assertEqual(self.compute_feed_ids("spotlight", seed=11), TEST_AI_SPOTLIGHT_FEED_IDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
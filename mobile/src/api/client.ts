@@ -618,6 +618,7 @@ export async function fetchPlaylistMoviesPage(
   options?: {
     limit?: number;
     offset?: number;
+    cursor?: string | null;
     sort?: 'manual' | 'genre' | 'recent' | 'oldest' | 'rating';
     query?: string;
     onlyOwnedStreamingServices?: boolean;
@@ -626,6 +627,9 @@ export async function fetchPlaylistMoviesPage(
   const params = new URLSearchParams();
   params.set('limit', String(options?.limit ?? 60));
   params.set('offset', String(options?.offset ?? 0));
+  if (options?.cursor) {
+    params.set('cursor', options.cursor);
+  }
   if (options?.sort) {
     params.set('sort', options.sort);
   }
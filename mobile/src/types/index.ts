@@ -192,6 +192,7 @@ export interface PlaylistMoviesPage {
   items: SearchMovie[];
   playlist_total_count: number;
   next_offset: number;
+  next_cursor?: string | null;
   has_more: boolean;
   resolved_sort: 'manual' | 'genre' | 'recent' | 'oldest' | 'rating';
 }
@@ -10,14 +10,19 @@ import datetime
 import time
 import uuid
 from functools import lru_cache
+from threading import BoundedSemaphore, Lock
 from typing import Optional
+from urllib.parse import urlparse
 from fastapi import FastAPI, HTTPException, Depends, status, WebSocket, WebSocketDisconnect, Query, Request, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse, Response
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, Response
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 import pandas as pd
 import pickle
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import numpy as np
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
@@ -92,6 +97,79 @@ OBJECTIONABLE_TERMS = {
     "rapist",
     "suicide",
 }
+UPSTREAM_HTTP_TIMEOUT_SECONDS = float(os.getenv("UPSTREAM_HTTP_TIMEOUT_SECONDS", "4") or "4")
+UPSTREAM_HTTP_POOL_SIZE = int(os.getenv("UPSTREAM_HTTP_POOL_SIZE", "32") or "32")
+UPSTREAM_HTTP_MAX_RETRIES = int(os.getenv("UPSTREAM_HTTP_MAX_RETRIES", "2") or "2")
+UPSTREAM_HTTP_MAX_CONCURRENCY_PER_HOST = int(os.getenv("UPSTREAM_HTTP_MAX_CONCURRENCY_PER_HOST", "16") or "16")
+UPSTREAM_REQUESTS = Counter(
+    "reliure_upstream_requests_total",
+    "Appels HTTP sortants par hote et statut",
+    ["upstream", "status"],
+)
+UPSTREAM_REQUEST_LATENCY = Histogram(
+    "reliure_upstream_request_duration_seconds",
+    "Temps de reponse des appels HTTP sortants",
+    ["upstream"],
+)
+upstream_host_semaphores_lock = Lock()
+upstream_host_semaphores: dict[str, BoundedSemaphore] = {}
+
+
+def build_upstream_http_session() -> requests.Session:
+    session = requests.Session()
+    # Only idempotent reads are retried; push sends (POST) fail fast to the caller.
+    retry = Retry(
+        total=UPSTREAM_HTTP_MAX_RETRIES,
+        backoff_factor=0.25,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=UPSTREAM_HTTP_POOL_SIZE, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+upstream_http_session = build_upstream_http_session()
+
+
+def get_upstream_host_semaphore(host: str) -> BoundedSemaphore:
+    with upstream_host_semaphores_lock:
+        semaphore = upstream_host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = BoundedSemaphore(max(1, UPSTREAM_HTTP_MAX_CONCURRENCY_PER_HOST))
+            upstream_host_semaphores[host] = semaphore
+        return semaphore
+
+
+def upstream_request(method: str, url: str, *, timeout: float = UPSTREAM_HTTP_TIMEOUT_SECONDS, **kwargs) -> requests.Response:
+    host = urlparse(url).hostname or "unknown"
+    semaphore = get_upstream_host_semaphore(host)
+    started_at = time.perf_counter()
+    status_label = "error"
+    try:
+        if not semaphore.acquire(timeout=timeout):
+            status_label = "saturated"
+            raise requests.exceptions.ConnectTimeout(f"Trop d'appels simultanes vers {host}")
+        try:
+            response = upstream_http_session.request(method, url, timeout=timeout, **kwargs)
+        finally:
+            semaphore.release()
+        status_label = str(response.status_code)
+        return response
+    finally:
+        UPSTREAM_REQUESTS.labels(upstream=host, status=status_label).inc()
+        UPSTREAM_REQUEST_LATENCY.labels(upstream=host).observe(time.perf_counter() - started_at)
+
+
+def upstream_get(url: str, **kwargs) -> requests.Response:
+    return upstream_request("GET", url, **kwargs)
+
+
+def upstream_post(url: str, **kwargs) -> requests.Response:
+    return upstream_request("POST", url, **kwargs)
 
 
 class RealtimeConnectionManager:
@@ -348,7 +426,7 @@ def fetch_open_library_author_name(author_key: str) -> str:
     if not normalized_key.startswith("/authors/"):
         return ""
     try:
-        response = requests.get(f"https://openlibrary.org{normalized_key}.json", timeout=3)
+        response = upstream_get(f"https://openlibrary.org{normalized_key}.json", timeout=3)
         data = response.json()
     except Exception:
         return ""
@@ -362,7 +440,7 @@ def fetch_open_library_search(query: str, limit: int = 10) -> tuple[dict, ...]:
         return ()
 
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://openlibrary.org/search.json",
             params={
                 "q": normalized_query,
@@ -390,7 +468,7 @@ def fetch_open_library_work_details(work_key: str) -> Optional[dict]:
         return None
 
     try:
-        response = requests.get(f"https://openlibrary.org{normalized_key}.json", timeout=4)
+        response = upstream_get(f"https://openlibrary.org{normalized_key}.json", timeout=4)
         data = response.json()
     except Exception:
         return None
@@ -492,7 +570,7 @@ def fetch_google_books_search(query: str, limit: int = 10) -> tuple[dict, ...]:
         "key": GOOGLE_BOOKS_API_KEY,
     }
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://www.googleapis.com/books/v1/volumes",
             params=params,
             timeout=4,
@@ -519,7 +597,7 @@ def fetch_google_book_details(volume_id: str) -> Optional[dict]:
         return None
 
     try:
-        response = requests.get(
+        response = upstream_get(
             f"https://www.googleapis.com/books/v1/volumes/{normalized_volume_id}",
             params={"projection": "full", "key": GOOGLE_BOOKS_API_KEY},
             timeout=4,
@@ -578,7 +656,7 @@ def fetch_google_book_details(volume_id: str) -> Optional[dict]:
 def get_tmdb_movie_summary(movie_id: int) -> Optional[dict]:
     try:
         url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR"
-        data = requests.get(url, timeout=2).json()
+        data = upstream_get(url, timeout=2).json()
     except Exception:
         return None
 
@@ -1218,7 +1296,7 @@ def search_tmdb_people(query: str) -> tuple[dict, ...]:
         return ()
 
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://api.themoviedb.org/3/search/person",
             params={
                 "api_key": TMDB_API_KEY,
@@ -1367,7 +1445,7 @@ def search_soundtracks(query: str) -> tuple[dict, ...]:
         return ()
 
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://itunes.apple.com/search",
             params={
                 "term": normalized_query,
@@ -1599,6 +1677,11 @@ def health_check():
     return {"status": "ok", "app": "reliure"}
 
 
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 # --- 4. ROUTES AUTH ---
 @app.post("/auth/signup", response_model=Token)
 def signup(user: UserCreate):
@@ -1963,7 +2046,7 @@ def fetch_poster_from_tmdb(movie_id):
 
     try:
         url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR"
-        data = requests.get(url, timeout=1).json()
+        data = upstream_get(url, timeout=1).json()
         return "https://image.tmdb.org/t/p/w500" + data.get('poster_path') if data.get('poster_path') else "https://via.placeholder.com/500"
     except: return "https://via.placeholder.com/500"
 
@@ -1980,7 +2063,7 @@ def get_tmdb_watch_providers(movie_id: int) -> dict:
 
     try:
         url = f"https://api.themoviedb.org/3/movie/{movie_id}/watch/providers?api_key={TMDB_API_KEY}"
-        data = requests.get(url, timeout=2).json()
+        data = upstream_get(url, timeout=2).json()
         results = data.get("results", {}) if isinstance(data, dict) else {}
         preferred_regions = ("FR", "US")
         region_code = next((region for region in preferred_regions if region in results), None)
@@ -2057,7 +2140,7 @@ def get_tmdb_details(movie_id):
 
     try:
         url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={TMDB_API_KEY}&language=fr-FR&append_to_response=videos,credits"
-        data = requests.get(url, timeout=3).json()
+        data = upstream_get(url, timeout=3).json()
         trailer = next((f"https://www.youtube.com/embed/{v['key']}" for v in data.get('videos', {}).get('results', []) if v['site']=='YouTube' and v['type']=='Trailer'), None)
         cast = [
             {
@@ -2100,7 +2183,7 @@ def get_tmdb_details(movie_id):
 @lru_cache(maxsize=512)
 def get_tmdb_person_details(person_id: int) -> Optional[dict]:
     try:
-        response = requests.get(
+        response = upstream_get(
             f"https://api.themoviedb.org/3/person/{person_id}",
             params={
                 "api_key": TMDB_API_KEY,
@@ -2436,7 +2519,7 @@ def get_tmdb_related_movie_ids(movie_id: int) -> tuple[int, ...]:
 
     for url in endpoints:
         try:
-            results = requests.get(url, timeout=2).json().get("results", [])[:10]
+            results = upstream_get(url, timeout=2).json().get("results", [])[:10]
         except Exception:
             results = []
 
@@ -2459,7 +2542,7 @@ def get_tmdb_related_movies(movie_id: int) -> tuple[dict, ...]:
     seen_ids: set[int] = set()
     for url in endpoints:
         try:
-            results = requests.get(url, timeout=2).json().get("results", [])[:12]
+            results = upstream_get(url, timeout=2).json().get("results", [])[:12]
         except Exception:
             results = []
 
@@ -2482,7 +2565,7 @@ def get_tmdb_person_seed_movie_ids(person_name: str) -> tuple[int, ...]:
         return ()
 
     try:
-        response = requests.get(
+        response = upstream_get(
             "https://api.themoviedb.org/3/search/person",
             params={
                 "api_key": TMDB_API_KEY,
@@ -2705,7 +2788,7 @@ def get_tmdb_discover_movies(page: int, genre_ids_key: str) -> tuple[dict, ...]:
 
     url = f"https://api.themoviedb.org/3/discover/movie?{'&'.join(params)}"
     try:
-        results = requests.get(url, timeout=2).json().get("results", [])[:20]
+        results = upstream_get(url, timeout=2).json().get("results", [])[:20]
     except Exception:
         results = []
 
@@ -3049,7 +3132,7 @@ def send_native_push_notifications(
         for index in range(0, len(expo_tokens), 100):
             chunk = expo_tokens[index : index + 100]
             try:
-                response = requests.post(
+                response = upstream_post(
                     "https://exp.host/--/api/v2/push/send",
                     headers={
                         "Accept": "application/json",
@@ -3106,7 +3189,7 @@ def send_native_push_notifications(
 
     for device_token in fcm_tokens:
         try:
-            response = requests.post(
+            response = upstream_post(
                 "https://fcm.googleapis.com/fcm/send",
                 headers=headers,
                 json={
@@ -5047,7 +5130,7 @@ def fetch_now_playing_movies(limit: int = 18) -> list[dict]:
 
     try:
         url = f"https://api.themoviedb.org/3/movie/now_playing?api_key={TMDB_API_KEY}&language=fr-FR&page=1"
-        results = requests.get(url, timeout=3).json().get("results", [])[:limit]
+        results = upstream_get(url, timeout=3).json().get("results", [])[:limit]
     except Exception:
         results = []
 
@@ -6287,7 +6370,7 @@ def open_library_cover_proxy(cover_id: int, size: str = "L"):
     normalized_size = normalize_open_library_cover_size(size)
     source_url = open_library_cover_source_url(cover_id, normalized_size)
     try:
-        response = requests.get(
+        response = upstream_get(
             source_url,
             allow_redirects=True,
             headers={"User-Agent": "Reliure/1.0 (book discovery app; contact: reliure.developpeur@gmail.com)"},
@@ -6440,7 +6523,7 @@ def mobile_trailer_player(video_id: str = Query("", alias="videoId")):
 @app.get("/movies/news")
 def news():
     url = f"https://api.themoviedb.org/3/movie/now_playing?api_key={TMDB_API_KEY}&language=fr-FR&page=1"
-    res = requests.get(url).json().get('results', [])[:10]
+    res = upstream_get(url).json().get('results', [])[:10]
     return [{"id": m['id'], "title": m['title'], "poster_url": "https://image.tmdb.org/t/p/w500"+m.get('poster_path', ""), "rating": m['vote_average'], "overview": m['overview']} for m in res]
 
 @app.post("/movies/dislike/{movie_id}")